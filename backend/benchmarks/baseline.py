@@ -0,0 +1,83 @@
+import os
+import json
+import platform
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Stored baselines for the benchmarks in this folder: benchmarks/baselines/<name>.json
+# A result is {metric: {"median_ms": float, "min_ms": float, "runs": int}}.
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+REGRESSION_THRESHOLD = 0.20  # 20% slower than the baseline median is a regression
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, results: Dict[str, Dict[str, float]]) -> str:
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    path = baseline_path(name)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "recorded_at": datetime.utcnow().isoformat() + "Z",
+            "machine": machine_info(),
+            "results": results,
+        }, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(name: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(baseline_path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def compare(name: str, results: Dict[str, Dict[str, float]], threshold: float = REGRESSION_THRESHOLD, stat: str = "median_ms") -> List[Dict[str, Any]]:
+    """
+    One row per metric: baseline vs current `stat` and a status (ok / faster / REGRESSION / new).
+    Micro-benchmarks compare min_ms, which is much less sensitive to machine noise than the median.
+    """
+    baseline = load_baseline(name) or {"results": {}}
+    rows = []
+    for metric, current in results.items():
+        base = baseline["results"].get(metric)
+        row = {"metric": metric, "current_ms": current[stat], "baseline_ms": None, "ratio": None, "status": "new"}
+        if base and base.get(stat):
+            ratio = current[stat] / base[stat]
+            row.update(baseline_ms=base[stat], ratio=ratio)
+            if ratio > 1 + threshold:
+                row["status"] = "REGRESSION"
+            elif ratio < 1 - threshold:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def print_report(name: str, rows: List[Dict[str, Any]]) -> None:
+    baseline = load_baseline(name)
+    if baseline and baseline.get("machine") != machine_info():
+        print(f"note: baseline '{name}' was recorded on another machine ({baseline['machine'].get('platform')})")
+    width = max([len(r["metric"]) for r in rows] + [6])
+    print(f"{'metric':<{width}}  {'baseline ms':>12}  {'current ms':>12}  {'ratio':>7}  status")
+    for r in rows:
+        base = f"{r['baseline_ms']:.4f}" if r["baseline_ms"] is not None else "-"
+        ratio = f"{r['ratio']:.2f}x" if r["ratio"] is not None else "-"
+        print(f"{r['metric']:<{width}}  {base:>12}  {r['current_ms']:>12.4f}  {ratio:>7}  {r['status']}")
+
+
+def has_regression(rows: List[Dict[str, Any]]) -> bool:
+    return any(r["status"] == "REGRESSION" for r in rows)
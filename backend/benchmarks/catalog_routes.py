@@ -0,0 +1,107 @@
+"""
+Request cost of the catalog routes, measured by calling the ASGI app in-process (middlewares included,
+no network, no database): response bodies encoded once per catalog version vs rebuilt on every request.
+
+Run from backend/:
+    python -m benchmarks.catalog_routes                  # compare with benchmarks/baselines/catalog_routes.json
+    python -m benchmarks.catalog_routes --save-baseline
+    ECOLEAD_DATA_DIR=data_scaled python -m benchmarks.catalog_routes --baseline-name catalog_routes_10k
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+from benchmarks.baseline import compare, print_report, save_baseline, has_regression, REGRESSION_THRESHOLD
+
+ROUTES = ["/api/missions/débutant", "/api/events"]
+ENCODINGS = {"identity": b"identity", "gzip": b"gzip, deflate, br"}
+
+
+async def asgi_get(app, path: str, accept_encoding: bytes) -> Tuple[int, int]:
+    """(status, body bytes) of one GET sent straight to the ASGI app"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": quote(path).encode(), "query_string": b"",
+        "root_path": "", "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+        "headers": [(b"host", b"bench"), (b"accept-encoding", accept_encoding)],
+    }
+    status, size = 0, 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status, size
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status, size
+
+
+async def measure(app, path: str, accept_encoding: bytes, requests: int, repeat: int) -> Dict[str, float]:
+    for _ in range(10):
+        status, size = await asgi_get(app, path, accept_encoding)
+    if status != 200:
+        raise SystemExit(f"GET {path}: HTTP {status}")
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(requests):
+            await asgi_get(app, path, accept_encoding)
+        samples.append((time.perf_counter() - start) / requests * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "runs": repeat, "bytes": size}
+
+
+async def run(requests: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    import main
+    from utils import http_cache
+    app = main.create_app()
+    results = {}
+    for mode, enabled in (("rebuilt", False), ("cached", True)):
+        http_cache.BODY_CACHE_ENABLED = enabled
+        http_cache.catalog_bodies.clear()
+        for path in ROUTES:
+            for encoding, header in ENCODINGS.items():
+                results[f"{mode} {path} {encoding}"] = await measure(app, path, header, requests, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalog route request cost, body cache off/on")
+    parser.add_argument("--requests", type=int, default=200, help="requests per repeat")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--baseline-name", default="catalog_routes")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.requests, args.repeat))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    print(f"{'route':<45} {'rebuilt ms':>11} {'cached ms':>10} {'speedup':>8} {'bytes':>8}")
+    for key in results:
+        if key.startswith("cached "):
+            name = key[len("cached "):]
+            before, after = results[f"rebuilt {name}"], results[key]
+            print(f"{name:<45} {before['min_ms']:>11.3f} {after['min_ms']:>10.3f} "
+                  f"{before['min_ms'] / after['min_ms']:>7.1f}x {after['bytes']:>8}")
+    print()
+    if args.save_baseline:
+        print(f"Saved {save_baseline(args.baseline_name, results)}")
+        return
+    rows = compare(args.baseline_name, results, threshold=args.threshold, stat="min_ms")
+    print_report(args.baseline_name, rows)
+    if has_regression(rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
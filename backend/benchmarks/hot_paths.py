@@ -0,0 +1,135 @@
+"""
+Micro-benchmarks of the pure hot paths: catalog lookups, evaluation, feature extraction, profiling
+and the suggestion scoring. Runs offline against a throwaway SQLite database seeded by
+scripts/seed_cohort.py (only eligible_missions and suggest_strategy touch it).
+
+Run from backend/:
+    python -m benchmarks.hot_paths                       # compare with benchmarks/baselines/hot_paths.json
+    python -m benchmarks.hot_paths --save-baseline
+    python -m benchmarks.hot_paths -k strategy --repeat 9
+    ECOLEAD_DATA_DIR=data_scaled python -m benchmarks.hot_paths --baseline-name hot_paths_10k
+"""
+import os
+import sys
+import json
+import atexit
+import shutil
+import argparse
+import tempfile
+import statistics
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+# must be set before `database` is imported anywhere
+_tmp_dir = tempfile.mkdtemp(prefix="ecolead-bench-")
+atexit.register(shutil.rmtree, _tmp_dir, ignore_errors=True)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}")
+
+from benchmarks.baseline import compare, print_report, save_baseline, has_regression, REGRESSION_THRESHOLD  # noqa: E402
+
+Case = Tuple[str, Callable[[], object]]
+
+
+def build_cases() -> List[Case]:
+    from database import SessionLocal, engine, Base
+    import models.all  # noqa: F401
+    from models.user import Student
+    from models.profile import ProfileType
+    from models.schemas import SuggestRequest
+    from utils.game_loader import GameLoader
+    from utils.evaluator import MissionEvaluator
+    from services.features_service import build_mission_index, build_feature_sequence, compute_features_for_student
+    from services.predict_ai_profile import predict_tilt
+    from services.progress_service import get_recent_progress_for_student
+    from services.strategy.suggest_service import eligible_missions, score_missions, suggest_strategy
+    from scripts.seed_cohort import seed_cohort
+
+    loader = GameLoader()
+    evaluator = MissionEvaluator(loader)
+
+    # fixtures: a mission with possible events, a stressed student that triggers conditional events
+    missions = loader.get_all_missions()
+    mission = next((m for m in missions if m.get("evenements_possibles") and
+                    any(e in loader.events for e in m["evenements_possibles"])), missions[0])
+    mission_id = mission["id"]
+    student = Student(cashflow=40.0, controle=45.0, stress=70.0, rentabilite=60.0, reputation=50.0, level_ai="Equilibré")
+    events = loader.get_active_events_for_mission(mission_id, student)
+    choices = {"main": sorted(mission["choix"])[0]}
+    level = mission["niveau"]
+
+    # a seeded student for the DB-backed paths
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        seed_cohort(db, teachers=1, classes_per_teacher=1, students=10, missions_per_student=(12, 12), seed=7, game_loader=loader)
+        seeded_id = db.query(Student.id).order_by(Student.id).first()[0]
+    finally:
+        db.close()
+
+    recent = get_recent_progress_for_student(seeded_id, limit=8)
+    seq = build_feature_sequence(recent, loader)
+    feats = compute_features_for_student(seq, loader.events)
+    index = loader.get_mission_index()
+    pool = eligible_missions(seeded_id, ProfileType.GESTION_PORTEFEUILLE, index)
+    recent_concepts = [p["concept"] for p in recent]
+    last_mission = next((m for m in index if recent and m["mission_id"] == recent[-1]["mission_id"]), None)
+    request = SuggestRequest(student_id=seeded_id, goal="balance")
+
+    return [
+        ("loader.get_mission_by_id", lambda: loader.get_mission_by_id(mission_id)),
+        ("loader.get_missions_by_level", lambda: loader.get_missions_by_level(level)),
+        ("loader.get_active_events_for_mission", lambda: loader.get_active_events_for_mission(mission_id, student)),
+        ("evaluator.evaluate_mission", lambda: evaluator.evaluate_mission(mission, choices, events, student)),
+        ("evaluator.apply_events_to_mission", lambda: evaluator.apply_events_to_mission(mission, events, student)),
+        ("features.build_mission_index", lambda: build_mission_index(loader.missions)),
+        ("features.compute_features_for_student", lambda: compute_features_for_student(seq, loader.events)),
+        ("profile.predict_tilt", lambda: predict_tilt(feats)),
+        ("strategy.eligible_missions", lambda: eligible_missions(seeded_id, ProfileType.GESTION_PORTEFEUILLE, index)),
+        ("strategy.score_missions", lambda: score_missions(pool, "Equilibré", "balance", feats, recent_concepts, last_mission, loader.events)),
+        ("strategy.suggest_strategy", lambda: suggest_strategy(request)),
+    ]
+
+
+def measure(func: Callable[[], object], repeat: int, min_time: float) -> Dict[str, float]:
+    """timeit-style: calibrate the loop count to ~min_time, then keep the per-call time of each repeat"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    samples = [t / number * 1000 for t in timer.repeat(repeat=repeat, number=number)]
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "runs": repeat, "loops": number}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("-k", dest="keyword", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD, help="relative slowdown flagged as a regression")
+    parser.add_argument("--baseline-name", default="hot_paths", help="e.g. one baseline per catalog size")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    # the seeding and the code under test print debug lines: keep them out of the report
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        cases = [(n, f) for n, f in build_cases() if not args.keyword or args.keyword in n]
+        results = {name: measure(func, args.repeat, args.min_time) for name, func in cases}
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.save_baseline:
+        print(f"Saved {save_baseline(args.baseline_name, results)}")
+        return
+    rows = compare(args.baseline_name, results, threshold=args.threshold, stat="min_ms")
+    print_report(args.baseline_name, rows)
+    if has_regression(rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+End-to-end load test: a class session hitting the real API over HTTP.
+
+Boots uvicorn against a freshly seeded SQLite database (scripts/seed_cohort.py), then starts every virtual
+student at once (optionally ramped): each one plays `--rounds` times
+    next-mission -> submit -> progress -> suggest -> strategic-context
+while every teacher polls the dashboard. Reports throughput, latency percentiles and errors per route.
+
+Run from backend/:
+    python -m benchmarks.loadtest --students 200 --rounds 5 --workers 2
+    python -m benchmarks.loadtest --url http://localhost:8000 --students 50     # existing server (must be seeded)
+    python -m benchmarks.loadtest --save-baseline   /   python -m benchmarks.loadtest --compare
+"""
+import os
+import sys
+import json
+import time
+import random
+import socket
+import asyncio
+import argparse
+import tempfile
+import shutil
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import httpx
+from benchmarks.baseline import compare, print_report, save_baseline, has_regression
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GOALS = ["balance", "reduce_stress", "boost_rentabilite", "preserve_liquidity"]
+
+
+class Recorder:
+    """Latencies and outcomes per route template"""
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def call(self, client: httpx.AsyncClient, route: str, method: str, url: str, ok_statuses=(200,), **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[route].append((time.perf_counter() - start) * 1000)
+            self.errors[route] += 1
+            self.statuses[route][0] += 1
+            return None
+        self.latencies[route].append((time.perf_counter() - start) * 1000)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code not in ok_statuses:
+            self.errors[route] += 1
+        return response
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+async def student_session(client, rec: Recorder, student_id: int, rounds: int, rng: random.Random, think_time: float):
+    for _ in range(rounds):
+        r = await rec.call(client, "GET /students/{id}/next-mission", "GET", f"/api/students/{student_id}/next-mission", ok_statuses=(200, 404))
+        if r is None or r.status_code != 200:
+            return  # 404: every mission completed
+        mission = r.json()
+        choice = rng.choice(sorted(mission.get("choix") or {"A": None}))
+        await asyncio.sleep(think_time * rng.random())
+        await rec.call(
+            client, "POST /students/{id}/missions/{mission}/submit", "POST",
+            f"/api/students/{student_id}/missions/{mission['id']}/submit",
+            json={"mission_id": mission["id"], "choices": {"main": choice}, "time_spent_seconds": rng.randint(20, 180)},
+        )
+        await rec.call(client, "GET /students/{id}/progress", "GET", f"/api/students/{student_id}/progress")
+        await rec.call(client, "GET /strategy/students/{id}/suggest", "GET",
+                       f"/api/strategy/students/{student_id}/suggest", params={"goal": rng.choice(GOALS)})
+        r = await rec.call(client, "GET /strategy/students/{id}/strategic-context", "GET",
+                           f"/api/strategy/students/{student_id}/strategic-context")
+        if r is not None and r.status_code == 200 and r.json().get("stage") == "error":
+            rec.errors["GET /strategy/students/{id}/strategic-context"] += 1  # the route hides its exceptions
+
+
+async def teacher_polling(client, rec: Recorder, teacher_id: int, interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        await rec.call(client, "GET /teachers/{id}/dashboard", "GET", f"/api/teachers/{teacher_id}/dashboard")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_traffic(base_url: str, student_ids: List[int], teacher_ids: List[int], args) -> Tuple[Recorder, float]:
+    rec = Recorder()
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        stop = asyncio.Event()
+        pollers = [asyncio.create_task(teacher_polling(client, rec, t, args.poll_interval, stop)) for t in teacher_ids]
+
+        async def delayed(i, student_id):
+            await asyncio.sleep(args.ramp_up * i / max(1, len(student_ids)))
+            await student_session(client, rec, student_id, args.rounds, random.Random(rng.random()), args.think_time)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(delayed(i, s) for i, s in enumerate(student_ids)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*pollers)
+    return rec, elapsed
+
+
+def build_report(rec: Recorder, elapsed: float) -> Dict[str, Dict[str, float]]:
+    report = {}
+    for route, values in sorted(rec.latencies.items()):
+        values = sorted(values)
+        report[route] = {
+            "requests": len(values),
+            "errors": rec.errors[route],
+            "error_rate": rec.errors[route] / len(values),
+            "rps": len(values) / elapsed,
+            "p50_ms": percentile(values, 0.50),
+            "p90_ms": percentile(values, 0.90),
+            "p95_ms": percentile(values, 0.95),
+            "p99_ms": percentile(values, 0.99),
+            "max_ms": values[-1],
+            "statuses": dict(rec.statuses[route]),
+        }
+    return report
+
+
+def print_table(report: Dict[str, Dict[str, float]], elapsed: float) -> None:
+    total = sum(r["requests"] for r in report.values())
+    errors = sum(r["errors"] for r in report.values())
+    width = max(len(route) for route in report) if report else 10
+    print(f"{total} requests in {elapsed:.1f}s: {total / elapsed:.1f} req/s, {errors} errors ({errors / max(1, total):.2%})\n")
+    print(f"{'route':<{width}}  {'reqs':>6}  {'req/s':>7}  {'err%':>6}  {'p50':>8}  {'p90':>8}  {'p95':>8}  {'p99':>8}  {'max':>8}")
+    for route, r in report.items():
+        print(f"{route:<{width}}  {r['requests']:>6}  {r['rps']:>7.1f}  {r['error_rate']:>6.1%}  "
+              f"{r['p50_ms']:>8.1f}  {r['p90_ms']:>8.1f}  {r['p95_ms']:>8.1f}  {r['p99_ms']:>8.1f}  {r['max_ms']:>8.1f}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def seed_database(env: Dict[str, str], args) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "scripts.seed_cohort", "--reset", "--seed", str(args.seed),
+         "--teachers", str(args.teachers), "--students", str(args.cohort or args.students),
+         "--min-missions", "0", "--max-missions", str(args.history)],
+        cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.DEVNULL,
+    )
+
+
+def seeded_ids(database_url: str, students: int) -> Tuple[List[int], List[int]]:
+    os.environ["DATABASE_URL"] = database_url
+    from database import SessionLocal
+    import models.all  # noqa: F401
+    from models.user import User, UserRole
+    db = SessionLocal()
+    try:
+        student_ids = [i for (i,) in db.query(User.id).filter(User.role == UserRole.STUDENT).order_by(User.id).limit(students)]
+        teacher_ids = [i for (i,) in db.query(User.id).filter(User.role == UserRole.TEACHER).order_by(User.id)]
+    finally:
+        db.close()
+    return student_ids, teacher_ids
+
+
+def start_server(env: Dict[str, str], port: int, workers: int, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"server exited during startup, see {log_path}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("server did not become healthy within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Class-session load test")
+    parser.add_argument("--students", type=int, default=100, help="virtual students playing concurrently")
+    parser.add_argument("--teachers", type=int, default=3, help="teachers polling their dashboard")
+    parser.add_argument("--cohort", type=int, help="students seeded in the database (default: --students)")
+    parser.add_argument("--history", type=int, default=20, help="max missions already played per seeded student")
+    parser.add_argument("--rounds", type=int, default=5, help="missions played by each virtual student")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max seconds between next-mission and submit")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which students start (0 = all at once)")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="teacher dashboard refresh period")
+    parser.add_argument("--connections", type=int, default=100, help="client connection pool size")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="target an already running, already seeded server instead")
+    parser.add_argument("--database-url", help="with --url: database to read the student/teacher ids from")
+    parser.add_argument("--catalog-dir", help="ECOLEAD_DATA_DIR for the booted server")
+    parser.add_argument("--json", action="store_true", help="print the raw report as JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="store p50/p95 per route in baselines/loadtest.json")
+    parser.add_argument("--compare", action="store_true", help="compare p50/p95 per route with the baseline")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="ecolead-load-")
+    server = None
+    try:
+        if args.url:
+            base_url = args.url
+            database_url = args.database_url or os.getenv("DATABASE_URL", "sqlite:///./educational_platform.db")
+        else:
+            database_url = f"sqlite:///{os.path.join(tmp_dir, 'load.db')}"
+            env = dict(os.environ, DATABASE_URL=database_url, PYTHONUNBUFFERED="1")
+            if args.catalog_dir:
+                env["ECOLEAD_DATA_DIR"] = args.catalog_dir
+            print(f"Seeding {args.cohort or args.students} students, {args.teachers} teachers ...")
+            seed_database(env, args)
+            port = free_port()
+            server = start_server(env, port, args.workers, os.path.join(tmp_dir, "server.log"))
+            base_url = f"http://127.0.0.1:{port}"
+
+        student_ids, teacher_ids = seeded_ids(database_url, args.students)
+        print(f"{len(student_ids)} students x {args.rounds} rounds, {len(teacher_ids)} teachers polling, against {base_url}")
+        rec, elapsed = asyncio.run(run_traffic(base_url, student_ids, teacher_ids, args))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                server.kill()  # requests still stuck in the server, already counted as errors
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = build_report(rec, elapsed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(report, elapsed)
+
+    latencies = {}
+    for route, r in report.items():
+        for q in ("p50", "p95"):
+            latencies[f"{route} {q}"] = {"median_ms": r[f"{q}_ms"], "min_ms": r[f"{q}_ms"], "runs": r["requests"]}
+    if args.save_baseline:
+        print(f"\nSaved {save_baseline('loadtest', latencies)}")
+    elif args.compare:
+        print()
+        rows = compare("loadtest", latencies)
+        print_report("loadtest", rows)
+        if has_regression(rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+API cold-start benchmark and import-time profile.
+
+Run from backend/:
+    python -m benchmarks.startup                    # N fresh interpreters, compare with the stored baseline
+    python -m benchmarks.startup --save-baseline
+    python -m benchmarks.startup --profile          # import-time breakdown per module (python -X importtime)
+    python -m benchmarks.startup --catalog          # catalog load: JSON files vs precompiled snapshot
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from benchmarks.baseline import compare, print_report, save_baseline, has_regression
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIRST_PARTY = ("main", "database", "routes", "services", "models", "utils")
+
+# Executed in a fresh interpreter: time `import main` then the lifespan startup steps
+BOOT_SNIPPET = """
+import time, json, asyncio
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+async def boot():
+    async with main.lifespan(main.app):
+        pass
+asyncio.run(boot())
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "lifespan_ms": (t2 - t1) * 1000,
+    "steps_ms": main.app.state.startup_timings_ms,
+}))
+"""
+
+# Executed in a fresh interpreter: load the catalog (+ strategy index) from JSON or from the snapshot
+CATALOG_SNIPPET = """
+import sys, time, json
+from utils.game_loader import GameLoader
+t0 = time.perf_counter()
+loader = GameLoader(use_snapshot=sys.argv[1] == "snapshot")
+loader.get_mission_index()
+t1 = time.perf_counter()
+print(json.dumps({"ms": (t1 - t0) * 1000, "loaded_from": loader.loaded_from, "missions": len(loader.missions)}))
+"""
+
+
+def run_boot(env=None) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", BOOT_SNIPPET],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(runs: int) -> dict:
+    samples = defaultdict(list)
+    for _ in range(runs):
+        boot = run_boot()
+        samples["import_main"].append(boot["import_ms"])
+        samples["lifespan_startup"].append(boot["lifespan_ms"])
+        samples["total_startup"].append(boot["import_ms"] + boot["lifespan_ms"])
+        for step, ms in boot["steps_ms"].items():
+            samples[f"step.{step}"].append(ms)
+    return {
+        metric: {"median_ms": statistics.median(values), "min_ms": min(values), "runs": len(values)}
+        for metric, values in samples.items()
+    }
+
+
+def bench_catalog(runs: int) -> dict:
+    from utils.game_loader import DATA_DIR
+    from utils.catalog_snapshot import snapshot_status, write_snapshot
+    if snapshot_status(DATA_DIR) != "fresh":
+        print(f"Building the snapshot: {write_snapshot(DATA_DIR)}")
+    samples = defaultdict(list)
+    for _ in range(runs):
+        for source in ("json", "snapshot"):
+            out = subprocess.run(
+                [sys.executable, "-c", CATALOG_SNIPPET, source],
+                cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+            )
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            if result["loaded_from"] != source:
+                raise SystemExit(f"expected a {source} load, got {result['loaded_from']}")
+            samples[f"catalog.{source}"].append(result["ms"])
+    return {
+        metric: {"median_ms": statistics.median(values), "min_ms": min(values), "runs": len(values)}
+        for metric, values in samples.items()
+    }
+
+
+def parse_importtime(stderr: str):
+    """Yield (depth, self_us, cumulative_us, module) from `python -X importtime` output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, raw_name = int(parts[0]), int(parts[1]), parts[2]
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        yield depth, self_us, cumulative_us, raw_name.strip()
+
+
+def profile_imports(top: int) -> None:
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    entries = list(parse_importtime(out.stderr))
+
+    first_party = [e for e in entries if e[3].split(".")[0] in FIRST_PARTY]
+    third_party = defaultdict(int)
+    for _, self_us, _, name in entries:
+        package = name.split(".")[0]
+        if package not in FIRST_PARTY:
+            third_party[package] += self_us
+
+    total = next((cum for depth, _, cum, name in entries if name == "main"), 0)
+    print(f"import main: {total / 1000:.1f} ms\n")
+    print(f"{'first-party module':<45} {'self ms':>9} {'cumul ms':>9}")
+    for _, self_us, cum_us, name in sorted(first_party, key=lambda e: -e[2])[:top]:
+        print(f"{name:<45} {self_us / 1000:>9.1f} {cum_us / 1000:>9.1f}")
+    print(f"\n{'third-party package (self time summed)':<45} {'ms':>9}")
+    for package, self_us in sorted(third_party.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{package:<45} {self_us / 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="print the import-time breakdown instead")
+    parser.add_argument("--catalog", action="store_true", help="benchmark the catalog load (JSON vs snapshot) instead")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print raw results as JSON")
+    args = parser.parse_args()
+
+    if args.profile:
+        profile_imports(args.top)
+        return
+
+    name = "catalog_load" if args.catalog else "startup"
+    results = bench_catalog(args.runs) if args.catalog else bench_startup(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    if args.catalog:
+        speedup = results["catalog.json"]["median_ms"] / results["catalog.snapshot"]["median_ms"]
+        print(f"snapshot vs JSON: {speedup:.1f}x faster (median)")
+    if args.save_baseline:
+        print(f"Saved {save_baseline(name, results)}")
+        return
+    rows = compare(name, results)
+    print_report(name, rows)
+    if has_regression(rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
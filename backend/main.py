@@ -1,46 +1,146 @@
+import os
+import time
+import importlib
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn # ASGI server
-from database import engine, Base # Import SQLAlchemy engine and Base, engine - db connextion | Base - ORM models
-from routes import users, missions, progress, analytics, suggestion, predict_ai_profile, events, CustomCreation, notification, classroom
-Base.metadata.create_all(bind=engine)
-
-#Instantiate the app 
-app = FastAPI(
-    title="ECOLead Serious Game Platform API",
-    description="A learning platform with missions and progress tracking",
-    version="1.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React dev servers
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(users.router, prefix="/api", tags=["users"])
-app.include_router(missions.router, prefix="/api", tags=["missions"])
-app.include_router(progress.router, prefix="/api", tags=["progress"])
-app.include_router(analytics.router, prefix="/api", tags=["analytics"])
-app.include_router(suggestion.router, prefix="/api", tags=["suggestion"])
-app.include_router(predict_ai_profile.router, prefix="/api", tags=["predict_ai_profile"])
-app.include_router(events.router, prefix="/api", tags=["events"])
-app.include_router(CustomCreation.router, prefix="/api", tags=["custom_creation"])
-app.include_router(notification.router, prefix="/api", tags=["notification"])
-app.include_router(classroom.router, prefix="/api", tags=["Classes"])
-
-# Handle GET requests to root 
-@app.get("/")
-async def root():
-    return {"message": "ECOLead Serious Game Platform API", "docs": "/docs"}
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+from database import engine, analytics_engine, writer_engine, Base # Import SQLAlchemy engine and Base, engine - db connextion | Base - ORM models
+from utils.query_stats import install_query_hooks, QueryStatsMiddleware
+from utils.metrics import MetricsMiddleware, register_runtime_collectors, REGISTRY, CONTENT_TYPE
+from utils.request_profiler import RequestProfilerMiddleware
+from utils.logging_config import configure_logging
+from fastapi.responses import Response
+
+# (module, tags) - imported by create_app(), in this order
+ROUTERS = [
+    ("routes.users", ["users"]),
+    ("routes.missions", ["missions"]),
+    ("routes.progress", ["progress"]),
+    ("routes.analytics", ["analytics"]),
+    ("routes.suggestion", ["suggestion"]),
+    ("routes.predict_ai_profile", ["predict_ai_profile"]),
+    ("routes.events", ["events"]),
+    ("routes.CustomCreation", ["custom_creation"]),
+    ("routes.notification", ["notification"]),
+    ("routes.classroom", ["Classes"]),
+    ("routes.export", ["export"]),
+    ("routes.leaderboard", ["leaderboard"]),
+    ("routes.admin", ["admin"]),
+]
+
+# Set ECOLEAD_WARMUP=0 to skip preloading: catalog, strategy index and ML model then load on first use
+WARMUP = os.getenv("ECOLEAD_WARMUP", "1") != "0"
+
+
+def init_database():
+    import models.all  # noqa: F401  register every table before create_all
+    from models.upgrades import upgrade_schema
+    Base.metadata.create_all(bind=engine)
+    return upgrade_schema(engine)  # columns / indexes added to existing tables
+
+def init_leaderboards():
+    from database import SessionLocal
+    from services.leaderboard_service import ensure_leaderboards
+    db = SessionLocal()
+    try:
+        return ensure_leaderboards(db)
+    finally:
+        db.close()
+
+def init_catalog():
+    from utils.game_loader import get_game_loader
+    return get_game_loader()
+
+def init_strategy():
+    from utils.game_loader import get_game_loader
+    return get_game_loader().get_mission_index()
+
+def init_ml():
+    from services.predict_ai_profile import refresh_model
+    return refresh_model(force=True)
+
+
+# Heavy subsystems, initialized once at startup in this order (each one is also lazy on its own)
+STARTUP_STEPS = [
+    ("database", init_database, True),
+    ("leaderboards", init_leaderboards, True),
+    ("catalog", init_catalog, WARMUP),
+    ("strategy", init_strategy, WARMUP),
+    ("ml", init_ml, WARMUP),
+]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    timings = {}
+    for name, step, enabled in STARTUP_STEPS:
+        if not enabled:
+            continue
+        start = time.perf_counter()
+        step()
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+    app.state.startup_timings_ms = timings
+    yield
+    # submissions still queued for the group-commit writer are committed before exiting
+    from utils.group_commit import submission_writer
+    submission_writer.stop()
+
+
+def create_app() -> FastAPI:
+    # levelled logging through a queue (ECOLEAD_LOG_LEVEL, ECOLEAD_LOG_LEVELS, ECOLEAD_LOG_FORMAT)
+    configure_logging()
+
+    #Instantiate the app
+    app = FastAPI(
+        title="ECOLead Serious Game Platform API",
+        description="A learning platform with missions and progress tracking",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # SQL query count/time per route (GET /api/admin/query-stats, headers with ECOLEAD_DEBUG=1)
+    install_query_hooks(engine)
+    install_query_hooks(analytics_engine)
+    install_query_hooks(writer_engine)
+    app.add_middleware(QueryStatsMiddleware)
+    # Prometheus metrics, scraped at GET /metrics
+    register_runtime_collectors({"default": engine, "analytics": analytics_engine, "writer": writer_engine})
+    app.add_middleware(MetricsMiddleware)
+    # opt-in sampling profiler (X-Profile: 1 or ECOLEAD_PROFILE_SAMPLE_RATE), GET /api/admin/profiles
+    app.add_middleware(RequestProfilerMiddleware)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:5173"],  # React dev servers
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    for module_name, tags in ROUTERS:
+        module = importlib.import_module(module_name)
+        app.include_router(module.router, prefix="/api", tags=tags)
+
+    # Handle GET requests to root
+    @app.get("/")
+    async def root():
+        return {"message": "ECOLead Serious Game Platform API", "docs": "/docs"}
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+    return app
+
+
+app = create_app()
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,11 @@
+# Import every ORM model so SQLAlchemy can resolve string relationships ("Notification", "Class"...)
+# in entry points that don't go through main.py (scripts, benchmarks).
+from models.user import User, Student, Teacher
+from models.progress import Progress, MetricHistory, MetricRollup, ConceptProgress
+from models.classroom import Class, class_student_table
+from models.notification import Notification
+from models.custom_concept import CustomConcept
+from models.custom_mission import CustomMission
+from models.custom_event import Event
+from models.custom_feedback import Feedback
+from models.leaderboard import LeaderboardEntry
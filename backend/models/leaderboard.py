@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
+from database import Base
+from datetime import datetime
+
+# class_id of the global board (every student with at least one mission)
+GLOBAL_BOARD = 0
+
+class LeaderboardEntry(Base): # One row per (board, student), kept up to date by services/leaderboard_service.py
+    __tablename__ = "leaderboard_entries"
+    __table_args__ = (UniqueConstraint("class_id", "student_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    class_id = Column(Integer, nullable=False)  # GLOBAL_BOARD or classes.id
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    total_score = Column(Integer, nullable=False, default=0)
+    missions_completed = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+# rank order: total_score desc, then student_id; top-k, rank and neighbors are range scans on it
+Index("ix_leaderboard_rank", LeaderboardEntry.class_id, LeaderboardEntry.total_score.desc(), LeaderboardEntry.student_id)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, ForeignKey, Text, JSON, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -28,6 +28,9 @@ class Progress(Base):
     # Relationships
     student = relationship("User", back_populates="progress_records")
 
+# a mission is completed once: guards concurrent submissions (double click, two tabs) at the database level
+Index("uq_progress_student_mission", Progress.student_id, Progress.mission_id, unique=True)
+
 class MetricHistory(Base): # Tracks a timeline of student metrics 
     __tablename__ = "metric_history"
     
@@ -48,6 +51,35 @@ class MetricHistory(Base): # Tracks a timeline of student metrics
     # Relationships
     student = relationship("User", back_populates="metric_history")
 
+class MetricRollup(Base): # MetricHistory older than the retention window, one row per day or week (services/metric_retention.py)
+    __tablename__ = "metric_rollups"
+    __table_args__ = (UniqueConstraint("student_id", "resolution", "bucket_start"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    resolution = Column(String, nullable=False)  # "day" / "week"
+    bucket_start = Column(DateTime, nullable=False)
+    samples = Column(Integer, default=0)  # MetricHistory rows folded in
+    last_recorded_at = Column(DateTime, nullable=False)
+
+    # last value of the bucket under the MetricHistory names, min / max next to it
+    cashflow = Column(Float)
+    cashflow_min = Column(Float)
+    cashflow_max = Column(Float)
+    controle = Column(Float)
+    controle_min = Column(Float)
+    controle_max = Column(Float)
+    stress = Column(Float)
+    stress_min = Column(Float)
+    stress_max = Column(Float)
+    rentabilite = Column(Float)
+    rentabilite_min = Column(Float)
+    rentabilite_max = Column(Float)
+    reputation = Column(Float)
+    reputation_min = Column(Float)
+    reputation_max = Column(Float)
+    total_score = Column(Integer)
+
 class ConceptProgress(Base): # Tracks progress on specific concept
     __tablename__ = "concept_progress"
     
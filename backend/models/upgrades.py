@@ -0,0 +1,39 @@
+import logging
+from typing import List
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.engine import Engine
+from models.progress import Progress
+
+# create_all() creates the missing tables but leaves the existing ones as they are: columns and indexes added
+# to a table after databases were created with it are added here (startup step "database", idempotent).
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_UNIQUE = next(i for i in Progress.__table__.indexes if i.name == "uq_progress_student_mission")
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """Add what older databases miss, returns what was added"""
+    applied = []
+    inspector = inspect(engine)
+
+    if "version" not in {c["name"] for c in inspector.get_columns("users")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+        applied.append("users.version")
+
+    if PROGRESS_UNIQUE.name not in {i["name"] for i in inspector.get_indexes("progress")}:
+        with engine.begin() as conn:
+            duplicates = conn.execute(select(func.count()).select_from(
+                select(Progress.student_id)
+                .group_by(Progress.student_id, Progress.mission_id)
+                .having(func.count() > 1)
+                .subquery()
+            )).scalar()
+            if duplicates:
+                # rows left by concurrent submissions before the index existed: to be cleaned up by hand
+                logger.warning("duplicate progress rows, unique index not created", extra={"duplicates": duplicates})
+            else:
+                PROGRESS_UNIQUE.create(conn)
+                applied.append(PROGRESS_UNIQUE.name)
+    return applied
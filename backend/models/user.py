@@ -44,6 +44,8 @@ class Student(User):
     rentabilite = Column(Float, default=50.0)
     reputation = Column(Float, default=50.0)
     profile = Column(Integer, default=-1, nullable=False)
+    # bumped by every KPI update: submissions write them with a compare-and-swap (services/submission_service.py)
+    version = Column(Integer, default=0, server_default="0", nullable=False)
     notifications = relationship("Notification", back_populates="student")
     # to get the string for the front
     @property
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Optional
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from database import get_db
+from services.import_service import parse_record, import_submissions, IMPORT_BATCH_SIZE
+from utils.query_stats import route_query_stats
+from utils.request_profiler import profile_store, folded_text
+
+# maintenance operations (bulk import, ...)
+
+router = APIRouter()
+
+class ImportSummary(BaseModel):
+    records: int
+    imported: int
+    skipped_already_completed: int
+    students: int
+    dry_run: bool
+    errors: List[Dict[str, Any]]
+    error_count: int
+
+
+async def _read_ndjson(request: Request):
+    """Parse the body line by line as it arrives instead of buffering it whole."""
+    records, errors = [], []
+    pending, line_no = b"", 0
+
+    def handle(raw: bytes):
+        nonlocal line_no
+        line_no += 1
+        if not raw.strip():
+            return
+        try:
+            records.append(parse_record(json.loads(raw), line_no))
+        except (ValueError, TypeError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            handle(raw)
+    if pending:
+        handle(pending)
+    return records, errors
+
+
+@router.post("/admin/import/submissions", response_model=ImportSummary)
+async def import_submissions_endpoint(
+    request: Request,
+    create_missing_students: bool = False,
+    dry_run: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    db: Session = Depends(get_db)
+):
+    """
+    Body: NDJSON, one {student, mission_id, choices, time_spent_seconds, timestamp} record per line.
+    Records are replayed per student in chronological order, exactly like successive submissions.
+    """
+    records, parse_errors = await _read_ndjson(request)
+    summary = await run_in_threadpool(
+        import_submissions, db, records,
+        create_missing_students=create_missing_students, batch_size=batch_size,
+        dry_run=dry_run, parse_errors=parse_errors
+    )
+    return summary
+
+
+@router.get("/admin/query-stats")
+def get_query_stats():
+    """SQL queries per route since startup (or the last reset), routes issuing the most queries first."""
+    return {"routes": route_query_stats.snapshot()}
+
+
+@router.delete("/admin/query-stats")
+def reset_query_stats():
+    route_query_stats.reset()
+    return {"status": "reset"}
+
+
+@router.get("/admin/profiles")
+def list_profiles(route: Optional[str] = None, limit: int = 50):
+    """Stored request profiles, most recent first; `route` filters on e.g. 'suggest-strategy'."""
+    profiles = profile_store.list(route)
+    return {"count": len(profiles), "profiles": profiles[:limit]}
+
+
+@router.get("/admin/profiles/{profile_id}")
+def download_profile(profile_id: str, format: str = "json"):
+    """format=json (metadata + stacks) or folded (flamegraph.pl / speedscope input)."""
+    if format not in ("json", "folded"):
+        raise HTTPException(status_code=400, detail="format must be json or folded")
+    try:
+        profile = profile_store.get(profile_id)
+    except ValueError:
+        profile = None
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "folded":
+        return PlainTextResponse(
+            folded_text(profile),
+            headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+        )
+    return profile
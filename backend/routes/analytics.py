@@ -1,21 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-from database import get_db
+from database import get_analytics_db
 from models.user import User, UserRole, Student, Teacher
 from models.progress import Progress, MetricHistory
 from models.custom_feedback import Feedback
-from utils.game_loader import GameLoader
+from utils.game_loader import get_game_loader
 from services.teacher_service import add_concept_to_json
+from services import chart_service
+import services.leaderboard_service as leaderboards
+from utils.single_flight import analytics_cache
+from utils.workload import pooled_route, ANALYTICS_POOL
 from models.schemas import ConceptCreate, ConceptOut
 
 # mostly teacher dashboard and student analytics
 
-router = APIRouter()
-game_loader = GameLoader()
+router = APIRouter(route_class=pooled_route(ANALYTICS_POOL))
 
 class MetricPoint(BaseModel):
     date: datetime
@@ -40,6 +43,7 @@ class StudentChartData(BaseModel):
     mission_timeline: List[MissionTimelinePoint]
     concept_performance: Dict[str, Any]
     level_progression: Dict[str, Any]
+    sampling: Dict[str, Any] = {}
 
 class TeacherStudentMetrics(BaseModel):
     student_id: int
@@ -60,7 +64,18 @@ class TeacherDashboard(BaseModel):
     engagement_trends: List[Dict[str, Any]]
 
 @router.get("/students/{student_id}/chart-data", response_model=StudentChartData)
-async def get_student_chart_data(student_id: int, db: Session = Depends(get_db)):
+def get_student_chart_data(
+    student_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    resolution: str = Query("auto", pattern="^(" + "|".join(chart_service.RESOLUTIONS) + ")$"),
+    max_points: int = Query(chart_service.DEFAULT_MAX_POINTS, ge=10, le=5000),
+    db: Session = Depends(get_analytics_db)
+):
+    game_loader = get_game_loader()
+    start, end = chart_service.naive_utc(start), chart_service.naive_utc(end)
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=400, detail="`from` must be before `to`")
     student = db.query(User).filter(
         User.id == student_id, 
         User.role == UserRole.STUDENT
@@ -69,68 +84,37 @@ async def get_student_chart_data(student_id: int, db: Session = Depends(get_db))
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
-    # Get metrics over time
-    metrics_history = db.query(MetricHistory).filter(
-        MetricHistory.student_id == student_id
-    ).order_by(MetricHistory.recorded_at).all()
-    
-    metrics_over_time = [
-        MetricPoint(
-            date=record.recorded_at,
-            cashflow=record.cashflow,
-            controle=record.controle,
-            stress=record.stress,
-            rentabilite=record.rentabilite,
-            reputation=record.reputation,
-            total_score=record.total_score
-        )
-        for record in metrics_history
-    ]
+    # Metrics over time, bounded to max_points (see services/chart_service.py)
+    metrics_over_time, sampling = chart_service.metric_series(db, student_id, start, end, resolution, max_points)
     
     # Get mission timeline
-    progress_records = db.query(Progress).filter(
-        Progress.student_id == student_id
-    ).order_by(Progress.completed_at).all()
-    
-    mission_timeline = [
-        MissionTimelinePoint(
+    query = db.query(
+        Progress.completed_at, Progress.mission_id, Progress.concept, Progress.level,
+        Progress.score_earned, Progress.time_spent_seconds
+    ).filter(Progress.student_id == student_id)
+    if start is not None:
+        query = query.filter(Progress.completed_at >= start)
+    if end is not None:
+        query = query.filter(Progress.completed_at <= end)
+    progress_records = query.order_by(Progress.completed_at).all()
+
+    # Timeline, concept performance and level progression in one pass over the same rows
+    levels = ["débutant", "intermédiaire", "avancé"]
+    level_stats = {level: {"completed": 0, "score": 0, "seconds": 0} for level in levels}
+    concept_performance = {}
+    mission_timeline = []
+    for record in progress_records:
+        time_spent_seconds = record.time_spent_seconds or 0
+        mission_timeline.append(MissionTimelinePoint(
             date=record.completed_at,
             mission_id=record.mission_id,
             concept=record.concept,
             level=record.level,
             score_earned=record.score_earned,
-            time_spent_minutes=record.time_spent_seconds / 60.0,
-            time_spent_seconds=record.time_spent_seconds
-        )
-        for record in progress_records
-    ]
-    # mission_timeline = []
-    # for record in progress_records:
-    #     teacher_feedback = db.query(Feedback.comment).filter(
-    #         Feedback.student_id == student_id,
-    #         Feedback.mission_id == record.mission_id
-    # ).first()
-    
-    # mission_timeline.append(
-    #     MissionTimelinePoint(
-    #         date=record.completed_at,
-    #         mission_id=record.mission_id,
-    #         concept=record.concept,
-    #         level=record.level,
-    #         score_earned=record.score_earned,
-    #         time_spent_minutes=record.time_spent_seconds / 60.0,
-    #         time_spent_seconds=record.time_spent_seconds,
-    #         contexte=record.contexte,
-    #         objectif_pedagogique=record.objectif_pedagogique,
-    #         choix_etudiant=record.choix_etudiant,
-    #         feedback_teacher=teacher_feedback.feedback if teacher_feedback else None
-    #     )
-    # )
+            time_spent_minutes=time_spent_seconds / 60.0,
+            time_spent_seconds=time_spent_seconds
+        ))
 
-    
-    # Concept performance analysis
-    concept_performance = {}
-    for record in progress_records:
         concept = record.concept
         if concept not in concept_performance:
             concept_performance[concept] = {
@@ -140,10 +124,19 @@ async def get_student_chart_data(student_id: int, db: Session = Depends(get_db))
                 "avg_score": 0,
                 "avg_time_minutes": 0
             }
-        
         concept_performance[concept]["missions_completed"] += 1
         concept_performance[concept]["total_score"] += record.score_earned
-        concept_performance[concept]["total_time_minutes"] += record.time_spent_seconds / 60.0
+        concept_performance[concept]["total_time_minutes"] += time_spent_seconds / 60.0
+
+        stats = level_stats.get(record.level)
+        if stats is not None:
+            stats["completed"] += 1
+            stats["score"] += record.score_earned
+            stats["seconds"] += time_spent_seconds
+
+    # le graphe n'affiche que les plus récentes, les agrégats portent sur toute la période
+    sampling["timeline_total"] = len(mission_timeline)
+    mission_timeline = mission_timeline[-max_points:]
     
     # Calculate averages
     for concept_data in concept_performance.values():
@@ -152,35 +145,34 @@ async def get_student_chart_data(student_id: int, db: Session = Depends(get_db))
             concept_data["avg_time_minutes"] = concept_data["total_time_minutes"] / concept_data["missions_completed"]
     
     # Level progression
-    levels = ["débutant", "intermédiaire", "avancé"]
     level_progression = {}
-    
-    for level in levels:
-        level_missions = db.query(Progress).filter(
-            Progress.student_id == student_id,
-            Progress.level == level
-        ).all()
-        
+    for level, stats in level_stats.items():
         total_missions_in_level = len(game_loader.get_missions_by_level(level))
-        completed_missions = len(level_missions)
-        
+        completed_missions = stats["completed"]
         level_progression[level] = {
             "completed": completed_missions,
             "total": total_missions_in_level,
             "percentage": (completed_missions / total_missions_in_level * 100) if total_missions_in_level > 0 else 0,
-            "avg_score": sum(m.score_earned for m in level_missions) / len(level_missions) if level_missions else 0,
-            "total_time_hours": sum(m.time_spent_seconds for m in level_missions) / 3600.0
+            "avg_score": stats["score"] / completed_missions if completed_missions else 0,
+            "total_time_hours": stats["seconds"] / 3600.0
         }
     
     return StudentChartData(
         metrics_over_time=metrics_over_time,
         mission_timeline=mission_timeline,
         concept_performance=concept_performance,
-        level_progression=level_progression
+        level_progression=level_progression,
+        sampling=sampling
     )
 
+# Co-teachers opening the same view share one computation, kept a few seconds (utils/single_flight.py)
 @router.get("/teachers/{teacher_id}/students/{student_id}/metrics", response_model=TeacherStudentMetrics)
-async def get_teacher_student_metrics(teacher_id: int, student_id: int, db: Session = Depends(get_db)):
+def get_teacher_student_metrics(teacher_id: int, student_id: int, db: Session = Depends(get_analytics_db)):
+    return analytics_cache.get_or_compute(
+        ("student_metrics", teacher_id, student_id), lambda: _teacher_student_metrics(teacher_id, student_id, db)
+    )
+
+def _teacher_student_metrics(teacher_id: int, student_id: int, db: Session) -> TeacherStudentMetrics:
     # Verify teacher exists
     teacher = db.query(Teacher).filter(
         Teacher.id == teacher_id
@@ -277,7 +269,11 @@ async def get_teacher_student_metrics(teacher_id: int, student_id: int, db: Sess
     )
 
 @router.get("/teachers/{teacher_id}/dashboard", response_model=TeacherDashboard)
-async def get_teacher_dashboard(teacher_id: int, db: Session = Depends(get_db)):
+def get_teacher_dashboard(teacher_id: int, db: Session = Depends(get_analytics_db)):
+    return analytics_cache.get_or_compute(("dashboard", teacher_id), lambda: _teacher_dashboard(teacher_id, db))
+
+def _teacher_dashboard(teacher_id: int, db: Session) -> TeacherDashboard:
+    game_loader = get_game_loader()
     # Verify teacher exists
     teacher = db.query(Teacher).filter(
         Teacher.id == teacher_id
@@ -309,26 +305,15 @@ async def get_teacher_dashboard(teacher_id: int, db: Session = Depends(get_db)):
     
     avg_completion_rate = sum(completion_rates) / len(completion_rates) if completion_rates else 0
     
-    # Top performing students
-    top_students_query = db.query(
-        Student.id,
-        Student.name,
-        Student.total_score,
-        func.count(Progress.id).label('missions_completed')
-    ).join(Progress, Student.id == Progress.student_id)\
-     .filter(Student.role == UserRole.STUDENT)\
-     .group_by(Student.id, Student.name, Student.total_score)\
-     .order_by(desc(Student.total_score))\
-     .limit(5).all()
-    
+    # Top performing students (global leaderboard, maintained on each submission)
     top_performing_students = [
         {
-            "student_id": student.id,
-            "name": student.name,
-            "total_score": student.total_score,
-            "missions_completed": student.missions_completed
+            "student_id": entry["student_id"],
+            "name": entry["name"],
+            "total_score": entry["total_score"],
+            "missions_completed": entry["missions_completed"]
         }
-        for student in top_students_query
+        for entry in leaderboards.top(db, limit=5)
     ]
     
     # Concept difficulty analysis
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+import logging
+from datetime import datetime
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 from database import get_db
 from models.schemas import ClassCreate, ClassResponse, StudentBase
 import services.classroom_service as crud_classroom
 from models.notification import Notification
 from models.user import Student
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 @router.post("/classes", response_model=ClassResponse)
 def create_class(
@@ -42,6 +46,58 @@ def remove_student_from_class(class_id: int, student_id: int, db: Session = Depe
 def get_class_students(class_id: int, db: Session = Depends(get_db)):
     return crud_classroom.get_class_students(db, class_id)
 
+class ReviewFeedback(BaseModel):
+    id: int
+    teacher_id: int
+    comment: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ReviewedMission(BaseModel):
+    mission_id: str
+    concept: str
+    niveau: str
+    type: str
+    contexte: str
+    objectif_pedagogique: str
+    choix_etudiant: Dict[str, Any]
+    score_earned: int
+    feedback_auto: str
+    completed_at: Optional[datetime]
+    feedback_teacher: List[ReviewFeedback]
+
+class StudentReview(BaseModel):
+    student_id: int
+    name: str
+    email: str
+    level_ai: Optional[str]
+    total_score: int
+    missions: List[ReviewedMission]
+
+class ClassReview(BaseModel):
+    class_id: int
+    class_name: str
+    total_students: int
+    offset: int
+    limit: int
+    students: List[StudentReview]
+
+# Écran de revue de classe : une page d'élèves avec leurs missions et les feedbacks, en un seul appel
+@router.get("/teachers/{teacher_id}/classes/{class_id}/review", response_model=ClassReview)
+def get_class_review(
+    teacher_id: int,
+    class_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(40, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    review = crud_classroom.get_class_review(db, teacher_id, class_id, offset, limit)
+    if review is None:
+        raise HTTPException(status_code=404, detail="Class not found for this teacher")
+    return review
+
 @router.post("/test-notif/{student_id}")
 def test_notification(student_id: int, db: Session = Depends(get_db)):
     test_notif = Notification(
@@ -49,13 +105,10 @@ def test_notification(student_id: int, db: Session = Depends(get_db)):
         type="class_add",
         message="Test direct"
     )
-    print("DB in use:", db.bind.url)
     db.add(test_notif)
-    print("Before commit:", test_notif.__table__.fullname)
-    print("Session info:", db.bind)
     db.commit()
     notif_in_db = db.query(Notification).filter(Notification.id == test_notif.id).first()
-    print("🔍 Found:", notif_in_db)
+    logger.debug("test notification", extra={"db": str(db.bind.url), "table": test_notif.__table__.fullname, "found": notif_in_db is not None})
     return {"message": "Notification created!"}
 
 @router.get("/students/{student_id}/classes")
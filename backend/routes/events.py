@@ -1,10 +1,49 @@
-from fastapi import APIRouter
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from utils.game_loader import GameLoader
+from utils.http_cache import cached_catalog, catalog_response
+from utils.sparse_fields import parse_fields, project
 
 router = APIRouter()
+
+
+def event_summary(event: Dict[str, Any]) -> Dict[str, Any]:
+    """What the list views show: the context block (definition, timeline, sources) is left for the detail"""
+    context = event.get("context") or {}
+    return {
+        "id": event["id"],
+        "title": event.get("title"),
+        "message": event.get("message"),
+        "type": context.get("type") or event.get("type"),
+        "date": event.get("date"),
+        "period": context.get("period"),
+    }
+
+
 @router.get("/events")
-def get_all_events():
-    game_loader = GameLoader()
+def get_all_events(request: Request, fields: Optional[str] = None, game_loader: GameLoader = Depends(cached_catalog)):
+    """Full events; ?fields=id,title,context.type for a sparse fieldset"""
+    selected = parse_fields(fields)
     # self.events est un dict → on veut une liste de valeurs
-    events_list = list(game_loader.events.values())
-    return events_list
\ No newline at end of file
+    return catalog_response(request, game_loader, ("events", selected), lambda: [
+        project(event, selected) for event in jsonable_encoder(list(game_loader.events.values()))
+    ])
+
+
+@router.get("/events/summary")
+def get_events_summary(request: Request, fields: Optional[str] = None, game_loader: GameLoader = Depends(cached_catalog)):
+    """id, title, message, type, date and period of every event, for list views"""
+    selected = parse_fields(fields)
+    return catalog_response(request, game_loader, ("events_summary", selected), lambda: [
+        project(event_summary(event), selected) for event in jsonable_encoder(list(game_loader.events.values()))
+    ])
+
+
+@router.get("/events/{event_id}")
+def get_event(event_id: str, request: Request, fields: Optional[str] = None, game_loader: GameLoader = Depends(cached_catalog)):
+    event = game_loader.get_event_by_id(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    selected = parse_fields(fields)
+    return catalog_response(request, game_loader, ("event", event_id, selected), lambda: project(jsonable_encoder(event), selected))
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from database import get_db
+from models.classroom import Class
+from services.chart_service import naive_utc
+from services.export_service import export_stream, FORMATS
+
+# bulk downloads of a class history for teachers
+
+router = APIRouter()
+
+@router.get("/classes/{class_id}/export/{dataset}")
+def export_class_dataset(
+    class_id: int,
+    dataset: str,
+    format: str = "csv",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Stream `progress`, `metric_history` or `concept_progress` rows of every student of the class
+    as csv, ndjson or parquet (parquet needs pyarrow). Dates filter completed_at / recorded_at.
+    """
+    class_ = db.query(Class.id, Class.name).filter(Class.id == class_id).first()
+    if not class_:
+        raise HTTPException(status_code=404, detail="Class not found")
+
+    # the columns hold naive UTC: an offset on a bound would be dropped by SQLite, not applied
+    body = export_stream(dataset, format, class_id, naive_utc(date_from), naive_utc(date_to))
+    filename = f"class_{class_id}_{dataset}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import List
+from database import get_db
+from models.classroom import Class
+from models.leaderboard import GLOBAL_BOARD
+import services.leaderboard_service as leaderboards
+
+router = APIRouter()
+
+class LeaderboardRow(BaseModel):
+    rank: int
+    student_id: int
+    name: str
+    total_score: int
+    missions_completed: int
+
+class Leaderboard(BaseModel):
+    class_id: int  # 0: global
+    board_size: int
+    entries: List[LeaderboardRow]
+
+class StudentStanding(BaseModel):
+    class_id: int
+    student_id: int
+    rank: int
+    board_size: int
+    total_score: int
+    missions_completed: int
+    neighbors: List[LeaderboardRow]
+
+# Global ranking (students with at least one mission)
+@router.get("/leaderboard", response_model=Leaderboard)
+def get_global_leaderboard(limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    return Leaderboard(
+        class_id=GLOBAL_BOARD,
+        board_size=leaderboards.board_size(db),
+        entries=leaderboards.top(db, GLOBAL_BOARD, limit),
+    )
+
+# Ranking of a class (every enrolled student)
+@router.get("/classes/{class_id}/leaderboard", response_model=Leaderboard)
+def get_class_leaderboard(class_id: int, limit: int = Query(10, ge=1, le=100), db: Session = Depends(get_db)):
+    if not db.query(Class.id).filter(Class.id == class_id).first():
+        raise HTTPException(status_code=404, detail="Class not found")
+    return Leaderboard(
+        class_id=class_id,
+        board_size=leaderboards.board_size(db, class_id),
+        entries=leaderboards.top(db, class_id, limit),
+    )
+
+# Rank of a student and the students around them (class_id=0: global board)
+@router.get("/students/{student_id}/rank", response_model=StudentStanding)
+def get_student_rank(
+    student_id: int,
+    class_id: int = Query(GLOBAL_BOARD, ge=0),
+    around: int = Query(2, ge=0, le=20),
+    db: Session = Depends(get_db)
+):
+    standing = leaderboards.standing(db, student_id, class_id, around)
+    if standing is None:
+        raise HTTPException(status_code=404, detail="Student not on this leaderboard")
+    return standing
@@ -1,16 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 from database import get_db
 from models.user import User, UserRole
 from models.progress import Progress, ConceptProgress
-from utils.game_loader import GameLoader
+from utils.game_loader import GameLoader, get_game_loader
+from utils.http_cache import cached_catalog, catalog_response
+from utils.sparse_fields import parse_fields, project
 from utils.evaluator import MissionEvaluator
 import random
+from utils.workload import pooled_route, GAMEPLAY_POOL
 
-router = APIRouter()
-game_loader = GameLoader()
+router = APIRouter(route_class=pooled_route(GAMEPLAY_POOL))
  
 class MissionResponse(BaseModel):
     id: str
@@ -50,7 +53,8 @@ class ConceptResponse(BaseModel):
     progression: int
 
 @router.get("/students/{student_id}/next-mission", response_model=MissionResponse)
-async def get_next_mission(student_id: int, db: Session = Depends(get_db)):
+def get_next_mission(student_id: int, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     # Get student
     student = db.query(User).filter(
         User.id == student_id,
@@ -92,6 +96,9 @@ async def get_next_mission(student_id: int, db: Session = Depends(get_db)):
 
         raise HTTPException(status_code=404, detail="Toutes les missions ont été complétées.")
 
+    # Work on a copy: the mission dict belongs to the shared catalog
+    next_mission = dict(next_mission)
+
     # Add dynamic context
     if "secteurs" in next_mission:
         next_mission["secteur"] = random.choice(next_mission["secteurs"])
@@ -111,38 +118,51 @@ async def get_next_mission(student_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/missions/{level}", response_model=List[MissionResponse])
-async def get_missions_by_level(level: str):
-    missions = game_loader.get_missions_by_level(level)
-    return [MissionResponse(**mission) for mission in missions]
+async def get_missions_by_level(level: str, request: Request, fields: Optional[str] = None, game_loader: GameLoader = Depends(cached_catalog)):
+    """?fields=id,concept,type for a sparse fieldset"""
+    selected = parse_fields(fields)
+    def build():
+        missions = game_loader.get_missions_by_level(level)
+        return [project(MissionResponse(**mission).model_dump(mode="json"), selected) for mission in missions]
+    return catalog_response(request, game_loader, ("missions_by_level", level, selected), build)
 
 @router.get("/concepts/{level}")
-async def get_concepts_by_level(level: str):
-    missions = game_loader.get_missions_by_level(level)
-    concepts = {}
-    
-    for mission in missions:
-        concept = mission["concept"]
-        if concept not in concepts:
-            concepts[concept] = []
-        concepts[concept].append(mission)
-    
-    return {
-        "level": level,
-        "concepts": list(concepts.keys()),
-        "missions_by_concept": concepts
-    }
+async def get_concepts_by_level(level: str, request: Request, game_loader: GameLoader = Depends(cached_catalog)):
+    def build():
+        missions = game_loader.get_missions_by_level(level)
+        concepts = {}
+
+        for mission in missions:
+            concept = mission["concept"]
+            if concept not in concepts:
+                concepts[concept] = []
+            concepts[concept].append(mission)
+
+        return jsonable_encoder({
+            "level": level,
+            "concepts": list(concepts.keys()),
+            "missions_by_concept": concepts
+        })
+    return catalog_response(request, game_loader, ("concepts_by_level", level), build)
 
 @router.get("/concepts", response_model=List[ConceptResponse])
-async def get_all_concepts():
-    return game_loader.get_all_concepts()
+async def get_all_concepts(request: Request, game_loader: GameLoader = Depends(cached_catalog)):
+    return catalog_response(request, game_loader, ("concepts",), lambda: [
+        ConceptResponse(**concept).model_dump(mode="json") for concept in game_loader.get_all_concepts()
+    ])
 
 @router.get("/concepts/{concept_id}/missions", response_model=List[MissionResponse])
-async def get_missions_by_concept(concept_id: str):
-    missions = game_loader.get_missions_by_concept(concept_id)
-    return [MissionResponse(**mission) for mission in missions]
+async def get_missions_by_concept(concept_id: str, request: Request, fields: Optional[str] = None, game_loader: GameLoader = Depends(cached_catalog)):
+    """?fields=id,niveau,type for a sparse fieldset"""
+    selected = parse_fields(fields)
+    def build():
+        missions = game_loader.get_missions_by_concept(concept_id)
+        return [project(MissionResponse(**mission).model_dump(mode="json"), selected) for mission in missions]
+    return catalog_response(request, game_loader, ("missions_by_concept", concept_id, selected), build)
 
 @router.get("/missions/id/{mission_id}", response_model=MissionResponse)
 async def get_mission_by_id(mission_id: str):
+    game_loader = get_game_loader()
     mission = game_loader.get_mission_by_id(mission_id)
     if not mission:
         raise HTTPException(status_code=404, detail="Mission not found")
@@ -150,7 +170,8 @@ async def get_mission_by_id(mission_id: str):
     return MissionResponse(**mission)
 
 @router.get("/students/{student_id}/level-progress", response_model=List[LevelSummary])
-async def get_level_progress(student_id: int, db: Session = Depends(get_db)):
+def get_level_progress(student_id: int, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     student = db.query(User).filter(
         User.id == student_id, 
         User.role == UserRole.STUDENT
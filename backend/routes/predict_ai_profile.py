@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from services.predict_ai_profile import predict_tilt
+from typing import Any, Dict, List
+from services.predict_ai_profile import predict_tilt, refresh_model
+from services import model_registry
 
 router = APIRouter()
 
@@ -25,4 +27,18 @@ class TiltResponse(BaseModel):
 @router.post("/ai_profile", response_model=TiltResponse)
 async def predict_profile_endpoint(req: FeaturesRequest):
     tilt=predict_tilt(req)
-    return {"tilt": tilt}
\ No newline at end of file
+    return {"tilt": tilt}
+
+@router.get("/ai_profile/models", response_model=List[Dict[str, Any]])
+def list_profile_models():
+    return model_registry.list_versions()
+
+@router.post("/ai_profile/models/{version}/activate")
+def activate_profile_model(version: str):
+    try:
+        model_registry.activate_version(version)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # this worker switches right away, the others on their next reload check
+    model = refresh_model(force=True)
+    return {"active_version": model.version if model else None}
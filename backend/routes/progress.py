@@ -1,22 +1,26 @@
 from fastapi import APIRouter, Depends, HTTPException
+import logging
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 from database import get_db
 from models.user import User, UserRole
-from models.progress import Progress, MetricHistory
-from utils.game_loader import GameLoader
+from models.progress import Progress
+from utils.game_loader import get_game_loader
 from utils.evaluator import MissionEvaluator
 from datetime import datetime
 from models.progress import ConceptProgress
 from services.predict_ai_profile import run_profiling
+from services.submission_service import write_submission
 from models.notification import Notification
 from models.custom_feedback import Feedback
 from models.schemas import FeedbackCreate, FeedbackOut
+from utils.workload import pooled_route, GAMEPLAY_POOL
+from utils.group_commit import SUBMIT_BATCHING, submission_writer
 
-router = APIRouter()
-game_loader = GameLoader()
+router = APIRouter(route_class=pooled_route(GAMEPLAY_POOL))
+logger = logging.getLogger(__name__)
 class StudentMissionDetail(BaseModel):
     mission_id: str
     concept: str
@@ -31,7 +35,7 @@ class StudentMissionDetail(BaseModel):
 
 
 @router.post("/teachers/{teacher_id}/students/{student_id}/missions/{mission_id}/feedback",response_model=FeedbackOut)
-async def add_teacher_feedback(
+def add_teacher_feedback(
     teacher_id: int,
     student_id: int,
     mission_id: str,
@@ -60,11 +64,12 @@ async def add_teacher_feedback(
     return new_feedback
 
 @router.get("/teachers/{teacher_id}/students/{student_id}/missions", response_model=List[StudentMissionDetail])
-async def get_student_missions_for_teacher(
+def get_student_missions_for_teacher(
     teacher_id: int,
     student_id: int,
     db: Session = Depends(get_db)
 ):
+    game_loader = get_game_loader()
     #  Validate teacher
     teacher = db.query(User).filter(User.id == teacher_id, User.role == UserRole.TEACHER).first()
     if not teacher:
@@ -101,7 +106,7 @@ async def get_student_missions_for_teacher(
     return result
 
 @router.get("/students/{student_id}/missions/{mission_id}/feedback")
-async def get_feedback(student_id: int, mission_id: str, db: Session = Depends(get_db)):
+def get_feedback(student_id: int, mission_id: str, db: Session = Depends(get_db)):
     feedbacks = db.query(Feedback).filter_by(student_id=student_id, mission_id=mission_id).all()
     return feedbacks
 
@@ -145,12 +150,13 @@ class ConceptProgressResponse(BaseModel):
 
 
 @router.post("/students/{student_id}/missions/{mission_id}/submit", response_model=MissionResult)
-async def submit_mission(
+def submit_mission(
     student_id: int, 
     mission_id: str, 
     submission: MissionSubmission, 
     db: Session = Depends(get_db)
       ):
+    game_loader = get_game_loader()
     # Get student
     student = db.query(User).filter(
         User.id == student_id, 
@@ -184,111 +190,22 @@ async def submit_mission(
     # feedback_map = mission.get("feedback", {})
     # feedback_text = feedback_map.get(main_choice, "")
 
-    
-    # Store metrics before changes
-    old_metrics = {
-        "cashflow": student.cashflow,
-        "controle": student.controle,
-        "stress": student.stress,
-        "rentabilite": student.rentabilite,
-        "reputation": student.reputation
-    }
-    
-    # Update student metrics
-    student.cashflow += result["metrics_changes"]["cashflow"]
-    student.controle += result["metrics_changes"]["controle"]
-    student.stress += result["metrics_changes"]["stress"]
-    student.rentabilite += result["metrics_changes"]["rentabilite"]
-    student.reputation += result["metrics_changes"]["reputation"]
-    student.total_score += result["score_earned"]
-    
-    # Clamp metrics to reasonable bounds
-    student.cashflow = max(-100, min(200, student.cashflow))
-    student.controle = max(0, min(100, student.controle))
-    student.stress = max(0, min(100, student.stress))
-    student.rentabilite = max(-50, min(150, student.rentabilite))
-    student.reputation = max(0, min(100, student.reputation))
-    
-    # Create progress record
-    progress = Progress(
-        student_id=student_id,
-        mission_id=mission_id,
-        concept=mission["concept"],
-        level=mission["niveau"],
-        choices_made=submission.choices,
-        score_earned=result["score_earned"],
-        time_spent_seconds=submission.time_spent_seconds,
-        cashflow_after=student.cashflow,
-        controle_after=student.controle,
-        stress_after=student.stress,
-        rentabilite_after=student.rentabilite,
-        reputation_after=student.reputation
-    )
-    db.add(progress)
-    db.commit()
-
-    missions_completed_total = db.query(Progress).filter(Progress.student_id == student_id).count()
+    # KPIs, leaderboards, Progress, ConceptProgress, MetricHistory: one transaction
+    def write(session: Session):
+        return write_submission(session, game_loader, student_id, mission_id, mission,
+                                submission.choices, submission.time_spent_seconds, result)
 
-# Lancer le profilage tous les 8 missions
-    print(f"[AI] missions {missions_completed_total}")
-    if missions_completed_total % 8 == 0:
-        run_profiling(student_id, db)
-        print(f"[DEBUG] Profilage exécuté pour l'étudiant {student_id} après {missions_completed_total} missions")
-    
-    
-    
-    concept_name = mission["concept"]
-    niveau = mission["niveau"]
-
-    concept_progress = db.query(ConceptProgress).filter(
-    and_(
-        ConceptProgress.student_id == student_id,
-        ConceptProgress.concept == concept_name
-    )
-    ).first()
-
-    if not concept_progress:
-        concept_progress = ConceptProgress(
-        student_id=student_id,
-        concept=concept_name,
-        missions_completed=1,
-        total_missions=1,  # sera corrigé juste après
-        is_completed=False
-    )
-        db.add(concept_progress)
+    if SUBMIT_BATCHING:
+        # committed by the writer thread together with the other submissions of the burst
+        outcome = submission_writer.run(write)
     else:
-        concept_progress.missions_completed += 1
-
-# Mise à jour du total et du statut
-    total_missions = len([
-        m for m in game_loader.get_all_missions()
-        if m["concept"] == concept_name and m["niveau"] == niveau
-])
-    
-    concept_progress.total_missions = total_missions
-    
-    if total_missions%6==0:
-        run_profiling(student_id, db)
+        outcome = write(db)
         db.commit()
-        print(f"[AI] updated profile {run_profiling}")
 
-    if concept_progress.missions_completed >= total_missions:
-        concept_progress.is_completed = True
-        concept_progress.completed_at = datetime.utcnow()
-    
-    # Create metric history record
-    metric_history = MetricHistory(
-        student_id=student_id,
-        mission_id=mission_id,
-        cashflow=student.cashflow,
-        controle=student.controle,
-        stress=student.stress,
-        rentabilite=student.rentabilite,
-        reputation=student.reputation,
-        total_score=student.total_score
-    )
-    
-    db.add(metric_history)
+# Lancer le profilage tous les 8 missions (features lues sur les Progress commités)
+    if outcome["profiling_due"]:
+        tilt = run_profiling(student_id, db)
+        logger.debug("profiling run", extra={"student_id": student_id, "mission_id": mission_id, "tilt": tilt})
     
     # Check for level progression
     # level_up = False
@@ -306,24 +223,17 @@ async def submit_mission(
     #         level_up = True
     #         new_level = "avancé"
     
-    db.commit()
-    
     return MissionResult(
         success=True,
         score_earned=result["score_earned"],
         metrics_changes=result["metrics_changes"],
-        new_metrics={
-            "cashflow": student.cashflow,
-            "controle": student.controle,
-            "stress": student.stress,
-            "rentabilite": student.rentabilite,
-            "reputation": student.reputation
-        },
+        new_metrics=outcome["new_metrics"],
         feedback=result["feedback"]
     )
 
 @router.get("/students/{student_id}/concept-progress", response_model=List[ConceptProgressSummary])
-async def get_student_concept_progress(student_id: int, db: Session = Depends(get_db)):
+def get_student_concept_progress(student_id: int, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     # Vérifier que l'étudiant existe
     student = db.query(User).filter(
         User.id == student_id,
@@ -333,24 +243,26 @@ async def get_student_concept_progress(student_id: int, db: Session = Depends(ge
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
 
-    # 1. Récupérer toutes les missions groupées par concept
-    all_missions = game_loader.get_all_missions()
-    concept_map = {}
-    for mission in all_missions:
-        concept = mission["concept"]
-        if concept not in concept_map:
-            concept_map[concept] = []
-        concept_map[concept].append(mission)
+    # 1. Missions complétées par mission (une seule requête groupée), puis par concept via l'index du catalogue
+    completed_by_mission = dict(
+        db.query(Progress.mission_id, func.count(Progress.id))
+        .filter(Progress.student_id == student_id)
+        .group_by(Progress.mission_id)
+        .all()
+    )
+    completed_by_concept = {}
+    for mission_id, count in completed_by_mission.items():
+        concept = game_loader.get_mission_concept(mission_id)
+        if concept is not None:
+            completed_by_concept[concept] = completed_by_concept.get(concept, 0) + count
 
     concept_metadata = game_loader.concepts
-    # 2. Compter les missions complétées par concept
+    # 2. Une ligne par concept du catalogue
     results = []
-    for concept, missions in concept_map.items():
-        mission_ids = [m["id"] for m in missions]
-        completed_count = db.query(Progress).filter(
-            Progress.student_id == student_id,
-            Progress.mission_id.in_(mission_ids)
-        ).count()
+    for concept, mission_ids in game_loader.mission_ids_by_concept().items():
+        if concept is None:
+            continue
+        completed_count = completed_by_concept.get(concept, 0)
         concept_info = concept_metadata.get(concept, {})
         profiles = concept_info.get("profiles", [])
 
@@ -365,7 +277,8 @@ async def get_student_concept_progress(student_id: int, db: Session = Depends(ge
     return results
 
 @router.get("/students/{student_id}/concepts/{concept_id}/progress", response_model=ConceptProgressResponse)
-async def get_concept_progress(student_id: str, concept_id: str, db: Session = Depends(get_db)):
+def get_concept_progress(student_id: str, concept_id: str, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     # Vérifier que l'étudiant existe
     student = db.query(User).filter(
         User.id == student_id,
@@ -374,26 +287,26 @@ async def get_concept_progress(student_id: str, concept_id: str, db: Session = D
     if not student:
         raise HTTPException(status_code=404, detail="Étudiant introuvable")
 
-    missions = game_loader.get_missions_by_concept(concept_id)
-    mission_ids = [m["id"] for m in missions]
+    # ids listés par le concept (index du catalogue, sans copier ni modifier les missions partagées)
+    mission_ids = game_loader.get_concept_mission_ids(concept_id)
 
     # Récupérer les missions complétées par cet étudiant dans ce concept
-    completed_progress = db.query(Progress).filter(
-        Progress.student_id == student_id,
-        Progress.mission_id.in_(mission_ids)
-    ).all()
-
-    completed_ids = set(p.mission_id for p in completed_progress)
+    completed_ids = {
+        mission_id for (mission_id,) in db.query(Progress.mission_id).filter(
+            Progress.student_id == student_id,
+            Progress.mission_id.in_(mission_ids)
+        )
+    }
 
     # Organiser les missions par niveau
     levels = ["débutant", "intermédiaire", "avancé"]
     progress = {lvl: [] for lvl in levels}
 
-    for mission in missions:
-        niveau = mission.get("niveau", "débutant")
+    for mission_id in mission_ids:
+        niveau = game_loader.missions[mission_id].get("niveau", "débutant")
         progress[niveau].append(MissionStatus(
-            id=mission["id"],
-            completed=mission["id"] in completed_ids
+            id=mission_id,
+            completed=mission_id in completed_ids
         ))
 
     return ConceptProgressResponse(
@@ -402,7 +315,8 @@ async def get_concept_progress(student_id: str, concept_id: str, db: Session = D
     )
 
 @router.get("/students/{student_id}/progress", response_model=ProgressSummary)
-async def get_student_progress(student_id: int, db: Session = Depends(get_db)):
+def get_student_progress(student_id: int, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     student = db.query(User).filter(
         User.id == student_id, 
         User.role == UserRole.STUDENT
@@ -468,6 +382,7 @@ async def get_student_progress(student_id: int, db: Session = Depends(get_db)):
 
 def _check_level_completion(student_id: int, level: str, db: Session) -> bool:
     """Check if all concepts in a level are completed"""
+    game_loader = get_game_loader()
     missions = game_loader.get_missions_by_level(level)
     concepts = set(mission["concept"] for mission in missions)
     
@@ -487,6 +402,7 @@ def _check_level_completion(student_id: int, level: str, db: Session) -> bool:
 @router.get("/debug/concept/{concept_id}")
 async def debug_concept(concept_id: str):
     """Debug endpoint to see raw concept data"""
+    game_loader = get_game_loader()
     raw_concept = game_loader.get_concept(concept_id)
     return {
         "concept_id": concept_id,
@@ -502,7 +418,7 @@ from sqlalchemy.orm import Session
 from models.user import User, UserRole
 from models.progress import Progress
 from models.custom_feedback import Feedback
-from utils.game_loader import GameLoader
+from utils.game_loader import get_game_loader
 from database import get_db
 from pydantic import BaseModel
 
@@ -524,6 +440,7 @@ class MissionReport(BaseModel):
 
 @router.get("/students/{student_id}/missions/{mission_id}/report", response_model=MissionReport)
 def get_mission_report(student_id: int, mission_id: str, db: Session = Depends(get_db)):
+    game_loader = get_game_loader()
     # Validate student
     student = db.query(User).filter(User.id == student_id, User.role == UserRole.STUDENT).first()
     if not student:
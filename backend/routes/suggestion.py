@@ -2,8 +2,9 @@ from fastapi import APIRouter, Depends
 from services.strategy.suggest_service import suggest_strategy
 from models.schemas import SuggestRequest, SuggestResponse 
 from services.strategy.strategic_context_service import get_strategic_context
+from utils.workload import pooled_route, GAMEPLAY_POOL
 
-router = APIRouter()
+router = APIRouter(route_class=pooled_route(GAMEPLAY_POOL))
 
 @router.get("/strategy/students/{student_id}/suggest")
 def suggest_bundle(student_id: int, goal: str, max_bundle: int = 3, concept_whitelist: str = None):
@@ -12,7 +13,7 @@ def suggest_bundle(student_id: int, goal: str, max_bundle: int = 3, concept_whit
     return suggest_strategy(req)
 
 @router.post("/strategy/suggest-strategy", response_model=SuggestResponse)
-async def suggest_strategy_endpoint(req: SuggestRequest):
+def suggest_strategy_endpoint(req: SuggestRequest):
     return suggest_strategy(req)
 
 
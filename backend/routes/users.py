@@ -50,7 +50,7 @@ class TeacherResponse(BaseModel):
         from_attributes = True
 
 @router.post("/students/", response_model=StudentResponse)
-async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
+def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     # Check if email already exists
     existing_user = db.query(Student).filter(User.email == student.email).first()
     if existing_user:
@@ -78,7 +78,7 @@ async def create_student(student: StudentCreate, db: Session = Depends(get_db)):
     return db_student
 
 @router.post("/teachers/", response_model=TeacherResponse)
-async def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
+def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
     # Check if email already exists
     existing_user = db.query(Teacher).filter(Teacher.email == teacher.email).first()
     if existing_user:
@@ -98,7 +98,7 @@ async def create_teacher(teacher: TeacherCreate, db: Session = Depends(get_db)):
     return db_teacher
 
 @router.get("/students/{student_id}", response_model=StudentResponse)
-async def get_student(student_id: int, db: Session = Depends(get_db)):
+def get_student(student_id: int, db: Session = Depends(get_db)):
     student = db.query(Student).filter(
         Student.id == student_id
     ).first()
@@ -109,7 +109,7 @@ async def get_student(student_id: int, db: Session = Depends(get_db)):
     return student
 
 @router.get("/teachers/{teacher_id}", response_model=TeacherResponse)
-async def get_teacher(teacher_id: int, db: Session = Depends(get_db)):
+def get_teacher(teacher_id: int, db: Session = Depends(get_db)):
     teacher = db.query(Teacher).filter(
         Teacher.id == teacher_id
     ).first()
@@ -120,12 +120,12 @@ async def get_teacher(teacher_id: int, db: Session = Depends(get_db)):
     return teacher
 
 @router.get("/students/", response_model=List[StudentResponse])
-async def list_students(db: Session = Depends(get_db)):
+def list_students(db: Session = Depends(get_db)):
     students = db.query(Student).all()
     return students
 
 @router.get("/teachers/", response_model=List[TeacherResponse])
-async def list_teachers(db: Session = Depends(get_db)):
+def list_teachers(db: Session = Depends(get_db)):
     teachers = db.query(Teacher).all()
     return teachers
 
@@ -0,0 +1,35 @@
+"""
+Compile the JSON catalog into DATA_DIR/catalog.snapshot (see utils/catalog_snapshot.py).
+Run after every catalog change that is deployed; a stale snapshot is ignored, never served.
+
+Run from backend/:
+    python -m scripts.build_catalog_snapshot
+    ECOLEAD_DATA_DIR=data_scaled python -m scripts.build_catalog_snapshot
+    python -m scripts.build_catalog_snapshot --check     # exit 1 unless the snapshot is fresh
+"""
+import os
+import sys
+import time
+import argparse
+from utils.game_loader import DATA_DIR
+from utils.catalog_snapshot import write_snapshot, snapshot_status, snapshot_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precompiled catalog snapshot")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--check", action="store_true", help="only report whether the snapshot is fresh")
+    args = parser.parse_args()
+
+    if args.check:
+        status = snapshot_status(args.data_dir)
+        print(f"{snapshot_path(args.data_dir)}: {status}")
+        sys.exit(0 if status == "fresh" else 1)
+
+    start = time.perf_counter()
+    path = write_snapshot(args.data_dir)
+    print(f"Wrote {path} ({os.path.getsize(path) / 1024:.0f} KiB) in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Retention job for MetricHistory: rows older than --raw-days become daily rollups, daily rollups older than
+--daily-days become weekly ones (see services/metric_retention.py). Safe to run repeatedly, e.g. nightly:
+    0 3 * * *  cd /srv/ecolead/backend && python -m scripts.compact_metric_history
+
+Run from backend/:
+    python -m scripts.compact_metric_history
+    python -m scripts.compact_metric_history --raw-days 30 --daily-days 180
+    python -m scripts.compact_metric_history --dry-run
+"""
+import json
+import argparse
+from database import SessionLocal, engine, Base
+import models.all  # noqa: F401  register all mappers
+from services.metric_retention import compact_metric_history, RAW_DAYS, DAILY_DAYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Roll old MetricHistory rows into daily/weekly rollups")
+    parser.add_argument("--raw-days", type=int, default=RAW_DAYS, help="days kept at full resolution")
+    parser.add_argument("--daily-days", type=int, default=DAILY_DAYS, help="days kept as daily rollups")
+    parser.add_argument("--dry-run", action="store_true", help="compute everything then roll back")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)  # metric_rollups on databases created before it existed
+    db = SessionLocal()
+    try:
+        summary = compact_metric_history(db, raw_days=args.raw_days, daily_days=args.daily_days, dry_run=args.dry_run)
+    finally:
+        db.close()
+    print(json.dumps(summary, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
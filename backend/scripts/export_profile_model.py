@@ -0,0 +1,46 @@
+"""
+Export the pickled AI profile model (data/kmeans.pkl + data/scaler.pkl) to data/profile_model.npz,
+the format read by the NumPy predictor in services/predict_ai_profile.py.
+
+Run from backend/:
+    python -m scripts.export_profile_model            # export and check predictions match scikit-learn
+    python -m scripts.export_profile_model --samples 0
+"""
+import argparse
+import joblib
+import numpy as np
+from services import model_registry
+from services.features_service import FEATURE_SPEC
+from services.predict_ai_profile import MODEL, SCALER, MODEL_NPZ, TILT_MAP, NearestCentroidModel
+
+
+def check_equivalence(scaler, kmeans, model: NearestCentroidModel, samples: int, seed: int = 0) -> int:
+    """Return how many of `samples` random feature vectors get a different cluster than scikit-learn."""
+    rng = np.random.default_rng(seed)
+    n_features = len(FEATURE_SPEC["feature_names"])
+    # spread around the training distribution, plus the all-zeros vector used for students without history
+    X = scaler.mean_ + rng.normal(size=(samples, n_features)) * scaler.scale_ * 3
+    X = np.vstack([X, np.zeros((1, n_features))])
+    expected = kmeans.predict(scaler.transform(X))
+    return int((model.predict(X) != expected).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the pickled profile model to .npz")
+    parser.add_argument("--samples", type=int, default=100_000, help="random vectors used for the equivalence check")
+    args = parser.parse_args()
+
+    kmeans, scaler = joblib.load(MODEL), joblib.load(SCALER)
+    model_registry.export_npz(scaler, kmeans, MODEL_NPZ, TILT_MAP, "legacy")
+    model = NearestCentroidModel.from_npz(MODEL_NPZ)
+    print(f"Wrote {MODEL_NPZ}")
+
+    if args.samples:
+        mismatches = check_equivalence(scaler, kmeans, model, args.samples)
+        print(f"{mismatches} mismatches over {args.samples + 1} vectors")
+        if mismatches:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Scale the game catalog (missions.json, concepts.json, events.json) for load and benchmark runs.
+
+Every copy k > 0 of the base catalog gets its own concepts ("<nom> [k]"), missions ("<id> [k]") and
+events ("<id>__k") with slightly jittered impacts, so the result keeps valid `choix`,
+`evenements_possibles` and concept -> mission links. Copy 0 is the base catalog untouched.
+Deterministic: same base catalog + same seed = same output.
+
+Run from backend/:
+    python -m scripts.generate_catalog --missions 10000 --out data_scaled
+    ECOLEAD_DATA_DIR=data_scaled uvicorn main:app
+"""
+import os
+import json
+import math
+import random
+import argparse
+from typing import Any, Dict, List, Tuple
+
+CATALOG = Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]  # missions, concepts, events.json
+
+
+def load_catalog(data_dir: str) -> CATALOG:
+    with open(os.path.join(data_dir, "missions.json"), encoding="utf-8") as f:
+        missions = json.load(f)
+    with open(os.path.join(data_dir, "concepts.json"), encoding="utf-8") as f:
+        concepts = json.load(f)
+    with open(os.path.join(data_dir, "events.json"), encoding="utf-8") as f:
+        events = json.load(f)
+    return missions, concepts, events
+
+
+def save_catalog(catalog: CATALOG, out_dir: str) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    for name, data in zip(("missions.json", "concepts.json", "events.json"), catalog):
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+
+def _jitter(impact: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Move every KPI delta by -1/0/+1 without flipping its sign"""
+    out = {}
+    for kpi, value in impact.items():
+        if not isinstance(value, (int, float)):
+            out[kpi] = value
+            continue
+        new = value + rng.choice((-1, 0, 0, 1))
+        out[kpi] = new if value == 0 or (new > 0) == (value > 0) else value
+    return out
+
+
+def scale_catalog(base: CATALOG, multiplier: int, seed: int = 42, extra_event_rate: float = 0.15) -> CATALOG:
+    missions, concepts, events_json = base
+    base_events = events_json.get("events", [])
+    rng = random.Random(seed)
+
+    out_missions = dict(missions)
+    out_concepts = dict(concepts)
+    out_events = list(base_events)
+
+    for k in range(1, multiplier):
+        event_ids = {}
+        for event in base_events:
+            copy = dict(event)
+            copy["id"] = f"{event['id']}__{k}"
+            copy["title"] = f"{event.get('title', event['id'])} [{k}]"
+            if isinstance(event.get("modifie_choix"), dict):
+                copy["modifie_choix"] = {c: _jitter(mod, rng) for c, mod in event["modifie_choix"].items()}
+            event_ids[event["id"]] = copy["id"]
+            out_events.append(copy)
+        copy_event_ids = list(event_ids.values())
+
+        concept_names = {}
+        for name, concept in concepts.items():
+            copy_name = f"{name} [{k}]"
+            concept_names[name] = copy_name
+            copy = dict(concept)
+            copy["nom"] = copy_name
+            links = concept.get("missions") or {}
+            copy["missions"] = {level: [] for level in links} if isinstance(links, dict) else []
+            out_concepts[copy_name] = copy
+
+        for mission_id, mission in missions.items():
+            copy = dict(mission)
+            copy_id = f"{mission_id} [{k}]"
+            copy["id"] = copy_id
+            copy["choix"] = {
+                c: {**choice, "impact": _jitter(choice.get("impact") or {}, rng)}
+                for c, choice in (mission.get("choix") or {}).items()
+            }
+            possible = [event_ids[e] for e in mission.get("evenements_possibles", []) if e in event_ids]
+            if copy_event_ids and rng.random() < extra_event_rate:
+                extra = rng.choice(copy_event_ids)
+                if extra not in possible:
+                    possible.append(extra)
+            copy["evenements_possibles"] = possible
+            copy.pop("evenements_actifs", None)
+
+            concept_name = concept_names.get(mission.get("concept"))
+            if concept_name:
+                copy["concept"] = concept_name
+                links = out_concepts[concept_name]["missions"]
+                if isinstance(links, dict):
+                    links.setdefault(mission.get("niveau"), []).append({"id": copy_id})
+                else:
+                    links.append({"id": copy_id})
+            out_missions[copy_id] = copy
+
+    return out_missions, out_concepts, {**events_json, "events": out_events}
+
+
+def catalog_problems(catalog: CATALOG) -> List[str]:
+    """Dangling mission/event/concept references (the loader skips them silently)"""
+    missions, concepts, events_json = catalog
+    event_ids = {e["id"] for e in events_json.get("events", [])}
+    problems = []
+    for mission_id, mission in missions.items():
+        if mission.get("id") != mission_id:
+            problems.append(f"mission key/id mismatch: {mission_id}")
+        if not mission.get("choix"):
+            problems.append(f"mission without choix: {mission_id}")
+        for event_id in mission.get("evenements_possibles", []):
+            if event_id not in event_ids:
+                problems.append(f"mission {mission_id} references unknown event {event_id}")
+    for name, concept in concepts.items():
+        links = concept.get("missions") or {}
+        entries = [e for level in links.values() for e in level] if isinstance(links, dict) else links
+        for entry in entries:
+            mission_id = entry["id"] if isinstance(entry, dict) else entry
+            if mission_id not in missions:
+                problems.append(f"concept {name} references unknown mission {mission_id}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a scaled copy of the game catalog")
+    parser.add_argument("--source", default="data", help="base catalog directory")
+    parser.add_argument("--out", default="data_scaled")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--multiplier", type=int, help="number of copies of the base catalog")
+    group.add_argument("--missions", type=int, default=10_000, help="target number of missions (rounded up)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    base = load_catalog(args.source)
+    multiplier = args.multiplier or max(1, math.ceil(args.missions / max(1, len(base[0]))))
+    catalog = scale_catalog(base, multiplier, seed=args.seed)
+
+    # the copies must be clean; problems already present in the base catalog are only reported
+    inherited = set(catalog_problems(base))
+    if inherited:
+        print(f"[WARN] base catalog has {len(inherited)} dangling references (kept in copy 0, dropped from the others)")
+    introduced = [p for p in catalog_problems(catalog) if p not in inherited]
+    if introduced:
+        raise SystemExit("Generated catalog is inconsistent:\n" + "\n".join(introduced[:20]))
+    save_catalog(catalog, args.out)
+    print(f"{len(catalog[0])} missions, {len(catalog[1])} concepts, {len(catalog[2]['events'])} events -> {args.out}/")
+
+
+if __name__ == "__main__":
+    main()
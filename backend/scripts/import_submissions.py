@@ -0,0 +1,54 @@
+"""
+Bulk import of historical mission submissions (NDJSON, one record per line, see services/import_service.py).
+
+Run from backend/:
+    python -m scripts.import_submissions history.ndjson
+    python -m scripts.import_submissions history.ndjson --create-missing-students --batch-size 5000
+    python -m scripts.import_submissions - < history.ndjson       # read stdin
+    python -m scripts.import_submissions history.ndjson --dry-run
+"""
+import sys
+import json
+import time
+import argparse
+from database import Base, SessionLocal, engine
+import models.all  # noqa: F401  register all mappers
+from models.upgrades import upgrade_schema
+from services.import_service import parse_ndjson, import_submissions, IMPORT_BATCH_SIZE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical mission submissions into the database")
+    parser.add_argument("path", help="NDJSON file, or - for stdin")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per bulk insert")
+    parser.add_argument("--create-missing-students", action="store_true",
+                        help="create students referenced by an unknown email")
+    parser.add_argument("--dry-run", action="store_true", help="replay everything then roll back")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.path == "-":
+        records, parse_errors = parse_ndjson(sys.stdin)
+    else:
+        with open(args.path, encoding="utf-8") as f:
+            records, parse_errors = parse_ndjson(f)
+
+    # databases the server hasn't been started on since the last model changes
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
+    db = SessionLocal()
+    try:
+        summary = import_submissions(
+            db, records, create_missing_students=args.create_missing_students,
+            batch_size=args.batch_size, dry_run=args.dry_run, parse_errors=parse_errors,
+        )
+    finally:
+        db.close()
+    summary["elapsed_s"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(summary, indent=2, ensure_ascii=False, default=str))
+    if summary["error_count"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Seed a synthetic cohort for scale testing: teachers, classes, students and their histories.
+
+Students follow a risk persona (prudent / équilibré / spéculatif) when picking choices; their submissions
+are replayed through MissionEvaluator by services/import_service.py, so Progress, MetricHistory,
+ConceptProgress and the AI profile are exactly what the API would have produced. Teachers then leave
+feedback, which creates Notification rows next to the class enrolment ones.
+Deterministic: same seed + same catalog + empty database = same data.
+
+Run from backend/ against a dedicated database:
+    DATABASE_URL=sqlite:///./seed.db python -m scripts.seed_cohort --teachers 5 --students 500 --reset
+    DATABASE_URL=sqlite:///./seed.db ECOLEAD_DATA_DIR=data_scaled python -m scripts.seed_cohort --students 5000 --reset
+"""
+import os
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from database import SessionLocal, engine, Base, SQLALCHEMY_DATABASE_URL, DEFAULT_DATABASE_URL
+import models.all  # noqa: F401  register all mappers
+from models.user import User, Student, Teacher, UserRole
+from models.profile import ProfileType
+from models.classroom import Class, class_student_table
+from models.notification import Notification
+from models.custom_feedback import Feedback
+from utils.game_loader import GameLoader, get_game_loader
+from services.features_service import raw_risk
+from services.import_service import SubmissionRecord, import_submissions
+
+EMAIL_DOMAIN = "seed.ecolead.test"
+SEED_START = datetime(2025, 1, 6, 8, 0)
+LEVEL_ORDER = {"débutant": 0, "intermédiaire": 1, "avancé": 2}
+
+# persona -> probability of picking the safest / middle / riskiest choice, median seconds per mission
+PERSONAS = {
+    "prudent": ((0.7, 0.2, 0.1), 110),
+    "equilibre": ((0.3, 0.45, 0.25), 80),
+    "speculatif": ((0.1, 0.25, 0.65), 45),
+}
+
+FEEDBACK_COMMENTS = [
+    "Bonne analyse, pense aussi à l'impact sur la trésorerie.",
+    "Choix risqué : justifie-le par rapport au contexte.",
+    "Très bien, la diversification était pertinente.",
+    "Attention au stress de l'équipe sur ce type de décision.",
+]
+
+
+def _pick_choice(mission: Dict[str, Any], weights: Tuple[float, ...], rng: random.Random) -> str:
+    """Rank the choices by raw_risk and draw one according to the persona weights"""
+    choices = sorted(mission["choix"], key=lambda k: (raw_risk(mission["choix"][k].get("impact") or {}), k))
+    if len(choices) == 1:
+        return choices[0]
+    # map the persona's safe/mid/risky weights onto 2 or more choices
+    picks = [weights[0]] + [weights[1]] * (len(choices) - 2) + [weights[2]]
+    return rng.choices(choices, weights=picks)[0]
+
+
+def generate_submissions(
+    student_ids: List[int],
+    game_loader: GameLoader,
+    rng: random.Random,
+    missions_per_student: Tuple[int, int],
+) -> Tuple[List[SubmissionRecord], Dict[int, str]]:
+    """Histories follow the catalog in level order, skipping a few missions, like next-mission does"""
+    catalog = sorted(
+        (m for m in game_loader.get_all_missions() if m.get("choix")),
+        key=lambda m: LEVEL_ORDER.get(m.get("niveau"), 3),
+    )
+    records, personas = [], {}
+    line = 0
+    for student_id in student_ids:
+        persona = rng.choice(list(PERSONAS))
+        personas[student_id] = persona
+        weights, median_seconds = PERSONAS[persona]
+        count = rng.randint(*missions_per_student)
+        at = SEED_START + timedelta(minutes=rng.randint(0, 14 * 24 * 60))
+        for mission in catalog:
+            if count == 0:
+                break
+            if rng.random() < 0.2:
+                continue
+            line += 1
+            records.append(SubmissionRecord(
+                line=line,
+                student_key=student_id,
+                mission_id=mission["id"],
+                choices={"main": _pick_choice(mission, weights, rng)},
+                time_spent_seconds=max(5, int(rng.lognormvariate(0, 0.4) * median_seconds)),
+                timestamp=at,
+            ))
+            at += timedelta(minutes=rng.randint(2, 6 * 60))
+            count -= 1
+    return records, personas
+
+
+def seed_cohort(
+    db: Session,
+    teachers: int = 3,
+    classes_per_teacher: int = 2,
+    students: int = 100,
+    missions_per_student: Tuple[int, int] = (5, 30),
+    feedback_rate: float = 0.1,
+    seed: int = 42,
+    game_loader: GameLoader = None,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    game_loader = game_loader or get_game_loader()
+
+    teacher_rows = [
+        Teacher(name=f"Teacher {i}", email=f"teacher{i}@{EMAIL_DOMAIN}", role=UserRole.TEACHER)
+        for i in range(teachers)
+    ]
+    student_rows = [
+        Student(
+            name=f"Student {i}", email=f"student{i}@{EMAIL_DOMAIN}", role=UserRole.STUDENT,
+            level_ai="Prudent", total_score=0, cashflow=100.0, controle=50.0, stress=10.0,
+            rentabilite=50.0, reputation=50.0, profile=int(rng.choice(list(ProfileType))),
+            created_at=SEED_START,
+        )
+        for i in range(students)
+    ]
+    db.add_all(teacher_rows + student_rows)
+    db.flush()
+
+    class_rows = [
+        Class(name=f"Classe {t.id}-{c}", description="Synthetic cohort", teacher_id=t.id)
+        for t in teacher_rows for c in range(classes_per_teacher)
+    ]
+    db.add_all(class_rows)
+    db.flush()
+
+    # round-robin enrolment, with the class_add notification classroom_service would have sent
+    enrolments, notifications = [], []
+    teacher_of = {}
+    for i, student in enumerate(student_rows):
+        class_ = class_rows[i % len(class_rows)] if class_rows else None
+        if class_ is None:
+            break
+        teacher_of[student.id] = class_.teacher_id
+        enrolments.append({"class_id": class_.id, "student_id": student.id})
+        notifications.append({
+            "student_id": student.id, "type": "class_add",
+            "message": f"Tu as été ajouté(e) à la classe {class_.name}",
+            "is_read": rng.random() < 0.8, "created_at": SEED_START,
+        })
+    if enrolments:
+        db.execute(insert(class_student_table), enrolments)
+    db.commit()
+
+    student_ids = [s.id for s in student_rows]
+    records, personas = generate_submissions(student_ids, game_loader, rng, missions_per_student)
+    summary = import_submissions(db, records, game_loader=game_loader)
+
+    # teacher feedback on a sample of the submissions
+    feedback = []
+    for r in records:
+        if r.student_key in teacher_of and rng.random() < feedback_rate:
+            at = r.timestamp + timedelta(hours=rng.randint(1, 72))
+            feedback.append({
+                "teacher_id": teacher_of[r.student_key], "student_id": r.student_key,
+                "mission_id": r.mission_id, "comment": rng.choice(FEEDBACK_COMMENTS), "created_at": at,
+            })
+            notifications.append({
+                "student_id": r.student_key, "type": "feedback",
+                "message": f"Vous avez reçu un feedback de votre professeur pour la mission {r.mission_id}",
+                "is_read": rng.random() < 0.5, "created_at": at,
+            })
+    if feedback:
+        db.execute(insert(Feedback), feedback)
+    if notifications:
+        db.execute(insert(Notification), notifications)
+    db.commit()
+
+    return {
+        "teachers": teachers,
+        "classes": len(class_rows),
+        "students": students,
+        "submissions": summary["imported"],
+        "import_errors": summary["error_count"],
+        "feedback": len(feedback),
+        "notifications": len(notifications),
+        "personas": {p: sum(1 for v in personas.values() if v == p) for p in PERSONAS},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a deterministic synthetic cohort")
+    parser.add_argument("--teachers", type=int, default=3)
+    parser.add_argument("--classes-per-teacher", type=int, default=2)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--min-missions", type=int, default=5)
+    parser.add_argument("--max-missions", type=int, default=30)
+    parser.add_argument("--feedback-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate every table first")
+    args = parser.parse_args()
+
+    print(f"Database: {SQLALCHEMY_DATABASE_URL}")
+    if args.reset:
+        # drop_all on the dev/prod database by mistake (DATABASE_URL forgotten) would wipe it
+        if os.getenv("DATABASE_URL") in (None, "", DEFAULT_DATABASE_URL):
+            raise SystemExit("--reset drops every table: set DATABASE_URL to a dedicated database (not the default one)")
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        if db.query(User.id).filter(User.email.like(f"%@{EMAIL_DOMAIN}")).first():
+            raise SystemExit("This database already holds a seeded cohort: use --reset (on a dedicated DATABASE_URL)")
+        start = time.perf_counter()
+        summary = seed_cohort(
+            db, teachers=args.teachers, classes_per_teacher=args.classes_per_teacher, students=args.students,
+            missions_per_student=(args.min_missions, args.max_missions),
+            feedback_rate=args.feedback_rate, seed=args.seed,
+        )
+    finally:
+        db.close()
+    summary["elapsed_s"] = round(time.perf_counter() - start, 2)
+    for key, value in summary.items():
+        print(f"{key:>15}: {value}")
+
+
+if __name__ == "__main__":
+    main()
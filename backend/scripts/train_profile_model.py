@@ -0,0 +1,55 @@
+"""
+Retrain the AI profile model (scaler + kmeans) from the students stored in the database.
+
+Run from backend/:
+    python -m scripts.train_profile_model              # fit and store a new version
+    python -m scripts.train_profile_model --activate   # ... and make running workers switch to it
+    python -m scripts.train_profile_model --list
+    python -m scripts.train_profile_model --activate-version <version>
+"""
+import argparse
+import json
+from database import SessionLocal
+import models.all  # noqa: F401  register all mappers
+from services import model_registry
+from services.profile_training_service import train_profile_model, MINIBATCH_THRESHOLD
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and manage AI profile model versions")
+    parser.add_argument("--activate", action="store_true", help="activate the new version once stored")
+    parser.add_argument("--random-state", type=int, default=42)
+    parser.add_argument("--minibatch-threshold", type=int, default=MINIBATCH_THRESHOLD,
+                        help="use MiniBatchKMeans above this many students")
+    parser.add_argument("--batch-size", type=int, default=1000, help="rows fetched per DB round trip")
+    parser.add_argument("--list", action="store_true", help="list stored versions and exit")
+    parser.add_argument("--activate-version", help="activate an existing version and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for meta in model_registry.list_versions():
+            flag = "*" if meta.get("active") else " "
+            print(f"{flag} {meta['version']}  {meta['algorithm']}  n={meta['n_samples']}  {meta['cluster_sizes']}")
+        return
+
+    if args.activate_version:
+        model_registry.activate_version(args.activate_version)
+        print(f"Activated {args.activate_version}")
+        return
+
+    db = SessionLocal()
+    try:
+        metadata = train_profile_model(
+            db,
+            activate=args.activate,
+            random_state=args.random_state,
+            minibatch_threshold=args.minibatch_threshold,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+    print(json.dumps(metadata, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from models.progress import MetricHistory, MetricRollup
+from utils.downsampling import BUCKET_SECONDS, epoch_seconds, bucket_last_indices, lttb_indices
+
+# Series of the student charts (GET /students/{id}/chart-data), bounded whatever the history length.
+#   resolution=auto  every point while there are at most max_points, LTTB beyond
+#   resolution=raw   same, the name the client uses when it wants the samples themselves
+#   resolution=hour|day|week  last point of each period (LTTB on top if there are still too many)
+# History older than the retention window lives in metric_rollups (services/metric_retention.py): each rollup
+# is read as one point, its last sample, so the series has the same shape whichever table a period is in.
+
+KPI_FIELDS = ("cashflow", "controle", "stress", "rentabilite", "reputation")
+RESOLUTIONS = ("auto", "raw") + tuple(BUCKET_SECONDS)
+DEFAULT_MAX_POINTS = 500
+
+
+def naive_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    """Query bound as the models store dates (naive UTC): `from=...Z` and `to=...` can be compared and filtered"""
+    if moment is None or moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _series_columns(model, date_column):
+    """(date, *KPI_FIELDS, total_score): the row layout metric_series works on"""
+    return (date_column, *(getattr(model, k) for k in KPI_FIELDS), model.total_score)
+
+
+def _select(seconds: np.ndarray, values: np.ndarray, resolution: str, max_points: int) -> np.ndarray:
+    index = np.arange(len(seconds))
+    if resolution in BUCKET_SECONDS:
+        index = bucket_last_indices(seconds, resolution)
+    if len(index) > max_points:
+        index = index[lttb_indices(seconds[index], values[index], max_points)]
+    return index
+
+
+def metric_series(
+    db: Session,
+    student_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    resolution: str = "auto",
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """(MetricPoint dicts in time order, sampling info) of the student's MetricHistory and MetricRollup in [start, end]"""
+    rollups = db.query(*_series_columns(MetricRollup, MetricRollup.last_recorded_at)) \
+        .filter(MetricRollup.student_id == student_id)
+    query = db.query(*_series_columns(MetricHistory, MetricHistory.recorded_at)) \
+        .filter(MetricHistory.student_id == student_id)
+    if start is not None:
+        rollups = rollups.filter(MetricRollup.last_recorded_at >= start)
+        query = query.filter(MetricHistory.recorded_at >= start)
+    if end is not None:
+        rollups = rollups.filter(MetricRollup.last_recorded_at <= end)
+        query = query.filter(MetricHistory.recorded_at <= end)
+    compacted = rollups.order_by(MetricRollup.last_recorded_at).all()
+    rows = query.order_by(MetricHistory.recorded_at, MetricHistory.id).all()
+    if compacted:
+        # backdated imports not compacted yet can fall between rollups
+        rows = sorted(compacted + rows, key=lambda r: r[0])
+
+    info = {"resolution": resolution, "source_points": len(rows), "rollup_points": len(compacted), "points": len(rows)}
+    if not rows:
+        return [], info
+    if resolution in ("auto", "raw") and len(rows) <= max_points:
+        selected = rows
+    else:
+        seconds = epoch_seconds([r[0] for r in rows])
+        values = np.array([r[1:1 + len(KPI_FIELDS)] for r in rows], dtype=np.float64)
+        selected = [rows[i] for i in _select(seconds, values, resolution, max_points)]
+    info["points"] = len(selected)
+    points = [
+        {"date": r[0], **dict(zip(KPI_FIELDS, r[1:1 + len(KPI_FIELDS)])), "total_score": r[-1]}
+        for r in selected
+    ]
+    return points, info
@@ -1,7 +1,12 @@
-from sqlalchemy.orm import Session
-from models.classroom import Class
+from collections import defaultdict
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+from models.classroom import Class, class_student_table
+from models.custom_feedback import Feedback
 from models.user import Student, Teacher, User
 from models.notification import Notification
+from utils.game_loader import get_game_loader
+import services.leaderboard_service as leaderboards
 
 def create_class(db: Session, teacher_id: int, name: str, description: str = None):
     new_class = Class(name=name, description=description, teacher_id=teacher_id)
@@ -18,6 +23,7 @@ def create_class_with_students(db: Session, teacher_id: int, name: str, descript
     if student_ids:
         students = db.query(Student).filter(Student.id.in_(student_ids)).all()
         new_class.students.extend(students)
+        leaderboards.enrol(db, new_class.id, [s.id for s in students])
         db.commit()
         db.refresh(new_class)
 
@@ -31,6 +37,7 @@ def add_student_to_class(db: Session, class_id: int, student_id: int):
     if not class_ or not student:
         return None
     class_.students.append(student)
+    leaderboards.enrol(db, class_id, [student_id])
     
     
     message = f"Tu as été ajouté(e) à la classe {class_.name}"
@@ -51,6 +58,7 @@ def remove_student_from_class(db: Session, class_id: int, student_id: int):
     if not class_:
         return None
     class_.students = [s for s in class_.students if s.id != student_id]
+    leaderboards.unenrol(db, class_id, student_id)
     db.commit()
     db.refresh(class_) 
     return class_
@@ -58,3 +66,79 @@ def remove_student_from_class(db: Session, class_id: int, student_id: int):
 def get_class_students(db: Session, class_id: int):
     class_ = db.query(Class).filter(Class.id == class_id).first()
     return class_.students if class_ else []
+
+def get_class_review(db: Session, teacher_id: int, class_id: int, offset: int = 0, limit: int = 40):
+    """
+    Completed missions of a page of the class's students (ordered by id) with mission metadata and every
+    teacher feedback, grouped per (student, mission). 5 queries whatever the page size: class, student count,
+    students, their progress (selectin) and their feedback. None when the class is not this teacher's.
+    """
+    class_ = db.query(Class).filter(Class.id == class_id, Class.teacher_id == teacher_id).first()
+    if not class_:
+        return None
+
+    total = db.query(func.count()).select_from(class_student_table) \
+        .filter(class_student_table.c.class_id == class_id).scalar()
+    students = (
+        db.query(Student)
+        .join(class_student_table, class_student_table.c.student_id == Student.id)
+        .filter(class_student_table.c.class_id == class_id)
+        .options(selectinload(Student.progress_records))
+        .order_by(Student.id)
+        .offset(offset)
+        .limit(limit)
+        .all()
+    )
+
+    feedback_by_mission = defaultdict(list)
+    if students:
+        feedbacks = (
+            db.query(Feedback)
+            .filter(Feedback.student_id.in_([s.id for s in students]))
+            .order_by(Feedback.created_at, Feedback.id)
+            .all()
+        )
+        for fb in feedbacks:
+            feedback_by_mission[(fb.student_id, fb.mission_id)].append(fb)
+
+    # simple recherche par id dans le catalogue : les événements actifs que résout get_mission_by_id ne servent pas ici
+    missions = get_game_loader().missions
+    reviews = []
+    for student in students:
+        reviewed = []
+        for entry in sorted(student.progress_records, key=lambda p: (p.completed_at is None, p.completed_at, p.id)):
+            mission = missions.get(entry.mission_id)
+            if mission is None:
+                continue  # mission supprimée du catalogue
+            choices = entry.choices_made or {}
+            first_choice = next(iter(choices.values()), None)
+            reviewed.append({
+                "mission_id": entry.mission_id,
+                "concept": mission.get("concept", ""),
+                "niveau": mission.get("niveau", ""),
+                "type": mission.get("type", ""),
+                "contexte": mission.get("contexte", ""),
+                "objectif_pedagogique": mission.get("objectif_pedagogique", ""),
+                "choix_etudiant": choices,
+                "score_earned": entry.score_earned,
+                "feedback_auto": mission.get("feedback", {}).get(first_choice, ""),
+                "completed_at": entry.completed_at,
+                "feedback_teacher": feedback_by_mission.get((student.id, entry.mission_id), []),
+            })
+        reviews.append({
+            "student_id": student.id,
+            "name": student.name,
+            "email": student.email,
+            "level_ai": student.level_ai,
+            "total_score": student.total_score,
+            "missions": reviewed,
+        })
+
+    return {
+        "class_id": class_.id,
+        "class_name": class_.name,
+        "total_students": total,
+        "offset": offset,
+        "limit": limit,
+        "students": reviews,
+    }
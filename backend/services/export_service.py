@@ -0,0 +1,222 @@
+import io
+import csv
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from fastapi import HTTPException
+from sqlalchemy import select, Boolean, DateTime, Float, Integer, JSON
+from database import SessionLocal
+from models.progress import Progress, MetricHistory, MetricRollup, ConceptProgress
+from models.classroom import class_student_table
+
+# Streaming exports of a class history. Rows are fetched with yield_per (server-side cursor where the
+# driver supports it) and encoded batch by batch, so memory stays flat whatever the number of rows.
+
+EXPORT_BATCH_SIZE = 1000
+
+# dataset -> (model, exported columns, column used by the date range filter)
+DATASETS = {
+    "progress": (Progress, [
+        "id", "student_id", "mission_id", "concept", "level", "choices_made", "score_earned",
+        "time_spent_seconds", "completed_at", "cashflow_after", "controle_after", "stress_after",
+        "rentabilite_after", "reputation_after",
+    ], "completed_at"),
+    "metric_history": (MetricHistory, [
+        "id", "student_id", "recorded_at", "mission_id", "cashflow", "controle", "stress",
+        "rentabilite", "reputation", "total_score",
+    ], "recorded_at"),
+    "metric_rollups": (MetricRollup, [
+        "id", "student_id", "resolution", "bucket_start", "last_recorded_at", "samples",
+        "cashflow", "cashflow_min", "cashflow_max", "controle", "controle_min", "controle_max",
+        "stress", "stress_min", "stress_max", "rentabilite", "rentabilite_min", "rentabilite_max",
+        "reputation", "reputation_min", "reputation_max", "total_score",
+    ], "last_recorded_at"),
+    "concept_progress": (ConceptProgress, [
+        "id", "student_id", "concept", "missions_completed", "total_missions", "is_completed", "completed_at",
+    ], "completed_at"),
+}
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_export_rows(
+    dataset: str,
+    class_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[Sequence[Any]]:
+    """
+    Yield raw row tuples (in DATASETS column order) for the students of a class.
+    Opens its own session: the generator outlives the request's Depends(get_db) session.
+    """
+    model, columns, date_column = DATASETS[dataset]
+    date_col = getattr(model, date_column)
+    class_students = select(class_student_table.c.student_id).where(class_student_table.c.class_id == class_id)
+
+    stmt = (
+        select(*[getattr(model, c) for c in columns])
+        .where(model.student_id.in_(class_students))
+        .order_by(model.student_id, date_col, model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    if date_from is not None:
+        stmt = stmt.where(date_col >= date_from)
+    if date_to is not None:
+        stmt = stmt.where(date_col <= date_to)
+
+    db = SessionLocal()
+    try:
+        for row in db.execute(stmt):
+            yield row
+    finally:
+        db.close()
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _batched(rows: Iterator[Sequence[Any]], batch_size: int) -> Iterator[List[Sequence[Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def stream_csv(rows: Iterator[Sequence[Any]], columns: List[str], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    for batch in _batched(rows, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        for row in batch:
+            writer.writerow([
+                json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else _plain(v)
+                for v in row
+            ])
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows: Iterator[Sequence[Any]], columns: List[str], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    for batch in _batched(rows, batch_size):
+        yield "".join(
+            json.dumps({c: _plain(v) for c, v in zip(columns, row)}, ensure_ascii=False) + "\n"
+            for row in batch
+        )
+
+
+class _DrainableSink:
+    """Write-only file object for pyarrow: collects bytes that the generator hands out after each row group."""
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _arrow_schema(model, columns: List[str]):
+    import pyarrow as pa
+
+    types = []
+    for name in columns:
+        column_type = model.__table__.c[name].type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        else:  # String, JSON (serialized)
+            arrow_type = pa.string()
+        types.append(pa.field(name, arrow_type))
+    return pa.schema(types)
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_parquet(rows: Iterator[Sequence[Any]], dataset: str, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """One parquet row group per batch; requires the optional pyarrow dependency."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    model, columns, _ = DATASETS[dataset]
+    schema = _arrow_schema(model, columns)
+    json_columns = {i for i, c in enumerate(columns) if isinstance(model.__table__.c[c].type, JSON)}
+
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in _batched(rows, batch_size):
+            data = {}
+            for i, name in enumerate(columns):
+                values = [row[i] for row in batch]
+                if i in json_columns:
+                    values = [json.dumps(v, ensure_ascii=False) if v is not None else None for v in values]
+                data[name] = values
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_stream(
+    dataset: str,
+    fmt: str,
+    class_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+) -> Iterator:
+    if dataset not in DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset}'. Available: {list(DATASETS)}")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown format '{fmt}'. Available: {list(FORMATS)}")
+    if fmt == "parquet" and not parquet_available():
+        raise HTTPException(status_code=400, detail="Parquet export requires the optional 'pyarrow' package")
+
+    _, columns, _ = DATASETS[dataset]
+    rows = iter_export_rows(dataset, class_id, date_from, date_to)
+    if fmt == "csv":
+        return stream_csv(rows, columns)
+    if fmt == "ndjson":
+        return stream_ndjson(rows, columns)
+    return stream_parquet(rows, dataset)
@@ -1,11 +1,12 @@
 import numpy as np
 import math
+import logging
 from typing import List, Dict, Any, Optional
-from utils.game_loader import GameLoader
-from services.progress_service import get_recent_progress_for_student
-from utils.game_loader import GameLoader
+from utils.game_loader import GameLoader, get_game_loader
 from services.progress_service import get_recent_progress_for_student
 
+logger = logging.getLogger(__name__)
+
 FEATURE_SPEC = {
     "window_missions": 8,         # last N missions considered [ the window]
     "half_life": 4,               # recent missions weighted more
@@ -71,14 +72,14 @@ def build_mission_index(missions_json):
             "impacts": impacts,
         })
 
-    print(f"Built mission_index: {len(index)} missions (skipped {empty} with no choices)")
+    logger.debug("built mission_index: %d missions (skipped %d with no choices)", len(index), empty)
     if not index:
         # helpful debug
-        print("DEBUG: top-level keys:", list(missions_json.keys()))
         mj = missions_json.get("missions", None)
-        print("DEBUG: type(missions_json['missions']) =", type(mj))
-        if isinstance(mj, dict):
-            print("DEBUG: first keys:", list(mj.keys())[:5])
+        logger.warning(
+            "empty mission_index",
+            extra={"top_level_keys": list(missions_json.keys())[:10], "missions_type": type(mj).__name__},
+        )
 
     return index
 def mission_intensity(impact: dict) -> float:
@@ -247,18 +248,11 @@ def compute_features_for_student(
     return {k: float(feats.get(k, 0.0)) for k in FEATURE_SPEC["feature_names"]}
 
 
-def compute_features_from_student_id(student_id: int) -> Dict[str, float]:
+def build_feature_sequence(recent_progress: List[Dict[str, Any]], game_loader: GameLoader) -> List[Dict[str, Any]]:
     """
-    Wrapper pour appeler compute_features_for_student avec le bon format.
+    Formate les missions terminées (dicts de get_recent_progress_for_student) au format
+    attendu par compute_features_for_student. Partagé entre l'inférence et l'entraînement.
     """
-    # Charger les missions récentes terminées
-    recent_progress = get_recent_progress_for_student(student_id, limit=8) #limit 8 
-
-    # Charger le catalogue d'événements
-    game_loader = GameLoader()
-    events_catalog = game_loader.events
-
-    # Formater les données au format attendu par compute_features_for_student
     seq = []
     for p in recent_progress:
         mission_id = p.get("mission_id")
@@ -294,6 +288,22 @@ def compute_features_from_student_id(student_id: int) -> Dict[str, float]:
             },
             "active_event_ids": mission.get("evenements_possibles", [])
         })
+    return seq
+
+
+def compute_features_from_student_id(student_id: int) -> Dict[str, float]:
+    """
+    Wrapper pour appeler compute_features_for_student avec le bon format.
+    """
+    # Charger les missions récentes terminées
+    recent_progress = get_recent_progress_for_student(student_id, limit=FEATURE_SPEC["window_missions"]) #limit 8 
+
+    # Charger le catalogue d'événements
+    game_loader = get_game_loader()
+    events_catalog = game_loader.events
+
+    # Formater les données au format attendu par compute_features_for_student
+    seq = build_feature_sequence(recent_progress, game_loader)
 
     # Appeler la vraie fonction
-    return compute_features_for_student(seq, events_catalog)
\ No newline at end of file
+    return compute_features_for_student(seq, events_catalog)
@@ -0,0 +1,293 @@
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+from models.user import Student, UserRole
+from models.progress import Progress, MetricHistory, ConceptProgress
+from utils.game_loader import GameLoader, get_game_loader
+from utils.evaluator import MissionEvaluator
+from services.features_service import FEATURE_SPEC, build_feature_sequence, compute_features_for_student
+from services.predict_ai_profile import predict_tilt
+from utils.metrics import PROFILING_RUNS, PROFILING_DURATION, SUBMISSION_CONFLICTS
+from services.progress_service import get_recent_progress_for_student
+from services.leaderboard_service import rebuild_leaderboards
+from services.submission_service import (
+    apply_mission_result, count_concept_level_missions, current_metrics, swap_metrics,
+    PROFILING_EVERY, PROFILING_CONCEPT_TOTAL_EVERY
+)
+
+# Bulk import of historical mission submissions (e.g. migrating a cohort from another instance).
+# Records are replayed per student in chronological order through the same evaluator and metric rules
+# as submit_mission, but everything stays in memory and rows are written with batched executemany
+# inserts in a single transaction instead of two commits and a dozen queries per submission.
+#
+# One NDJSON record per line:
+#   {"student": 12 | "alice@school.ma", "mission_id": "...", "choices": {"main": "A"},
+#    "time_spent_seconds": 95, "timestamp": "2025-03-02T10:15:00"}
+# ("student_id"/"student_email", "mission" and "time_spent" are accepted as aliases.)
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+class SubmissionRecord:
+    __slots__ = ("line", "student_key", "mission_id", "choices", "time_spent_seconds", "timestamp")
+
+    def __init__(self, line, student_key, mission_id, choices, time_spent_seconds, timestamp):
+        self.line = line
+        self.student_key = student_key
+        self.mission_id = mission_id
+        self.choices = choices
+        self.time_spent_seconds = time_spent_seconds
+        self.timestamp = timestamp
+
+
+def parse_record(raw: Dict[str, Any], line: int) -> SubmissionRecord:
+    student = raw.get("student", raw.get("student_id", raw.get("student_email")))
+    mission_id = raw.get("mission_id", raw.get("mission"))
+    if student is None or mission_id is None:
+        raise ValueError("missing student or mission_id")
+    choices = raw.get("choices")
+    if not isinstance(choices, dict):
+        raise ValueError("choices must be an object")
+    timestamp = raw.get("timestamp")
+    if not timestamp:
+        raise ValueError("missing timestamp")
+    return SubmissionRecord(
+        line=line,
+        student_key=student,
+        mission_id=str(mission_id),
+        choices=choices,
+        time_spent_seconds=int(raw.get("time_spent_seconds", raw.get("time_spent", 0)) or 0),
+        timestamp=datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).replace(tzinfo=None),
+    )
+
+
+def parse_ndjson(lines: Iterable[str]) -> Tuple[List[SubmissionRecord], List[Dict[str, Any]]]:
+    records, errors = [], []
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(parse_record(json.loads(line), line_no))
+        except (ValueError, TypeError) as e:
+            errors.append({"line": line_no, "error": str(e)})
+    return records, errors
+
+
+class _BatchWriter:
+    """Accumulates rows per table and flushes them with one executemany per table."""
+    def __init__(self, db: Session, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.progress: List[Dict[str, Any]] = []
+        self.history: List[Dict[str, Any]] = []
+
+    def add(self, progress_row: Dict[str, Any], history_row: Dict[str, Any]):
+        self.progress.append(progress_row)
+        self.history.append(history_row)
+        if len(self.progress) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.progress:
+            self.db.execute(insert(Progress), self.progress)
+            self.db.execute(insert(MetricHistory), self.history)
+        self.progress, self.history = [], []
+
+
+def _resolve_students(db: Session, keys: Iterable[Any], create_missing: bool) -> Dict[Any, Student]:
+    keys = set(keys)
+    ids = {k for k in keys if isinstance(k, int) or (isinstance(k, str) and k.isdigit())}
+    emails = {k for k in keys if isinstance(k, str) and not k.isdigit()}
+
+    resolved = {}
+    if ids:
+        for s in db.query(Student).filter(Student.id.in_([int(k) for k in ids])).all():
+            resolved[s.id] = s
+            resolved[str(s.id)] = s
+    if emails:
+        for s in db.query(Student).filter(Student.email.in_(emails)).all():
+            resolved[s.email] = s
+        if create_missing:
+            for email in emails - set(resolved):
+                student = Student(
+                    name=email.split("@")[0], email=email, role=UserRole.STUDENT, level_ai="Prudent",
+                    total_score=0, cashflow=100.0, controle=50.0, stress=10.0, rentabilite=50.0, reputation=50.0,
+                    version=0,
+                )
+                db.add(student)
+                resolved[email] = student
+            db.flush()
+    return resolved
+
+
+def _profile(recent: List[Dict[str, Any]], game_loader: GameLoader) -> str:
+    """Same computation as run_profiling, on the in-memory history (most recent first)."""
+    start = time.perf_counter()
+    seq = build_feature_sequence(recent, game_loader)
+    tilt = predict_tilt(compute_features_for_student(seq, game_loader.events))
+    PROFILING_RUNS.labels("import").inc()
+    PROFILING_DURATION.labels("import").observe(time.perf_counter() - start)
+    return tilt
+
+
+def import_submissions(
+    db: Session,
+    records: List[SubmissionRecord],
+    create_missing_students: bool = False,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    dry_run: bool = False,
+    game_loader: Optional[GameLoader] = None,
+    parse_errors: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Replay `records` and write Progress, MetricHistory and ConceptProgress rows.
+    Final student metrics, scores, AI profile and concept progress match what sequential
+    submit_mission calls in timestamp order would have produced (already completed missions are skipped).
+    """
+    game_loader = game_loader or get_game_loader()
+    evaluator = MissionEvaluator(game_loader)
+    errors: List[Dict[str, Any]] = list(parse_errors or [])
+    imported, skipped = 0, 0
+
+    students = _resolve_students(db, (r.student_key for r in records), create_missing_students)
+    by_student: Dict[int, List[SubmissionRecord]] = defaultdict(list)
+    for r in records:
+        student = students.get(r.student_key)
+        if student is None:
+            errors.append({"line": r.line, "error": f"unknown student '{r.student_key}'"})
+            continue
+        by_student[student.id].append(r)
+    student_by_id = {s.id: s for s in students.values()}
+    student_ids = list(by_student)
+
+    # Current state of every touched student, loaded once
+    done = defaultdict(set)
+    completed_count = defaultdict(int)
+    for student_id, mission_id in db.query(Progress.student_id, Progress.mission_id).filter(Progress.student_id.in_(student_ids)):
+        done[student_id].add(mission_id)
+        completed_count[student_id] += 1
+    concept_rows = {
+        (cp.student_id, cp.concept): cp
+        for cp in db.query(ConceptProgress).filter(ConceptProgress.student_id.in_(student_ids)).all()
+    }
+    new_concepts: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    writer = _BatchWriter(db, batch_size)
+
+    for student_id in student_ids:
+        student = student_by_id[student_id]
+        recent = get_recent_progress_for_student(student_id, limit=FEATURE_SPEC["window_missions"]) if completed_count[student_id] else []
+
+        for r in sorted(by_student[student_id], key=lambda r: (r.timestamp, r.line)):
+            if r.mission_id in done[student_id]:
+                skipped += 1
+                continue
+            mission = game_loader.get_mission_by_id(r.mission_id)
+            if not mission:
+                errors.append({"line": r.line, "error": f"unknown mission '{r.mission_id}'"})
+                continue
+
+            events = game_loader.get_active_events_for_mission(r.mission_id, student)
+            try:
+                result = evaluator.evaluate_mission(mission, r.choices, events, student)
+            except (ValueError, KeyError) as e:
+                errors.append({"line": r.line, "error": str(e)})
+                continue
+            apply_mission_result(student, result)
+
+            writer.add({
+                "student_id": student_id,
+                "mission_id": r.mission_id,
+                "concept": mission["concept"],
+                "level": mission["niveau"],
+                "choices_made": r.choices,
+                "score_earned": result["score_earned"],
+                "time_spent_seconds": r.time_spent_seconds,
+                "completed_at": r.timestamp,
+                "cashflow_after": student.cashflow,
+                "controle_after": student.controle,
+                "stress_after": student.stress,
+                "rentabilite_after": student.rentabilite,
+                "reputation_after": student.reputation,
+            }, {
+                "student_id": student_id,
+                "mission_id": r.mission_id,
+                "recorded_at": r.timestamp,
+                "cashflow": student.cashflow,
+                "controle": student.controle,
+                "stress": student.stress,
+                "rentabilite": student.rentabilite,
+                "reputation": student.reputation,
+                "total_score": student.total_score,
+            })
+            done[student_id].add(r.mission_id)
+            completed_count[student_id] += 1
+            imported += 1
+            recent.insert(0, {
+                "mission_id": r.mission_id, "concept": mission["concept"], "niveau": mission["niveau"],
+                "completed_at": r.timestamp, "choices_made": r.choices,
+                "time_spent_seconds": r.time_spent_seconds, "active_event_ids": [],
+            })
+            del recent[FEATURE_SPEC["window_missions"]:]
+
+            # Concept progress, same rules as submit_mission
+            key = (student_id, mission["concept"])
+            row = concept_rows.get(key)
+            if row is not None:
+                state = new_concepts.setdefault(key, {
+                    "id": row.id, "missions_completed": row.missions_completed,
+                    "is_completed": row.is_completed, "completed_at": row.completed_at,
+                })
+            else:
+                state = new_concepts.setdefault(key, {
+                    "student_id": student_id, "concept": mission["concept"],
+                    "missions_completed": 0, "is_completed": False, "completed_at": None,
+                })
+            state["missions_completed"] += 1
+            total_missions = count_concept_level_missions(game_loader, mission["concept"], mission["niveau"])
+            state["total_missions"] = total_missions
+            if state["missions_completed"] >= total_missions:
+                state["is_completed"] = True
+                state["completed_at"] = r.timestamp
+
+            if completed_count[student_id] % PROFILING_EVERY == 0 or total_missions % PROFILING_CONCEPT_TOTAL_EVERY == 0:
+                student.level_ai = _profile(recent, game_loader)
+
+        # Replayed on the KPIs read above: written with the same compare-and-swap as submit_mission, so a
+        # submission committed since then is not overwritten (the whole import is rolled back instead), and
+        # submissions still in flight fail theirs and re-read
+        values = dict(current_metrics(student), total_score=student.total_score, level_ai=student.level_ai)
+        if not swap_metrics(db, student, values):
+            SUBMISSION_CONFLICTS.labels("import").inc()
+            db.rollback()
+            raise HTTPException(status_code=409, detail=f"Student {student_id} updated during the import, please retry")
+
+    writer.flush()
+    updates = [state for key, state in new_concepts.items() if key in concept_rows]
+    inserts = [state for key, state in new_concepts.items() if key not in concept_rows]
+    if updates:
+        db.execute(update(ConceptProgress), updates)
+    if inserts:
+        db.execute(insert(ConceptProgress), inserts)
+    rebuild_leaderboards(db, student_ids)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+
+    return {
+        "records": len(records) + len(parse_errors or []),
+        "imported": imported,
+        "skipped_already_completed": skipped,
+        "students": len(student_ids),
+        "dry_run": dry_run,
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "error_count": len(errors),
+    }
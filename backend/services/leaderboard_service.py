@@ -0,0 +1,142 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import and_, or_, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+from models.classroom import class_student_table
+from models.leaderboard import LeaderboardEntry, GLOBAL_BOARD
+from models.progress import Progress
+from models.user import Student, User
+
+# Leaderboards kept in leaderboard_entries instead of ranking Progress on every read:
+# - submit_mission updates the student's row on every board (record_submission, same transaction),
+# - enrolment changes add / remove the class row (enrol / unenrol),
+# - bulk imports and databases created before the table recompute from Progress (rebuild_leaderboards).
+# Rank order is total_score desc then student_id; top-k, rank and neighbors are range queries on
+# ix_leaderboard_rank and don't depend on the number of submissions.
+
+LE = LeaderboardEntry
+
+
+def record_submission(db: Session, student: Student) -> None:
+    """One more mission for `student`, whose total_score is already updated (no commit)"""
+    now = datetime.utcnow()
+    db.query(LE).filter(LE.student_id == student.id).update({
+        LE.total_score: student.total_score,
+        LE.missions_completed: LE.missions_completed + 1,
+        LE.updated_at: now,
+    }, synchronize_session=False)
+    on_global = db.query(LE.id).filter(LE.class_id == GLOBAL_BOARD, LE.student_id == student.id).first()
+    if on_global is None:  # first mission
+        db.add(LE(class_id=GLOBAL_BOARD, student_id=student.id, total_score=student.total_score,
+                  missions_completed=1, updated_at=now))
+
+
+def enrol(db: Session, class_id: int, student_ids: Iterable[int]) -> None:
+    """Put students on a class board with their global score (no commit)"""
+    student_ids = list(student_ids)
+    if not student_ids:
+        return
+    on_global = aliased(LE)
+    already = select(LE.student_id).where(LE.class_id == class_id)
+    rows = select(
+        literal(class_id), Student.id,
+        func.coalesce(on_global.total_score, Student.total_score, 0),
+        func.coalesce(on_global.missions_completed, 0),
+        literal(datetime.utcnow()),
+    ).outerjoin(
+        on_global, and_(on_global.student_id == Student.id, on_global.class_id == GLOBAL_BOARD)
+    ).where(Student.id.in_(student_ids), Student.id.not_in(already))
+    db.execute(insert(LE).from_select(
+        ["class_id", "student_id", "total_score", "missions_completed", "updated_at"], rows
+    ))
+
+
+def unenrol(db: Session, class_id: int, student_id: int) -> None:
+    db.query(LE).filter(LE.class_id == class_id, LE.student_id == student_id).delete(synchronize_session=False)
+
+
+def rebuild_leaderboards(db: Session, student_ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute every board (or the rows of some students) from Progress and class_students (no commit)"""
+    db.flush()
+    ids = list(student_ids) if student_ids is not None else None
+    stale = db.query(LE)
+    counts = select(Progress.student_id, func.count(Progress.id).label("missions")).group_by(Progress.student_id)
+    if ids is not None:
+        stale = stale.filter(LE.student_id.in_(ids))
+        counts = counts.where(Progress.student_id.in_(ids))
+    stale.delete(synchronize_session=False)
+    counts = counts.subquery()
+    now = literal(datetime.utcnow())
+    columns = ["class_id", "student_id", "total_score", "missions_completed", "updated_at"]
+
+    db.execute(insert(LE).from_select(columns, select(
+        literal(GLOBAL_BOARD), Student.id, func.coalesce(Student.total_score, 0), counts.c.missions, now,
+    ).join(counts, counts.c.student_id == Student.id)))
+
+    enrolled = select(
+        class_student_table.c.class_id, Student.id, func.coalesce(Student.total_score, 0),
+        func.coalesce(counts.c.missions, 0), now,
+    ).join(Student, Student.id == class_student_table.c.student_id) \
+        .outerjoin(counts, counts.c.student_id == Student.id)
+    if ids is not None:
+        enrolled = enrolled.where(Student.id.in_(ids))
+    db.execute(insert(LE).from_select(columns, enrolled))
+
+
+def ensure_leaderboards(db: Session) -> bool:
+    """Backfill once on databases that have submissions but no leaderboard yet; True when it did"""
+    if db.query(LE.id).first() is not None or db.query(Progress.id).first() is None:
+        return False
+    rebuild_leaderboards(db)
+    db.commit()
+    return True
+
+
+def _entry(row, rank: int) -> Dict[str, Any]:
+    return {
+        "rank": rank,
+        "student_id": row.student_id,
+        "name": row.name,
+        "total_score": row.total_score,
+        "missions_completed": row.missions_completed,
+    }
+
+
+def _board(db: Session, class_id: int):
+    return db.query(LE.student_id, User.name, LE.total_score, LE.missions_completed) \
+        .join(User, User.id == LE.student_id).filter(LE.class_id == class_id)
+
+
+def top(db: Session, class_id: int = GLOBAL_BOARD, limit: int = 10) -> List[Dict[str, Any]]:
+    rows = _board(db, class_id).order_by(LE.total_score.desc(), LE.student_id).limit(limit).all()
+    return [_entry(row, i + 1) for i, row in enumerate(rows)]
+
+
+def board_size(db: Session, class_id: int = GLOBAL_BOARD) -> int:
+    return db.query(func.count(LE.id)).filter(LE.class_id == class_id).scalar()
+
+
+def standing(db: Session, student_id: int, class_id: int = GLOBAL_BOARD, around: int = 2) -> Optional[Dict[str, Any]]:
+    """Rank of a student on a board and the `around` students ranked just above and below; None if not on it"""
+    me = _board(db, class_id).filter(LE.student_id == student_id).first()
+    if me is None:
+        return None
+    score = me.total_score
+    ahead = or_(LE.total_score > score, and_(LE.total_score == score, LE.student_id < student_id))
+    behind = or_(LE.total_score < score, and_(LE.total_score == score, LE.student_id > student_id))
+    rank = db.query(func.count(LE.id)).filter(LE.class_id == class_id, ahead).scalar() + 1
+
+    above = _board(db, class_id).filter(ahead).order_by(LE.total_score, LE.student_id.desc()).limit(around).all()
+    below = _board(db, class_id).filter(behind).order_by(LE.total_score.desc(), LE.student_id).limit(around).all()
+    neighbors = [_entry(row, rank - i - 1) for i, row in enumerate(above)][::-1]
+    neighbors.append(_entry(me, rank))
+    neighbors += [_entry(row, rank + i + 1) for i, row in enumerate(below)]
+    return {
+        "class_id": class_id,
+        "student_id": student_id,
+        "rank": rank,
+        "board_size": board_size(db, class_id),
+        "total_score": me.total_score,
+        "missions_completed": me.missions_completed,
+        "neighbors": neighbors,
+    }
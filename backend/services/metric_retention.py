@@ -0,0 +1,169 @@
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from models.progress import MetricHistory, MetricRollup
+
+# Retention of MetricHistory (one 5-KPI snapshot per submission): full resolution for the last
+# ECOLEAD_METRICS_RAW_DAYS days, then one MetricRollup per day (min / max / last of each KPI), then one per
+# week past ECOLEAD_METRICS_DAILY_DAYS. Compacted rows are deleted from metric_history.
+# Run by `python -m scripts.compact_metric_history` (cron); the chart endpoint reads both tables.
+# Buckets are calendar days / ISO weeks in UTC, cutoffs are aligned on them: a bucket is compacted in one go,
+# rows imported later for an already compacted period are merged into its rollup.
+
+RAW_DAYS = int(os.getenv("ECOLEAD_METRICS_RAW_DAYS", "90"))
+DAILY_DAYS = int(os.getenv("ECOLEAD_METRICS_DAILY_DAYS", "365"))
+KPI_FIELDS = ("cashflow", "controle", "stress", "rentabilite", "reputation")
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_start(moment: datetime, resolution: str) -> datetime:
+    day = datetime(moment.year, moment.month, moment.day)
+    return day - timedelta(days=day.weekday()) if resolution == "week" else day
+
+
+def cutoffs(now: datetime, raw_days: int = RAW_DAYS, daily_days: int = DAILY_DAYS) -> Tuple[datetime, datetime]:
+    """(rows before -> daily rollups, rows and daily rollups before -> weekly rollups)"""
+    day_cutoff = bucket_start(now - timedelta(days=raw_days), "day")
+    week_cutoff = bucket_start(now - timedelta(days=max(daily_days, raw_days)), "week")
+    return day_cutoff, week_cutoff
+
+
+def _lower(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _upper(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+def _merge(bucket: Optional[Dict[str, Any]], other: Dict[str, Any]) -> Dict[str, Any]:
+    """Fold `other` into `bucket` (both MetricRollup column dicts)"""
+    if bucket is None:
+        return dict(other)
+    bucket["samples"] += other["samples"]
+    for k in KPI_FIELDS:
+        bucket[f"{k}_min"] = _lower(bucket[f"{k}_min"], other[f"{k}_min"])
+        bucket[f"{k}_max"] = _upper(bucket[f"{k}_max"], other[f"{k}_max"])
+    if other["last_recorded_at"] >= bucket["last_recorded_at"]:
+        bucket["last_recorded_at"] = other["last_recorded_at"]
+        bucket["total_score"] = other["total_score"]
+        for k in KPI_FIELDS:
+            bucket[k] = other[k]
+    return bucket
+
+
+def _from_sample(row) -> Dict[str, Any]:
+    bucket = {"samples": 1, "last_recorded_at": row.recorded_at, "total_score": row.total_score}
+    for k in KPI_FIELDS:
+        value = getattr(row, k)
+        bucket[k] = bucket[f"{k}_min"] = bucket[f"{k}_max"] = value
+    return bucket
+
+
+def _from_rollup(rollup: MetricRollup) -> Dict[str, Any]:
+    bucket = {"samples": rollup.samples or 0, "last_recorded_at": rollup.last_recorded_at, "total_score": rollup.total_score}
+    for k in KPI_FIELDS:
+        for name in (k, f"{k}_min", f"{k}_max"):
+            bucket[name] = getattr(rollup, name)
+    return bucket
+
+
+def compact_student(db: Session, student_id: int, day_cutoff: datetime, week_cutoff: datetime) -> Dict[str, int]:
+    """Compact one student's history (no commit)"""
+    raw = db.query(
+        MetricHistory.id, MetricHistory.recorded_at, *(getattr(MetricHistory, k) for k in KPI_FIELDS),
+        MetricHistory.total_score,
+    ).filter(
+        MetricHistory.student_id == student_id, MetricHistory.recorded_at < day_cutoff
+    ).order_by(MetricHistory.recorded_at, MetricHistory.id).all()
+    old_days = db.query(MetricRollup).filter(
+        MetricRollup.student_id == student_id,
+        MetricRollup.resolution == "day",
+        MetricRollup.bucket_start < week_cutoff,
+    ).all()
+
+    buckets: Dict[Tuple[str, datetime], Dict[str, Any]] = {}
+    for row in raw:
+        resolution = "week" if row.recorded_at < week_cutoff else "day"
+        key = (resolution, bucket_start(row.recorded_at, resolution))
+        buckets[key] = _merge(buckets.get(key), _from_sample(row))
+    for rollup in old_days:
+        key = ("week", bucket_start(rollup.bucket_start, "week"))
+        buckets[key] = _merge(buckets.get(key), _from_rollup(rollup))
+        db.delete(rollup)
+    if not buckets:
+        return {"raw_rows": 0, "daily_rollups": 0, "rollups_written": 0}
+
+    # rollups already written for these periods (earlier runs, backdated imports)
+    folded = {r.id for r in old_days}
+    existing = {
+        (r.resolution, r.bucket_start): r
+        for r in db.query(MetricRollup).filter(
+            MetricRollup.student_id == student_id,
+            MetricRollup.bucket_start.in_({start for _, start in buckets}),
+        )
+        if r.id not in folded
+    }
+    for (resolution, start), bucket in buckets.items():
+        rollup = existing.get((resolution, start))
+        if rollup is None:
+            db.add(MetricRollup(student_id=student_id, resolution=resolution, bucket_start=start, **bucket))
+            continue
+        for name, value in _merge(_from_rollup(rollup), bucket).items():
+            setattr(rollup, name, value)
+
+    if raw:
+        # id bound: rows inserted since the read above stay for the next run
+        db.query(MetricHistory).filter(
+            MetricHistory.student_id == student_id,
+            MetricHistory.recorded_at < day_cutoff,
+            MetricHistory.id <= max(row.id for row in raw),
+        ).delete(synchronize_session=False)
+    return {"raw_rows": len(raw), "daily_rollups": len(old_days), "rollups_written": len(buckets)}
+
+
+def students_to_compact(db: Session, day_cutoff: datetime, week_cutoff: datetime) -> Iterable[int]:
+    raw = db.query(MetricHistory.student_id).filter(MetricHistory.recorded_at < day_cutoff).distinct()
+    days = db.query(MetricRollup.student_id).filter(
+        MetricRollup.resolution == "day", MetricRollup.bucket_start < week_cutoff
+    ).distinct()
+    return sorted({sid for (sid,) in raw} | {sid for (sid,) in days})
+
+
+def compact_metric_history(
+    db: Session,
+    now: Optional[datetime] = None,
+    raw_days: int = RAW_DAYS,
+    daily_days: int = DAILY_DAYS,
+    dry_run: bool = False,
+) -> Dict[str, Any]:
+    """Compact every student's history, one transaction per student"""
+    start = time.perf_counter()
+    day_cutoff, week_cutoff = cutoffs(now or datetime.utcnow(), raw_days, daily_days)
+    summary = {
+        "day_cutoff": day_cutoff, "week_cutoff": week_cutoff, "dry_run": dry_run,
+        "students": 0, "raw_rows": 0, "daily_rollups": 0, "rollups_written": 0,
+    }
+    for student_id in students_to_compact(db, day_cutoff, week_cutoff):
+        try:
+            counts = compact_student(db, student_id, day_cutoff, week_cutoff)
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        summary["students"] += 1
+        for name, count in counts.items():
+            summary[name] += count
+
+    summary["metric_history_rows"] = db.query(func.count(MetricHistory.id)).scalar()
+    summary["elapsed_s"] = round(time.perf_counter() - start, 2)
+    logger.info("metric history compacted", extra={k: v for k, v in summary.items() if k != "elapsed_s"})
+    return summary
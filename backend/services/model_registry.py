@@ -0,0 +1,137 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+
+# Versioned storage for the AI profile models (scaler + kmeans).
+# Layout:
+#   data/models/<version>/scaler.pkl
+#   data/models/<version>/kmeans.pkl
+#   data/models/<version>/metadata.json
+#   data/models/<version>/model.npz  -> plain arrays served by the NumPy predictor (no sklearn needed)
+#   data/models/CURRENT            -> name of the active version
+# Every write goes through a temp file/dir + os.replace so readers never see a half-written model.
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), "../data/models")
+CURRENT_POINTER = "CURRENT"
+METADATA_FILE = "metadata.json"
+SCALER_FILE = "scaler.pkl"
+KMEANS_FILE = "kmeans.pkl"
+MODEL_NPZ_FILE = "model.npz"
+
+
+def _models_dir(base_dir: Optional[str] = None) -> str:
+    return base_dir or MODELS_DIR
+
+
+def pointer_path(base_dir: Optional[str] = None) -> str:
+    return os.path.join(_models_dir(base_dir), CURRENT_POINTER)
+
+
+def get_current_version(base_dir: Optional[str] = None) -> Optional[str]:
+    """Return the active model version, or None when the registry is empty."""
+    try:
+        with open(pointer_path(base_dir), "r", encoding="utf-8") as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+    return version or None
+
+
+def list_versions(base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Return the metadata of every stored version, oldest first."""
+    models_dir = _models_dir(base_dir)
+    if not os.path.isdir(models_dir):
+        return []
+
+    current = get_current_version(base_dir)
+    versions = []
+    for name in os.listdir(models_dir):
+        meta_path = os.path.join(models_dir, name, METADATA_FILE)
+        if not os.path.isfile(meta_path):
+            continue  # temp dirs, pointer file...
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["active"] = name == current
+        versions.append(meta)
+    return sorted(versions, key=lambda m: m.get("created_at", ""))
+
+
+def export_npz(scaler, kmeans, path: str, labels: Dict[int, str], version: str) -> None:
+    """
+    Dump what inference needs from a fitted StandardScaler/KMeans pair into a small .npz:
+    the scaler mean/scale, the centroids and the cluster -> tilt labels.
+    """
+    n_features = kmeans.cluster_centers_.shape[1]
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+    n_clusters = kmeans.cluster_centers_.shape[0]
+    np.savez(
+        path,
+        mean=np.asarray(mean, dtype=np.float64),
+        scale=np.asarray(scale, dtype=np.float64),
+        centers=np.asarray(kmeans.cluster_centers_, dtype=np.float64),
+        labels=np.asarray([labels.get(i, "failed") for i in range(n_clusters)]),
+        version=np.asarray(version),
+    )
+
+
+def save_version(scaler, kmeans, metadata: Dict[str, Any], base_dir: Optional[str] = None) -> str:
+    """Store a fitted scaler/kmeans pair under metadata["version"] and return that version."""
+    models_dir = _models_dir(base_dir)
+    os.makedirs(models_dir, exist_ok=True)
+    version = metadata["version"]
+    final_dir = os.path.join(models_dir, version)
+    if os.path.exists(final_dir):
+        raise ValueError(f"Model version '{version}' already exists")
+
+    import joblib
+
+    tmp_dir = tempfile.mkdtemp(prefix=f".{version}-", dir=models_dir)
+    try:
+        labels = {int(k): v for k, v in metadata.get("labels", {}).items()}
+        export_npz(scaler, kmeans, os.path.join(tmp_dir, MODEL_NPZ_FILE), labels, version)
+        joblib.dump(scaler, os.path.join(tmp_dir, SCALER_FILE))
+        joblib.dump(kmeans, os.path.join(tmp_dir, KMEANS_FILE))
+        with open(os.path.join(tmp_dir, METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_dir, final_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return version
+
+
+def activate_version(version: str, base_dir: Optional[str] = None) -> None:
+    """Atomically point CURRENT at `version`; running workers pick it up on their next check."""
+    models_dir = _models_dir(base_dir)
+    if not os.path.isfile(os.path.join(models_dir, version, METADATA_FILE)):
+        raise ValueError(f"Unknown model version '{version}'")
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".CURRENT-", dir=models_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(version)
+    os.replace(tmp_path, pointer_path(base_dir))
+
+
+def load_metadata(version: str, base_dir: Optional[str] = None) -> Dict[str, Any]:
+    with open(os.path.join(_models_dir(base_dir), version, METADATA_FILE), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def npz_path(version: str, base_dir: Optional[str] = None) -> str:
+    return os.path.join(_models_dir(base_dir), version, MODEL_NPZ_FILE)
+
+
+def load_version(version: str, base_dir: Optional[str] = None) -> Tuple[Any, Any, Dict[str, Any]]:
+    """Return the sklearn (scaler, kmeans, metadata) for a stored version. Tooling only: inference reads model.npz."""
+    import joblib
+
+    version_dir = os.path.join(_models_dir(base_dir), version)
+    with open(os.path.join(version_dir, METADATA_FILE), "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    scaler = joblib.load(os.path.join(version_dir, SCALER_FILE))
+    kmeans = joblib.load(os.path.join(version_dir, KMEANS_FILE))
+    return scaler, kmeans, metadata
@@ -1,45 +1,157 @@
 import os
-import joblib
-from typing import Dict
+import time
+import logging
+import threading
+import numpy as np
+from typing import Dict, Optional
 from services.features_service import FEATURE_SPEC
 from fastapi import HTTPException
 from models.user import User
 from services.features_service import compute_features_from_student_id
+from services import model_registry
 from database import get_db
+from utils.metrics import PREDICTIONS, PROFILING_RUNS, PROFILING_DURATION
 
 MODEL = os.path.join(os.path.dirname(__file__), "../data/kmeans.pkl")
 SCALER = os.path.join(os.path.dirname(__file__), "../data/scaler.pkl")
+# data/kmeans.pkl + data/scaler.pkl exported by scripts/export_profile_model.py
+MODEL_NPZ = os.path.join(os.path.dirname(__file__), "../data/profile_model.npz")
 TILT_MAP = {0: "Prudent", 1: "Equilibré", 2: "Spéculatif"}
+# How often (seconds) a worker looks at data/models/CURRENT for a newly activated version
+RELOAD_CHECK_SECONDS = float(os.getenv("PROFILE_MODEL_RELOAD_SECONDS", "5"))
 
-if os.path.exists(MODEL):
+logger = logging.getLogger(__name__)
+
+
+class NearestCentroidModel:
+    """
+    Pure NumPy equivalent of kmeans.predict(scaler.transform(X)).
+    Same arithmetic as scikit-learn: (X - mean) / scale, then argmin over ||c||² - 2·x·c
+    (the ||x||² term is constant per row), first index wins on ties.
+    Immutable and swapped as a whole, so a prediction never mixes two versions.
+    """
+    def __init__(self, version: str, mean: np.ndarray, scale: np.ndarray, centers: np.ndarray, tilt_map: Dict[int, str]):
+        self.version = version
+        self.mean = mean
+        self.scale = scale
+        self.centers = centers
+        self.centers_sq_norms = (centers * centers).sum(axis=1)
+        self.tilt_map = tilt_map
+
+    @classmethod
+    def from_npz(cls, path: str, version: Optional[str] = None) -> "NearestCentroidModel":
+        with np.load(path, allow_pickle=False) as data:
+            labels = [str(label) for label in data["labels"]]
+            return cls(
+                version or str(data["version"]),
+                data["mean"].astype(np.float64),
+                data["scale"].astype(np.float64),
+                data["centers"].astype(np.float64),
+                {i: label for i, label in enumerate(labels)},
+            )
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def predict(self, X) -> np.ndarray:
+        X_scaled = self.transform(X)
+        distances = self.centers_sq_norms - 2.0 * (X_scaled @ self.centers.T)
+        return distances.argmin(axis=1)
+
+
+def _load_legacy_model() -> Optional[NearestCentroidModel]:
+    """The original model, used until a registry version is activated."""
+    if os.path.exists(MODEL_NPZ):
+        try:
+            return NearestCentroidModel.from_npz(MODEL_NPZ, "legacy")
+        except Exception:
+            logger.exception("profile model load failed", extra={"path": MODEL_NPZ})
+            return None
+    # Not exported yet: fall back to unpickling (pulls in scikit-learn once)
+    if not (os.path.exists(MODEL) and os.path.exists(SCALER)):
+        return None
     try:
-        kmeans = joblib.load(MODEL)
-    except Exception as e:
-        kmeans = None
-else:
-    kmeans = None
+        import joblib
+        kmeans, scaler = joblib.load(MODEL), joblib.load(SCALER)
+    except Exception:
+        logger.exception("profile model load failed", extra={"path": MODEL})
+        return None
+    return NearestCentroidModel("legacy", scaler.mean_, scaler.scale_, kmeans.cluster_centers_, TILT_MAP)
+
 
-if os.path.exists(SCALER):
+def _load_registry_model(version: str) -> Optional[NearestCentroidModel]:
     try:
-        scaler = joblib.load(SCALER)
-    except Exception as e:
-        scaler = None
-else:
-    scaler = None
+        metadata = model_registry.load_metadata(version)
+        if metadata.get("feature_names") != FEATURE_SPEC["feature_names"]:
+            return None  # trained against another feature spec, refuse it
+        return NearestCentroidModel.from_npz(model_registry.npz_path(version), version)
+    except Exception:
+        logger.exception("profile model load failed", extra={"version": version})
+        return None
+
+
+_active_model: Optional[NearestCentroidModel] = None
+_active_pointer: Optional[str] = None
+_last_check = 0.0
+_swap_lock = threading.Lock()
+
+
+def refresh_model(force: bool = False) -> Optional[NearestCentroidModel]:
+    """
+    Swap in the version named by data/models/CURRENT if it changed since the last check.
+    Nothing is loaded at import: the first prediction triggers the load.
+    Readers keep using the old bundle until the new one is fully loaded,
+    then the module-level reference is replaced in one assignment.
+    """
+    global _active_model, _active_pointer, _last_check
+    now = time.monotonic()
+    if not force and _active_model is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+        return _active_model
+
+    with _swap_lock:
+        if not force and _active_model is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+            return _active_model
+        _last_check = now
+        pointer = model_registry.get_current_version()
+        if pointer == _active_pointer and _active_model is not None:
+            return _active_model
+
+        model = _load_registry_model(pointer) if pointer else None
+        if model is None and _active_model is None:
+            model = _load_legacy_model()
+        if model is not None:
+            _active_model = model
+        _active_pointer = pointer
+    return _active_model
+
+
+def get_active_model() -> Optional[NearestCentroidModel]:
+    return refresh_model()
+
+
+def peek_active_model() -> Optional[NearestCentroidModel]:
+    """The model currently loaded, without triggering a load (metrics)"""
+    return _active_model
 
 
 def predict_tilt(features: Dict[str, float]) -> str:
-    #feature_dict = features.dict()
+    if hasattr(features, "model_dump"):  # FeaturesRequest from the /ai_profile route
+        features = features.model_dump()
     feature_vector = [features.get(name, 0.0) for name in FEATURE_SPEC["feature_names"]]
-    if not kmeans:
+    model = get_active_model()
+    if not model:
         raise HTTPException(status_code=500, detail="Failed to compute AI profile")
-    
-    X = [feature_vector]
-    X_scaled = scaler.transform(X)
-    cluster = kmeans.predict(X_scaled)[0]
-    return TILT_MAP.get(cluster, "failed")
+
+    cluster = int(model.predict([feature_vector])[0])
+    tilt = model.tilt_map.get(cluster, "failed")
+    PREDICTIONS.labels(tilt).inc()
+    return tilt
 
 def run_profiling(student_id: int, db):
+    start = time.perf_counter()
     features = compute_features_from_student_id(student_id)
 
     # prédire
@@ -50,4 +162,6 @@ def run_profiling(student_id: int, db):
     student.level_ai = tilt
     db.commit()
 
-    return tilt
\ No newline at end of file
+    PROFILING_RUNS.labels("submit").inc()
+    PROFILING_DURATION.labels("submit").observe(time.perf_counter() - start)
+    return tilt
@@ -0,0 +1,146 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from models.progress import Progress
+from utils.game_loader import GameLoader
+from services.features_service import FEATURE_SPEC, build_feature_sequence, compute_features_for_student
+from services import model_registry
+
+# Offline retraining of the AI profile (scaler + kmeans) from our own students' history.
+# Features are computed exactly like at inference time (build_feature_sequence + compute_features_for_student)
+# so a retrained model sees the same distribution it will be asked to classify.
+
+TILT_LABELS = ["Prudent", "Equilibré", "Spéculatif"]  # ordered from least to most risky
+MINIBATCH_THRESHOLD = 10_000  # above this many students, fit with MiniBatchKMeans
+
+
+def iter_student_progress(db: Session, window: int = FEATURE_SPEC["window_missions"], batch_size: int = 1000) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Stream (student_id, recent_progress) for every student with completed missions.
+    recent_progress has the same shape and order (most recent first) as get_recent_progress_for_student.
+    """
+    rows = (
+        db.query(
+            Progress.student_id,
+            Progress.mission_id,
+            Progress.concept,
+            Progress.level,
+            Progress.completed_at,
+            Progress.choices_made,
+            Progress.time_spent_seconds,
+        )
+        .filter(Progress.completed_at.isnot(None))
+        .order_by(Progress.student_id, Progress.completed_at.desc())
+        .yield_per(batch_size)
+    )
+
+    current_id, recent = None, []
+    for r in rows:
+        if r.student_id != current_id:
+            if current_id is not None:
+                yield current_id, recent
+            current_id, recent = r.student_id, []
+        if len(recent) < window:
+            recent.append({
+                "mission_id": r.mission_id,
+                "concept": r.concept,
+                "niveau": r.level,
+                "completed_at": r.completed_at,
+                "choices_made": r.choices_made,
+                "time_spent_seconds": r.time_spent_seconds,
+                "active_event_ids": []
+            })
+    if current_id is not None:
+        yield current_id, recent
+
+
+def build_feature_matrix(db: Session, game_loader: Optional[GameLoader] = None, batch_size: int = 1000) -> Tuple[List[int], np.ndarray]:
+    """Return (student_ids, X) with one FEATURE_SPEC row per student."""
+    game_loader = game_loader or GameLoader()
+    names = FEATURE_SPEC["feature_names"]
+
+    student_ids, rows = [], []
+    for student_id, recent in iter_student_progress(db, batch_size=batch_size):
+        feats = compute_features_for_student(build_feature_sequence(recent, game_loader), game_loader.events)
+        student_ids.append(student_id)
+        rows.append([feats[name] for name in names])
+
+    X = np.asarray(rows, dtype=np.float64).reshape(len(rows), len(names))
+    return student_ids, X
+
+
+def map_clusters_to_tilts(centers: np.ndarray) -> Dict[int, str]:
+    """
+    Deterministically name clusters: centroids (in feature space) are ranked by riskiness,
+    the least risky becomes "Prudent" and the most risky "Spéculatif". Ties fall back to the cluster index.
+    """
+    names = FEATURE_SPEC["feature_names"]
+    col = {name: i for i, name in enumerate(names)}
+    risk = (
+        centers[:, col["avg_risk_rank"]]
+        + centers[:, col["pct_high_risk"]]
+        - centers[:, col["pct_low_risk"]]
+    )
+    order = sorted(range(len(centers)), key=lambda i: (round(float(risk[i]), 9), i))
+    return {cluster: TILT_LABELS[rank] for rank, cluster in enumerate(order)}
+
+
+def fit_profile_model(X: np.ndarray, random_state: int = 42, minibatch_threshold: int = MINIBATCH_THRESHOLD):
+    """Fit scaler + kmeans on X. Returns (scaler, kmeans, algorithm_name)."""
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    n_clusters = len(TILT_LABELS)
+    if len(X) < n_clusters:
+        raise ValueError(f"Need at least {n_clusters} students with completed missions, got {len(X)}")
+
+    scaler = StandardScaler().fit(X)
+    X_scaled = scaler.transform(X)
+    if len(X) > minibatch_threshold:
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3, batch_size=4096)
+    else:
+        kmeans = KMeans(n_clusters=n_clusters, random_state=random_state, n_init=10)
+    kmeans.fit(X_scaled)
+    return scaler, kmeans, type(kmeans).__name__
+
+
+def train_profile_model(
+    db: Session,
+    activate: bool = False,
+    random_state: int = 42,
+    minibatch_threshold: int = MINIBATCH_THRESHOLD,
+    batch_size: int = 1000,
+    base_dir: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build features for all students, fit a new model version, store it and optionally activate it."""
+    import sklearn
+
+    student_ids, X = build_feature_matrix(db, batch_size=batch_size)
+    scaler, kmeans, algorithm = fit_profile_model(X, random_state=random_state, minibatch_threshold=minibatch_threshold)
+
+    centers = scaler.inverse_transform(kmeans.cluster_centers_)
+    labels = map_clusters_to_tilts(centers)
+    sizes = np.bincount(kmeans.labels_, minlength=len(labels))
+
+    created_at = datetime.utcnow()
+    digest = hashlib.sha1(kmeans.cluster_centers_.tobytes() + scaler.mean_.tobytes()).hexdigest()[:8]
+    metadata = {
+        "version": f"{created_at.strftime('%Y%m%dT%H%M%SZ')}-{digest}",
+        "created_at": created_at.isoformat() + "Z",
+        "algorithm": algorithm,
+        "random_state": random_state,
+        "n_samples": int(len(student_ids)),
+        "feature_names": FEATURE_SPEC["feature_names"],
+        "window_missions": FEATURE_SPEC["window_missions"],
+        "labels": {str(cluster): label for cluster, label in labels.items()},
+        "cluster_sizes": {labels[i]: int(n) for i, n in enumerate(sizes)},
+        "inertia": float(kmeans.inertia_),
+        "sklearn_version": sklearn.__version__,
+    }
+    model_registry.save_version(scaler, kmeans, metadata, base_dir=base_dir)
+    if activate:
+        model_registry.activate_version(metadata["version"], base_dir=base_dir)
+        metadata["active"] = True
+    return metadata
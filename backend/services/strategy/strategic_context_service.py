@@ -1,6 +1,6 @@
 from typing import Dict, List, Set
-from utils.game_loader import GameLoader
-from services.features_service import compute_features_from_student_id, build_mission_index
+from utils.game_loader import get_game_loader
+from services.features_service import compute_features_from_student_id
 from services.profile_service import get_student_profile, get_student_level_ai
 from services.progress_service import get_done_mission_ids, get_recent_progress_for_student
 from models.profile import ProfileType, PROFILE_LABELS
@@ -423,8 +423,8 @@ def get_strategic_context(student_id: int) -> Dict:
         return build_cold_start_context(student_id, profile_name, job, tilt)
     
     # 3. Charger missions et concepts explorés
-    game_loader = GameLoader()
-    missions = build_mission_index(game_loader.missions)
+    game_loader = get_game_loader()
+    missions = game_loader.get_mission_index()
     explored = get_explored_concepts(student_id, missions)
     all_concepts = concepts_allowed_for_job(job)
     unexplored = list(all_concepts - explored)
@@ -1,9 +1,8 @@
 import os
-import joblib
 from typing import List, Set, Tuple, Dict, Any
 from models.schemas import SuggestRequest, SuggestResponse
-from utils.game_loader import GameLoader
-from services.features_service import compute_features_from_student_id, build_mission_index, FEATURE_SPEC
+from utils.game_loader import get_game_loader
+from services.features_service import compute_features_from_student_id, FEATURE_SPEC
 from services.profile_service import get_student_profile, get_student_level_ai
 from services.progress_service import get_done_mission_ids, get_recent_progress_for_student
 from models.profile import ProfileType, PROFILE_LABELS
@@ -167,6 +166,31 @@ def goal_gap_bonus(feats, goal):
     return 0.0
 
 
+def score_missions(pool: List[Dict], tilt: str, goal: str, feats: Dict, recent_concepts: List[str], last_mission: Dict, events_catalog: Dict) -> List[Tuple[Dict, float, List[str], bool]]:
+    """(mission, score, whys, has_event) for every mission of the pool that has an expected impact"""
+    scored = []
+    # print(f"[DEBUG] Starting to score {len(pool)} missions")
+    for i, m in enumerate(pool):
+        # print(f"[DEBUG] Scoring mission {i+1}/{len(pool)}: {m.get('mission_id', 'NO_ID')}")
+        exp_imp = expected_impact_for_profile(m, tilt)
+        if not exp_imp:
+            # print(f"[DEBUG] Mission has no expected impact (missing choix?)")
+            continue
+        score = (
+            0.45 * kpi_goal_score(exp_imp, goal) +
+            0.2 * gap_score(exp_imp, feats) +
+            0.15 * diversity_bonus(m, recent_concepts) +
+            0.1 * pacing_soft(m, last_mission)+
+            0.1 * goal_gap_bonus(feats, goal)
+        )
+        # print(f"[DEBUG] Final score: {score}")
+        why = build_whys(goal, exp_imp, feats, tilt)
+        has_event = any(e in events_catalog for e in m.get("evenements_possibles", [])) if m.get("evenements_possibles") else False
+        scored.append((m, score, why, has_event))
+
+    return scored
+
+
 def suggest_strategy(req: SuggestRequest) -> SuggestResponse:
     # 1. Récupérer métier
     job_name = get_student_profile(req.student_id)  # ex: "gestionnaire"
@@ -188,7 +212,7 @@ def suggest_strategy(req: SuggestRequest) -> SuggestResponse:
     # print(f"[DEBUG] Mapped to ProfileType: {job}")
 
     # 2. Calculer features IA
-    game_loader=GameLoader()
+    game_loader=get_game_loader()
     events_catalog=game_loader.events
     feats = compute_features_from_student_id(req.student_id)  # doit retourner dict de 13 features
     tilt = get_student_level_ai(req.student_id)  # ex: "Prudent"
@@ -196,7 +220,7 @@ def suggest_strategy(req: SuggestRequest) -> SuggestResponse:
     # print(f"[DEBUG] predicted ai profile: {tilt}")
     # 3. Charger missions
     # game_loader=GameLoader()
-    missions= build_mission_index(game_loader.missions)
+    missions= game_loader.get_mission_index()
     progress = get_recent_progress_for_student(req.student_id)
     recent_concepts = [p.get("concept") for p in progress[-8:] if p.get("concept")]
     last_mission_id = progress[-1]["mission_id"] if progress else None
@@ -212,25 +236,7 @@ def suggest_strategy(req: SuggestRequest) -> SuggestResponse:
     )
 
     # 5. Scorer chaque mission
-    scored = []
-    # print(f"[DEBUG] Starting to score {len(pool)} missions")
-    for i, m in enumerate(pool):
-        # print(f"[DEBUG] Scoring mission {i+1}/{len(pool)}: {m.get('mission_id', 'NO_ID')}")
-        exp_imp = expected_impact_for_profile(m, tilt)
-        if not exp_imp:
-            # print(f"[DEBUG] Mission has no expected impact (missing choix?)")
-            continue
-        score = (
-            0.45 * kpi_goal_score(exp_imp, req.goal) +
-            0.2 * gap_score(exp_imp, feats) +
-            0.15 * diversity_bonus(m, recent_concepts) +
-            0.1 * pacing_soft(m, last_mission)+
-            0.1 * goal_gap_bonus(feats, req.goal)
-        )
-        # print(f"[DEBUG] Final score: {score}")
-        why = build_whys(req.goal, exp_imp, feats, tilt)
-        has_event = any(e in events_catalog for e in m.get("evenements_possibles", [])) if m.get("evenements_possibles") else False
-        scored.append((m, score, why, has_event))
+    scored = score_missions(pool, tilt, req.goal, feats, recent_concepts, last_mission, events_catalog)
 
     # 6. Trier et limiter
     ranked = sorted(scored, key=lambda x: x[1], reverse=True)[:max(1, min(req.max_bundle, 6))] # TODO : ajuster max selon besoin
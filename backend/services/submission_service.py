@@ -0,0 +1,152 @@
+from datetime import datetime
+from typing import Any, Dict, List
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+from models.user import Student
+from models.progress import Progress, MetricHistory, ConceptProgress
+from utils.game_loader import GameLoader
+from utils.metrics import SUBMISSION_CONFLICTS
+import services.leaderboard_service as leaderboards
+
+# Rules shared by every path that records a mission submission (submit_mission, bulk import/replay)
+# so they can't drift apart.
+
+KPI_KEYS = ["cashflow", "controle", "stress", "rentabilite", "reputation"]
+
+# Clamp metrics to reasonable bounds
+KPI_BOUNDS = {
+    "cashflow": (-100, 200),
+    "controle": (0, 100),
+    "stress": (0, 100),
+    "rentabilite": (-50, 150),
+    "reputation": (0, 100),
+}
+
+# The AI profile is recomputed every PROFILING_EVERY missions
+PROFILING_EVERY = 8
+# ... and whenever the concept/level total is a multiple of this (historical rule of submit_mission)
+PROFILING_CONCEPT_TOTAL_EVERY = 6
+
+# Submissions write the KPIs with a compare-and-swap on Student.version (two tabs, double click: the second
+# read-modify-write no longer overwrites the first one), re-read and re-applied up to this many times
+STUDENT_CAS_RETRIES = 5
+
+
+def updated_metrics(student, result: Dict[str, Any]) -> Dict[str, Any]:
+    """KPIs (clamped) and total_score of `student` once the evaluated deltas and score are added"""
+    changes = result["metrics_changes"]
+    values = {}
+    for key in KPI_KEYS:
+        low, high = KPI_BOUNDS[key]
+        values[key] = max(low, min(high, getattr(student, key) + changes[key]))
+    values["total_score"] = student.total_score + result["score_earned"]
+    return values
+
+
+def apply_mission_result(student, result: Dict[str, Any]) -> None:
+    """Add the evaluated deltas and score to the student, then clamp the metrics."""
+    for key, value in updated_metrics(student, result).items():
+        setattr(student, key, value)
+
+
+def current_metrics(student) -> Dict[str, float]:
+    return {key: getattr(student, key) for key in KPI_KEYS}
+
+
+def count_concept_level_missions(game_loader: GameLoader, concept: str, niveau: str) -> int:
+    return game_loader.count_missions(concept, niveau)
+
+
+def write_submission(
+    db: Session,
+    game_loader: GameLoader,
+    student_id: int,
+    mission_id: str,
+    mission: Dict[str, Any],
+    choices: Dict[str, str],
+    time_spent_seconds: int,
+    result: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Every row of an evaluated submission (no commit): student KPIs and score, leaderboards, Progress,
+    ConceptProgress, MetricHistory. The student and the "already completed" check are read again in `db`, the
+    session that commits (the request's, or the group-commit writer's, utils/group_commit.py), and the KPIs
+    are written first, with a compare-and-swap: the other rows are only written once the student is ours.
+    Returns the new metrics and whether the AI profile is due once committed.
+    """
+    for _ in range(STUDENT_CAS_RETRIES):
+        # populate_existing: the row as committed now, not as loaded earlier in this session
+        student = db.query(Student).populate_existing().filter(Student.id == student_id).first()
+        if student is None:
+            raise HTTPException(status_code=404, detail="Student not found")
+        already = db.query(Progress.id).filter(
+            Progress.student_id == student_id, Progress.mission_id == mission_id
+        ).first()
+        if already is not None:
+            raise HTTPException(status_code=400, detail="Mission already completed")
+        if swap_metrics(db, student, updated_metrics(student, result)):
+            break
+        SUBMISSION_CONFLICTS.labels("version").inc()
+    else:
+        raise HTTPException(status_code=409, detail="Student updated concurrently, please retry")
+
+    leaderboards.record_submission(db, student)
+    db.add(Progress(
+        student_id=student_id,
+        mission_id=mission_id,
+        concept=mission["concept"],
+        level=mission["niveau"],
+        choices_made=choices,
+        score_earned=result["score_earned"],
+        time_spent_seconds=time_spent_seconds,
+        **{f"{key}_after": getattr(student, key) for key in KPI_KEYS},
+    ))
+
+    concept, niveau = mission["concept"], mission["niveau"]
+    concept_progress = db.query(ConceptProgress).filter(
+        ConceptProgress.student_id == student_id, ConceptProgress.concept == concept
+    ).first()
+    if concept_progress is None:
+        concept_progress = ConceptProgress(student_id=student_id, concept=concept, missions_completed=1, is_completed=False)
+        db.add(concept_progress)
+    else:
+        concept_progress.missions_completed += 1
+    total_missions = count_concept_level_missions(game_loader, concept, niveau)
+    concept_progress.total_missions = total_missions
+    if concept_progress.missions_completed >= total_missions:
+        concept_progress.is_completed = True
+        concept_progress.completed_at = datetime.utcnow()
+
+    db.add(MetricHistory(
+        student_id=student_id, mission_id=mission_id, total_score=student.total_score, **current_metrics(student)
+    ))
+    try:
+        db.flush()
+    except IntegrityError:
+        # uq_progress_student_mission: the mission was recorded by a transaction the checks above didn't see
+        SUBMISSION_CONFLICTS.labels("duplicate").inc()
+        raise HTTPException(status_code=400, detail="Mission already completed")
+
+    missions_completed = db.query(Progress).filter(Progress.student_id == student_id).count()
+    return {
+        "new_metrics": current_metrics(student),
+        "profiling_due": missions_completed % PROFILING_EVERY == 0 or total_missions % PROFILING_CONCEPT_TOTAL_EVERY == 0,
+    }
+
+
+def swap_metrics(db: Session, student: Student, values: Dict[str, Any]) -> bool:
+    """UPDATE ... WHERE version = the version read; False if another transaction updated the student since"""
+    swapped = db.execute(
+        update(Student)
+        .where(Student.id == student.id, Student.version == student.version)
+        .values(version=Student.version + 1, **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not swapped:
+        return False
+    for key, value in dict(values, version=student.version + 1).items():
+        set_committed_value(student, key, value)  # already written: not dirty for the next flush
+    return True
@@ -19,7 +19,7 @@ def slugify(title: str) -> str:
 def get_data_path(filename: str):
     # Get project root (two folders up if this file is in services/)
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    data_dir = os.path.join(base_dir, "data")
+    data_dir = os.getenv("ECOLEAD_DATA_DIR", os.path.join(base_dir, "data"))
     os.makedirs(data_dir, exist_ok=True)  # create data folder if missing
     return os.path.join(data_dir, filename)
 
@@ -0,0 +1,171 @@
+import os
+import io
+import gc
+import json
+import pickle
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+# Precompiled catalog: missions/concepts/events plus what GameLoader and the strategy would otherwise
+# re-derive in every worker (mission_index, level and concept indexes), in one file that loads
+# with a single pickle.load. Built by `python -m scripts.build_catalog_snapshot` next to the JSON files.
+# Layout: MAGIC, one JSON header line (format, digests of the JSON sources), pickle payload. The header
+# is checked before unpickling: when a JSON file changed since the build (teacher creations, deploy
+# without rebuild), the loader falls back to parsing the JSON.
+# The snapshot is trusted like the code itself (pickle): only load files built by this step.
+
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_NAME = "catalog.snapshot"
+MAGIC = b"ECOLEAD-CATALOG\n"
+SOURCE_FILES = ("missions.json", "concepts.json", "events.json")
+
+logger = logging.getLogger(__name__)
+
+
+def snapshot_path(data_dir: str) -> str:
+    return os.path.join(data_dir, SNAPSHOT_NAME)
+
+
+def source_digests(data_dir: str) -> Dict[str, Optional[List[Any]]]:
+    """{file: [size, sha1]} of the JSON sources (None when missing)"""
+    digests = {}
+    for name in SOURCE_FILES:
+        path = os.path.join(data_dir, name)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            digests[name] = None
+            continue
+        digests[name] = [len(raw), hashlib.sha1(raw).hexdigest()]
+    return digests
+
+
+def read_catalog_json(data_dir: str) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """(missions, concepts, events by id) as GameLoader exposes them"""
+    missions, concepts, events = {}, {}, {}
+    missions_path = os.path.join(data_dir, "missions.json")
+    if os.path.exists(missions_path):
+        with open(missions_path, "r", encoding="utf-8") as f:
+            missions = json.load(f)
+    concepts_path = os.path.join(data_dir, "concepts.json")
+    if os.path.exists(concepts_path):
+        with open(concepts_path, "r", encoding="utf-8") as f:
+            concepts = json.load(f)
+    events_path = os.path.join(data_dir, "events.json")
+    if os.path.exists(events_path):
+        with open(events_path, "r", encoding="utf-8") as f:
+            events = {event["id"]: event for event in json.load(f).get("events", [])}
+    return missions, concepts, events
+
+
+def build_indexes(missions: Dict[str, Any], concepts: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Lookups GameLoader answers from: mission ids per level and per concept (the mission's `concept` field),
+    the concept of each mission, mission count per (concept, level), and the mission ids listed by each
+    concept in concepts.json (the ones that exist)
+    """
+    by_level: Dict[str, List[str]] = {}
+    by_concept: Dict[str, List[str]] = {}
+    mission_concept: Dict[str, str] = {}
+    concept_level_counts: Dict[Tuple[str, str], int] = {}
+    for mission_id, m in missions.items():
+        by_level.setdefault(m.get("niveau"), []).append(mission_id)
+        by_concept.setdefault(m.get("concept"), []).append(mission_id)
+        mission_concept[mission_id] = m.get("concept")
+        key = (m.get("concept"), m.get("niveau"))
+        concept_level_counts[key] = concept_level_counts.get(key, 0) + 1
+
+    concept_listing: Dict[str, List[str]] = {}
+    for concept_id, concept in concepts.items():
+        listed = concept.get("missions", {}) if isinstance(concept, dict) else {}
+        entries = [e for level in listed.values() if isinstance(level, list) for e in level] \
+            if isinstance(listed, dict) else listed if isinstance(listed, list) else []
+        ids = [e["id"] if isinstance(e, dict) else e for e in entries if isinstance(e, str) or (isinstance(e, dict) and "id" in e)]
+        concept_listing[concept_id] = [mission_id for mission_id in ids if mission_id in missions]
+
+    return {
+        "by_level": by_level,
+        "by_concept": by_concept,
+        "mission_concept": mission_concept,
+        "concept_level_counts": concept_level_counts,
+        "concept_listing": concept_listing,
+    }
+
+
+def compile_catalog(data_dir: str) -> Dict[str, Any]:
+    from services.features_service import build_mission_index
+    missions, concepts, events = read_catalog_json(data_dir)
+    mission_index = build_mission_index(missions)
+    return {
+        "missions": missions,
+        "concepts": concepts,
+        "events": events,
+        "mission_index": mission_index,
+        "indexes": build_indexes(missions, concepts),
+    }
+
+
+def write_snapshot(data_dir: str, path: Optional[str] = None) -> str:
+    # digests first: a JSON edited during the build makes the snapshot stale, never wrong
+    header = {"format": SNAPSHOT_FORMAT, "sources": source_digests(data_dir)}
+    payload = compile_catalog(data_dir)
+    path = path or snapshot_path(data_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode() + b"\n")
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def _read_header(f: io.BufferedReader) -> Optional[Dict[str, Any]]:
+    if f.read(len(MAGIC)) != MAGIC:
+        return None
+    try:
+        return json.loads(f.readline())
+    except ValueError:
+        return None
+
+
+def snapshot_status(data_dir: str, path: Optional[str] = None) -> str:
+    """'fresh', 'missing', 'stale' or 'invalid'"""
+    path = path or snapshot_path(data_dir)
+    try:
+        with open(path, "rb") as f:
+            header = _read_header(f)
+    except FileNotFoundError:
+        return "missing"
+    if header is None or header.get("format") != SNAPSHOT_FORMAT:
+        return "invalid"
+    return "fresh" if header.get("sources") == source_digests(data_dir) else "stale"
+
+
+def load_snapshot(data_dir: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The compiled catalog, or None when there is no usable snapshot for the current JSON files"""
+    path = path or snapshot_path(data_dir)
+    try:
+        with open(path, "rb") as f:
+            header = _read_header(f)
+            if header is None or header.get("format") != SNAPSHOT_FORMAT:
+                logger.warning("catalog snapshot ignored: unknown format", extra={"path": path})
+                return None
+            if header.get("sources") != source_digests(data_dir):
+                logger.info("catalog snapshot is stale, loading the JSON files", extra={"path": path})
+                return None
+            # a few hundred thousand containers: collections triggered while they are allocated would
+            # scan them over and over (more than half of the load time on a 10k-mission catalog)
+            gc_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                return pickle.load(f)
+            finally:
+                if gc_enabled:
+                    gc.enable()
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logger.warning("catalog snapshot unreadable, loading the JSON files", extra={"path": path, "error": str(e)})
+        return None
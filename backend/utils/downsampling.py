@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+from typing import Sequence
+import numpy as np
+
+# Bounded chart series: calendar buckets (one point per hour/day/week, the last one of the bucket, i.e. the
+# state at the end of the period) or Largest-Triangle-Three-Buckets, which keeps the points that shape the
+# curve (peaks, drops) instead of averaging them away.
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+# 1970-01-01 was a Thursday: weeks start on Monday like the ISO calendar
+_WEEK_OFFSET = 4 * 86400
+
+
+def epoch_seconds(dates: Sequence[datetime]) -> np.ndarray:
+    """Naive datetimes are UTC (datetime.utcnow() everywhere in the models)"""
+    return np.fromiter(
+        (d.replace(tzinfo=timezone.utc).timestamp() if d.tzinfo is None else d.timestamp() for d in dates),
+        dtype=np.float64, count=len(dates),
+    )
+
+
+def bucket_keys(seconds: np.ndarray, resolution: str) -> np.ndarray:
+    size = BUCKET_SECONDS[resolution]
+    offset = _WEEK_OFFSET if resolution == "week" else 0
+    return np.floor_divide(seconds - offset, size).astype(np.int64)
+
+
+def bucket_last_indices(seconds: np.ndarray, resolution: str) -> np.ndarray:
+    """Index of the last sample of each bucket, `seconds` sorted ascending"""
+    if len(seconds) == 0:
+        return np.arange(0)
+    keys = bucket_keys(seconds, resolution)
+    return np.append(np.flatnonzero(np.diff(keys)), len(keys) - 1)
+
+
+def lttb_indices(x: np.ndarray, ys: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices kept by LTTB, first and last points included. `ys` is (n, k): the k series share the selection
+    (a chart point carries every KPI), each bucket keeps the point whose triangles over all the series,
+    normalised to [0, 1] so that no KPI outweighs the others, have the largest total area.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = x - x[0]
+    ys = ys.reshape(n, -1).astype(np.float64)
+    low = ys.min(axis=0)
+    span = ys.max(axis=0) - low
+    span[span == 0] = 1.0
+    ys = (ys - low) / span
+
+    # bucket i is [edges[i], edges[i + 1]): n - 2 inner points split in threshold - 2 buckets
+    edges = np.arange(threshold - 1, dtype=np.int64) * (n - 2) // (threshold - 2) + 1
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        cx = x[end:next_end].mean()
+        cy = ys[end:next_end].mean(axis=0)
+        area = np.abs(
+            (x[a] - cx) * (ys[start:end] - ys[a]) - (x[a] - x[start:end, None]) * (cy - ys[a])
+        ).sum(axis=1)
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
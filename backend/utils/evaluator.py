@@ -70,6 +70,11 @@ class MissionEvaluator:
     ) -> Dict[str, Any]:
         """Apply event modifications to mission choices for display"""
         modified_mission = mission.copy()
+        # copy the choices too: the mission dict belongs to the shared catalog
+        modified_mission["choix"] = {
+            key: {**choice, "impact": dict(choice.get("impact", {}))}
+            for key, choice in mission.get("choix", {}).items()
+        }
         
         # Apply event modifications to choices
         for event in events:
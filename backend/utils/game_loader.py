@@ -1,53 +1,106 @@
-import json
 import os
+import logging
+import hashlib
+import threading
 from typing import Dict, List, Any, Optional
 from models.user import User
 from datetime import datetime
+from utils.metrics import CACHE_REQUESTS
+from utils import catalog_snapshot
+
 # This module is responsible for loading game data such as missions, events, and concepts from JSON files.
 # It provides methods to access this data in a structured way.
 
+CATALOG_FILES = ("missions.json", "concepts.json", "events.json")
+# ECOLEAD_DATA_DIR points the loader at another catalog (e.g. one scaled by scripts/generate_catalog.py)
+DATA_DIR = os.getenv("ECOLEAD_DATA_DIR", "data")
+# load DATA_DIR/catalog.snapshot when it matches the JSON files (scripts/build_catalog_snapshot.py)
+USE_SNAPSHOT = os.getenv("ECOLEAD_CATALOG_SNAPSHOT", "1") != "0"
+
+logger = logging.getLogger(__name__)
+
 class GameLoader:
-    def __init__(self):
+    def __init__(self, use_snapshot: Optional[bool] = None):
         self.missions = {}
         self.events = {}
         self.concepts = {}
         self.data={}
-        self.load_game_data()
-    
-    def load_game_data(self):
-        """Load missions, concepts and events from JSON files"""
-        # Load missions
-        missions_path = os.path.join("data", "missions.json")
-        if os.path.exists(missions_path):
-            with open(missions_path, 'r', encoding='utf-8') as f:
-                self.missions= json.load(f)
-
-        # Load concepts
-        concepts_path=os.path.join("data", "concepts.json")
-        if os.path.exists(concepts_path):
-            with open(concepts_path, 'r', encoding='utf-8') as f:
-                self.concepts=json.load(f)
-        
-        # Load events
-        events_path = os.path.join("data", "events.json")
-        if os.path.exists(events_path):
-            with open(events_path, 'r', encoding='utf-8') as f:
-                events_data = json.load(f)
-                self.events = {event["id"]: event for event in events_data.get("events", [])}
+        self._mission_index = None
+        self._indexes = None
+        self.loaded_from = None  # "snapshot" / "json"
+        self.source_stamp = self._source_stamp()
+        # changes whenever a catalog file changes on disk (metrics, HTTP caching)
+        self.version = hashlib.sha1(repr(self.source_stamp).encode()).hexdigest()[:12]
+        self.load_game_data(USE_SNAPSHOT if use_snapshot is None else use_snapshot)
+
+    @staticmethod
+    def _source_stamp():
+        """(mtime, size) of each catalog file, used to notice edits made by teachers' creation endpoints"""
+        stamp = []
+        for name in CATALOG_FILES:
+            try:
+                st = os.stat(os.path.join(DATA_DIR, name))
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def is_stale(self) -> bool:
+        return self._source_stamp() != self.source_stamp
+
+    def get_mission_index(self) -> List[Dict[str, Any]]:
+        """build_mission_index(self.missions), computed once per loaded catalog"""
+        if self._mission_index is None:
+            from services.features_service import build_mission_index
+            CACHE_REQUESTS.labels("mission_index", "miss").inc()
+            self._mission_index = build_mission_index(self.missions)
+        else:
+            _MISSION_INDEX_HIT.inc()
+        return self._mission_index
+
+    def load_game_data(self, use_snapshot: bool = True):
+        """Load missions, concepts and events from the precompiled snapshot, or from the JSON files"""
+        snapshot = catalog_snapshot.load_snapshot(DATA_DIR) if use_snapshot else None
+        if snapshot is not None:
+            self.missions = snapshot["missions"]
+            self.concepts = snapshot["concepts"]
+            self.events = snapshot["events"]
+            self._mission_index = snapshot["mission_index"]
+            self._indexes = snapshot["indexes"]
+            self.loaded_from = "snapshot"
+            return
+        self.missions, self.concepts, self.events = catalog_snapshot.read_catalog_json(DATA_DIR)
+        self._indexes = catalog_snapshot.build_indexes(self.missions, self.concepts)
+        self.loaded_from = "json"
 
     def get_missions_by_level(self, level: str) -> List[Dict[str, Any]]:
         """Get all missions for a specific level THIS WILL CHANGE TO FIT INTO THE AI PROFILE"""
-        return [m for m in self.missions.values() if m.get("niveau") == level]
+        return [self.missions[mission_id] for mission_id in self._indexes["by_level"].get(level, ())]
+
+    def count_missions(self, concept: str, niveau: str) -> int:
+        """Number of missions of a concept at a level"""
+        return self._indexes["concept_level_counts"].get((concept, niveau), 0)
+
+    def mission_ids_by_concept(self) -> Dict[str, List[str]]:
+        """Mission ids grouped by their `concept` field, in catalog order (read-only)"""
+        return self._indexes["by_concept"]
+
+    def get_mission_concept(self, mission_id: str) -> Optional[str]:
+        return self._indexes["mission_concept"].get(mission_id)
+
+    def get_concept_mission_ids(self, concept_id: str) -> List[str]:
+        """Ids of the existing missions a concept lists in concepts.json, like get_missions_by_concept (read-only)"""
+        return self._indexes["concept_listing"].get(concept_id, [])
     
     def get_mission_by_id(self, mission_id: str) -> Optional[Dict[str, Any]]:
         mission=self.missions.get(mission_id)
         if mission is None:
-            print(f"[ERROR] Mission ID '{mission_id}' not found in missions.json. Available IDs: {list(self.missions.keys())[:5]}")
+            logger.warning("mission not found in the catalog", extra={"mission_id": mission_id})
             return None
-        mission["evenements_actifs"] = [ self.get_event_by_id(eid) for eid in mission.get("evenements_possibles", [])
-        if self.get_event_by_id(eid)
-        ]
-        return mission
+        # shallow copy: the catalog entry (shared, pre-encoded in the catalog bodies) stays untouched
+        return dict(mission, evenements_actifs=[
+            self.get_event_by_id(eid) for eid in mission.get("evenements_possibles", []) if self.get_event_by_id(eid)
+        ])
     
     def get_all_missions(self) -> List[Dict[str, Any]]:
         return list(self.missions.values())
@@ -107,10 +160,9 @@ class GameLoader:
     def get_missions_by_concept(self, concept_id: str) -> List[Dict[str, Any]]:
        """Return all missions linked to a given concept (across all levels)"""
        concept = self.get_concept(concept_id)
-       print(f"[DEBUG] Concept {concept_id} → missions:", concept.get("missions", {}))
-    
        if not concept:
           return []
+       logger.debug("concept %s -> missions: %s", concept_id, concept.get("missions", {}))
     
        missions = []
        missions_data = concept.get("missions", {})
@@ -119,7 +171,7 @@ class GameLoader:
     # Handle both cases: dict with levels or direct list
        if isinstance(missions_data, dict):
            for level_name, level_missions in missions_data.items():
-                print(f"[DEBUG] Processing level {level_name} with missions: {level_missions}")
+                logger.debug("processing level %s with missions: %s", level_name, level_missions)
                 if isinstance(level_missions, list):
                    for entry in level_missions:
                        if isinstance(entry, dict) and "id" in entry:
@@ -145,3 +197,30 @@ class GameLoader:
                        missions.append(mission_data)
 
        return missions
+
+
+_shared_loader: Optional[GameLoader] = None
+_CATALOG_HIT = CACHE_REQUESTS.labels("catalog", "hit")
+_MISSION_INDEX_HIT = CACHE_REQUESTS.labels("mission_index", "hit")
+_shared_lock = threading.Lock()
+
+def get_game_loader() -> GameLoader:
+    """
+    Process-wide GameLoader: the catalog is parsed once and shared by every router and service,
+    then reloaded when one of the JSON files changes on disk. Callers must not mutate what it returns.
+    """
+    global _shared_loader
+    loader = _shared_loader
+    if loader is not None and not loader.is_stale():
+        _CATALOG_HIT.inc()
+        return loader
+    with _shared_lock:
+        if _shared_loader is None or _shared_loader.is_stale():
+            CACHE_REQUESTS.labels("catalog", "miss").inc()
+            _shared_loader = GameLoader()
+        return _shared_loader
+
+
+def peek_game_loader() -> Optional[GameLoader]:
+    """The shared catalog if already loaded, without loading or stat-ing anything (metrics)"""
+    return _shared_loader
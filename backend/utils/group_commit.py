@@ -0,0 +1,154 @@
+import os
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from database import WriterSessionLocal
+from utils.metrics import GaugeCollector, Histogram
+
+# Group commit for submission bursts (SQLite has a single writer: 40 students submitting at once meant 40
+# transactions queued on its lock). With ECOLEAD_SUBMIT_BATCHING=1, submit_mission evaluates in its own thread
+# then hands its writes to one writer thread, which runs the jobs queued within ECOLEAD_SUBMIT_BATCH_WAIT_MS
+# (at most ECOLEAD_SUBMIT_BATCH_SIZE) in one transaction, each job in a SAVEPOINT: a failing job (mission already
+# completed...) is rolled back alone. The requests get their result once the transaction is committed, durability
+# is the same as one commit per request. Off by default. A request waits ECOLEAD_SUBMIT_WRITE_TIMEOUT seconds
+# at most, then gets a 503 (its write is dropped if still queued, may still be committed if already running).
+
+SUBMIT_BATCHING = os.getenv("ECOLEAD_SUBMIT_BATCHING", "0") == "1"
+BATCH_MAX_SIZE = int(os.getenv("ECOLEAD_SUBMIT_BATCH_SIZE", "64"))
+BATCH_MAX_WAIT_MS = float(os.getenv("ECOLEAD_SUBMIT_BATCH_WAIT_MS", "5"))
+WRITE_TIMEOUT = float(os.getenv("ECOLEAD_SUBMIT_WRITE_TIMEOUT", "30"))
+
+BATCH_SIZE = Histogram(
+    "ecolead_group_commit_batch_size", "Jobs committed per group-commit transaction", ["writer"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+COMMIT_DURATION = Histogram("ecolead_group_commit_duration_seconds", "Group-commit transaction duration (jobs + commit)", ["writer"])
+
+logger = logging.getLogger(__name__)
+
+Job = Callable[[Session], Any]
+_STOP = None
+
+
+class GroupCommitWriter:
+    def __init__(self, name: str, session_factory: Callable[[], Session] = WriterSessionLocal,
+                 max_batch: int = BATCH_MAX_SIZE, max_wait_ms: float = BATCH_MAX_WAIT_MS):
+        self.name = name
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[Optional[Tuple[Job, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batch_size = BATCH_SIZE.labels(name)
+        self._duration = COMMIT_DURATION.labels(name)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=f"group-commit-{self.name}", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Commit what is queued, then stop the thread (started again by the next submit)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def submit(self, job: Job) -> Future:
+        """Queue `job(session)` (no commit inside): the future gets its return value once committed, or its exception"""
+        self.start()
+        future: Future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def run(self, job: Job, timeout: float = WRITE_TIMEOUT) -> Any:
+        future = self.submit(job)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()  # still queued: never runs
+            logger.warning("group commit timed out", extra={"writer": self.name, "pending": self.pending()})
+            raise HTTPException(status_code=503, detail="Write queue busy, please retry")
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> Tuple[List[Tuple[Job, Future]], bool]:
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch: List[Tuple[Job, Future]]):
+        """Runs the batch; whatever fails (session, commit, close...), every future of the batch is resolved"""
+        start = time.perf_counter()
+        try:
+            done, failed = self._run_batch(batch)
+        except Exception as e:
+            logger.exception("group commit failed", extra={"writer": self.name, "jobs": len(batch)})
+            done, failed = [], [(future, e) for _, future in batch]
+
+        self._batch_size.observe(len(batch))
+        self._duration.observe(time.perf_counter() - start)
+        for future, value in done:
+            future.set_result(value)
+        for future, error in failed:
+            if not future.done():  # cancelled by run() before it started
+                future.set_exception(error)
+
+    def _run_batch(self, batch: List[Tuple[Job, Future]]) -> Tuple[List[Tuple[Future, Any]], List[Tuple[Future, BaseException]]]:
+        done: List[Tuple[Future, Any]] = []
+        failed: List[Tuple[Future, BaseException]] = []
+        db = self.session_factory()
+        try:
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with db.begin_nested():
+                        done.append((future, job(db)))
+                except Exception as e:
+                    failed.append((future, e))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            try:
+                db.close()
+            except Exception:
+                # the outcome above (commit or rollback) stands
+                logger.exception("group commit session close failed", extra={"writer": self.name})
+        return done, failed
+
+
+submission_writer = GroupCommitWriter("submissions")
+
+GaugeCollector("ecolead_group_commit_queue", "Jobs waiting for the group-commit writer", ["writer"],
+               lambda: [((submission_writer.name,), submission_writer.pending())])
@@ -0,0 +1,152 @@
+import os
+import gzip
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+from fastapi import HTTPException, Request, Response
+from utils.game_loader import GameLoader, get_game_loader
+
+try:  # optional: faster JSON encoding of the catalog bodies
+    import orjson
+except ImportError:
+    orjson = None
+try:  # optional: brotli variant of the catalog bodies
+    import brotli
+except ImportError:
+    brotli = None
+
+# Conditional GET for the catalog routes: the body only depends on the loaded catalog, so its version is
+# a strong validator. Browsers (and a local reverse proxy) keep the payload for ECOLEAD_CATALOG_MAX_AGE
+# seconds, then revalidate with If-None-Match and get an empty 304 while the catalog is unchanged.
+
+CATALOG_MAX_AGE = int(os.getenv("ECOLEAD_CATALOG_MAX_AGE", "60"))
+CATALOG_CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}, must-revalidate"
+# ECOLEAD_CATALOG_BODY_CACHE=0: build and encode every response again (e.g. to compare in benchmarks)
+BODY_CACHE_ENABLED = os.getenv("ECOLEAD_CATALOG_BODY_CACHE", "1") != "0"
+BODY_CACHE_MAX_ENTRIES = 256  # keys come from the URL (levels, concept ids): bounded
+
+
+def catalog_etag(game_loader: GameLoader, encoding: str = "") -> str:
+    """One strong validator per representation: the compressed variants get their own"""
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"catalog-{game_loader.version}{suffix}"'
+
+
+def preferred_encoding(request: Request) -> str:
+    """'br', 'gzip' or '' (identity) from Accept-Encoding"""
+    accepted = set()
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return ""
+
+
+def catalog_headers(game_loader: GameLoader, encoding: str) -> Dict[str, str]:
+    return {
+        "ETag": catalog_etag(game_loader, encoding),
+        "Cache-Control": CATALOG_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" matches "x" (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+async def cached_catalog(request: Request, response: Response) -> GameLoader:
+    """
+    Dependency of the catalog routes: the shared GameLoader, with ETag/Cache-Control set on the response,
+    or an empty 304 when the client already holds this catalog version.
+    """
+    game_loader = get_game_loader()
+    headers = catalog_headers(game_loader, preferred_encoding(request))
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return game_loader
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, like FastAPI's JSONResponse"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class _Body:
+    __slots__ = ("identity", "_compressed")
+
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self._compressed: Dict[str, bytes] = {}
+
+    def encoded(self, encoding: str) -> bytes:
+        if not encoding:
+            return self.identity
+        data = self._compressed.get(encoding)
+        if data is None:
+            if encoding == "br":
+                data = brotli.compress(self.identity, quality=9)
+            else:
+                data = gzip.compress(self.identity, compresslevel=9, mtime=0)
+            self._compressed[encoding] = data
+        return data
+
+
+class CatalogBodyCache:
+    """Encoded response bodies of the catalog routes, for the current catalog version only"""
+    def __init__(self, max_entries: int = BODY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._version = None
+        self._bodies: Dict[Hashable, _Body] = {}
+        self._lock = threading.Lock()
+
+    def get(self, game_loader: GameLoader, key: Hashable, build: Callable[[], Any]) -> _Body:
+        with self._lock:
+            if self._version != game_loader.version:
+                self._bodies.clear()
+                self._version = game_loader.version
+            body = self._bodies.get(key)
+        if body is None:
+            body = _Body(dumps(build()))
+            with self._lock:
+                if self._version == game_loader.version and len(self._bodies) < self.max_entries:
+                    body = self._bodies.setdefault(key, body)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._bodies.clear()
+
+
+catalog_bodies = CatalogBodyCache()
+
+
+def catalog_response(request: Request, game_loader: GameLoader, key: Hashable, build: Callable[[], Any]) -> Response:
+    """
+    The JSON body of a catalog route, encoded once per catalog version (and compressed once per encoding).
+    `build` returns the JSON-ready content, i.e. what the route would have returned once serialized.
+    """
+    encoding = preferred_encoding(request)
+    headers = catalog_headers(game_loader, encoding)
+    if BODY_CACHE_ENABLED:
+        body = catalog_bodies.get(game_loader, key, build)
+    else:
+        body = _Body(dumps(build()))
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body.encoded(encoding), media_type="application/json", headers=headers)
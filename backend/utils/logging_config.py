@@ -0,0 +1,129 @@
+import os
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# Application logging: modules use `logger = logging.getLogger(__name__)` and pass context as
+# `extra={...}` fields; configure_logging() (called by create_app) routes every record through a
+# QueueHandler, so request threads only enqueue and a listener thread does the formatting and the write.
+#   ECOLEAD_LOG_LEVEL=INFO                                      default level
+#   ECOLEAD_LOG_LEVELS="utils.game_loader=DEBUG,routes=WARNING" per module (prefix) levels
+#   ECOLEAD_LOG_FORMAT=text|json
+#   ECOLEAD_LOG_RATE=20 ECOLEAD_LOG_RATE_WINDOW=10              same message at most 20 times per 10 s
+# Debug calls cost a level check when disabled: use %-style arguments, never f-strings.
+
+_STANDARD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "suppressed"}
+
+
+def _extras(record: logging.LogRecord) -> Dict[str, object]:
+    return {k: v for k, v in vars(record).items() if k not in _STANDARD_ATTRS}
+
+
+class StructuredFormatter(logging.Formatter):
+    """text: `time level logger message key=value ...`; json: one object per line"""
+    def __init__(self, fmt: str = "text"):
+        super().__init__()
+        self.json = fmt == "json"
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = _extras(record)
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            fields["suppressed"] = suppressed
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}"
+        if self.json:
+            payload = {"ts": timestamp, "level": record.levelname, "logger": record.name,
+                       "message": record.getMessage(), **fields}
+            if record.exc_info:
+                payload["exc_info"] = self.formatException(record.exc_info)
+            return json.dumps(payload, default=str, ensure_ascii=False)
+        line = f"{timestamp} {record.levelname:<7} {record.name} {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Lets the same message template (per logger) through at most `rate` times per `window` seconds; the next
+    one let through carries `suppressed=<n>`. ERROR and above are never dropped.
+    """
+    def __init__(self, rate: int = 20, window: float = 10.0):
+        super().__init__()
+        self.rate = rate
+        self.window = window
+        self._lock = threading.Lock()
+        self._state: Dict[Tuple[str, str], list] = {}  # key -> [window start, count, suppressed]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR or self.rate <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = record.created
+        with self._lock:
+            state = self._state.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state else 0
+                self._state[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if state[1] < self.rate:
+                state[1] += 1
+                return True
+            state[2] += 1
+            return False
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """'utils.game_loader=DEBUG, routes=WARNING' -> {logger name: level}"""
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = (part.strip() for part in item.split("=", 1))
+        levels[name] = logging.getLevelName(level.upper())
+    return {name: level for name, level in levels.items() if isinstance(level, int)}
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    levels: Optional[str] = None,
+    fmt: Optional[str] = None,
+    stream=None,
+) -> None:
+    """Idempotent: the first call installs the queue handler on the root logger"""
+    global _listener
+    if _listener is not None:
+        return
+
+    root = logging.getLogger()
+    root.setLevel((level or os.getenv("ECOLEAD_LOG_LEVEL", "INFO")).upper())
+    for name, module_level in parse_levels(levels if levels is not None else os.getenv("ECOLEAD_LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(module_level)
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(StructuredFormatter(fmt or os.getenv("ECOLEAD_LOG_FORMAT", "text")))
+
+    records: queue.Queue = queue.Queue(-1)
+    handler = QueueHandler(records)
+    handler.addFilter(RateLimitFilter(
+        rate=int(os.getenv("ECOLEAD_LOG_RATE", "20")),
+        window=float(os.getenv("ECOLEAD_LOG_RATE_WINDOW", "10")),
+    ))
+    root.addHandler(handler)
+
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
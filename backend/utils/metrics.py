@@ -0,0 +1,305 @@
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus text exposition (format 0.0.4), no dependency.
+# Label values are passed positionally and children are cached by tuple, so the hot path
+# (`REQUEST_LATENCY.labels(method, route).observe(dt)`) does not build a dict per request;
+# callers that can should keep the child they resolved once.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Sequence[Tuple[str, str]], float]  # (name suffix, labels, value)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    pairs = list(pairs)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def samples(self):
+        return [("", (), self._value)]
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0):
+        with self._lock:
+            self._value -= amount
+
+    def set(self, value: float):
+        self._value = value
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)  # last one is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        out, cumulative = [], 0
+        for bound, count in zip(self._bounds + (float("inf"),), counts):
+            cumulative += count
+            out.append(("_bucket", (("le", _format_value(bound)),), cumulative))
+        out.append(("_sum", (), total))
+        out.append(("_count", (), cumulative))
+        return out
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+        (registry or REGISTRY).register(self)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in list(self._children.items()):
+            base = tuple(zip(self.labelnames, values))
+            for suffix, extra, value in child.samples():
+                lines.append(f"{self.name}{suffix}{_format_labels(base + tuple(extra))} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0):
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._children[()].dec(amount)
+
+    def set(self, value: float):
+        self._children[()].set(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float):
+        self._children[()].observe(value)
+
+
+class GaugeCollector:
+    """Gauges computed at scrape time: `collect_fn` returns [(label values, value), ...]"""
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str], collect_fn: Callable, registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect_fn = collect_fn
+        (registry or REGISTRY).register(self)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            samples = self.collect_fn()
+        except Exception:  # a broken collector must not break the scrape
+            samples = []
+        for values, value in samples:
+            lines.append(f"{self.name}{_format_labels(zip(self.labelnames, values))} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# --- Application metrics --------------------------------------------------------------------------
+
+REQUESTS = Counter("ecolead_http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"])
+REQUEST_LATENCY = Histogram("ecolead_http_request_duration_seconds", "HTTP request latency by route template", ["method", "route"])
+IN_FLIGHT = Gauge("ecolead_http_requests_in_flight", "HTTP requests being served")
+
+PROFILING_RUNS = Counter("ecolead_profiling_runs_total", "AI profile recomputations", ["source"])
+PROFILING_DURATION = Histogram("ecolead_profiling_duration_seconds", "AI profile recomputation duration", ["source"],
+                               buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+PREDICTIONS = Counter("ecolead_profile_predictions_total", "Nearest-centroid (kmeans) predictions by predicted tilt", ["tilt"])
+
+# cache="catalog": shared GameLoader returned as is (hit) or reloaded (miss); "mission_index": strategy index
+CACHE_REQUESTS = Counter("ecolead_cache_requests_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+SUBMISSION_CONFLICTS = Counter("ecolead_submission_conflicts_total", "Concurrent submissions of a student: version (compare-and-swap retried), duplicate (unique index), import (import rolled back)", ["kind"])
+
+
+class MetricsMiddleware:
+    """Pure ASGI: latency histogram and request counter per route template, in-flight gauge"""
+    def __init__(self, app):
+        self.app = app
+        self._children: Dict[Tuple[str, str, int], Tuple[object, object]] = {}
+
+    def _children_for(self, method: str, route: str, status: int):
+        key = (method, route, status)
+        children = self._children.get(key)
+        if children is None:
+            children = (REQUEST_LATENCY.labels(method, route), REQUESTS.labels(method, route, str(status)))
+            self._children[key] = children
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            latency, count = self._children_for(scope["method"], route, status)
+            latency.observe(time.perf_counter() - start)
+            count.inc()
+
+
+def register_runtime_collectors(engines: Dict[str, object]) -> None:
+    """Scrape-time gauges for the DB pools ({pool label: engine}), the shared catalog and the active profile model (once per process)"""
+    if REGISTRY.get("ecolead_db_pool_connections") is not None:
+        return
+
+    def pool_state():
+        samples = []
+        for name, engine in engines.items():
+            pool = engine.pool
+            if not hasattr(pool, "checkedout"):
+                continue
+            samples += [
+                ((name, "size"), pool.size()),
+                ((name, "checked_out"), pool.checkedout()),
+                ((name, "checked_in"), pool.checkedin()),
+                ((name, "overflow"), max(0, pool.overflow())),  # QueuePool counts from -pool_size
+            ]
+        return samples
+
+    def catalog_state():
+        from utils.game_loader import peek_game_loader
+        loader = peek_game_loader()
+        if loader is None:
+            return []
+        return [
+            (("missions", loader.version), len(loader.missions)),
+            (("events", loader.version), len(loader.events)),
+            (("concepts", loader.version), len(loader.concepts)),
+        ]
+
+    def model_state():
+        from services.predict_ai_profile import peek_active_model
+        model = peek_active_model()
+        if model is None:
+            return []
+        return [((getattr(model, "version", None) or "legacy",), 1)]
+
+    GaugeCollector("ecolead_db_pool_connections", "SQLAlchemy pool connections by pool and state", ["pool", "state"], pool_state)
+    GaugeCollector("ecolead_catalog_items", "Items in the loaded catalog, labelled with the catalog version", ["kind", "version"], catalog_state)
+    GaugeCollector("ecolead_profile_model_info", "Active AI profile model version", ["version"], model_state)
@@ -0,0 +1,178 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# SQL query counting per request: engine hooks record every statement into the stats of the current
+# request (a ContextVar, copied into the threadpool that runs sync routes and their services), and
+# QueryStatsMiddleware aggregates them per route. With ECOLEAD_DEBUG=1 every response also carries
+# X-DB-Query-Count / X-DB-Time-Ms / X-DB-Slowest-Ms.
+
+DEBUG_HEADERS = os.getenv("ECOLEAD_DEBUG", "0") == "1"
+SLOW_STATEMENT_CHARS = 300
+
+
+class QueryStats:
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_sql", "statements")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+        self.statements: Optional[List[str]] = [] if keep_statements else None
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# test captures see every statement, whatever the thread or context (TestClient runs the app in its own thread)
+_captures: List[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if _captures:
+        with _captures_lock:
+            for capture in _captures:
+                capture.record(statement, elapsed_ms)
+
+
+def _handle_error(exception_context):
+    # failed statement: no after_cursor_execute, its start must not be popped by the next statement of the
+    # (pooled) connection
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Idempotent: the hooks are attached once per engine"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class RouteQueryStats:
+    """Aggregated per route template, e.g. 'GET /api/teachers/{teacher_id}/dashboard'"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, route: str, stats: QueryStats):
+        with self._lock:
+            agg = self._routes.get(route)
+            if agg is None:
+                agg = self._routes[route] = {
+                    "requests": 0, "queries": 0, "max_queries": 0, "db_ms": 0.0,
+                    "slowest_ms": 0.0, "slowest_sql": None,
+                }
+            agg["requests"] += 1
+            agg["queries"] += stats.count
+            agg["max_queries"] = max(agg["max_queries"], stats.count)
+            agg["db_ms"] += stats.total_ms
+            if stats.slowest_ms > agg["slowest_ms"]:
+                agg["slowest_ms"] = stats.slowest_ms
+                agg["slowest_sql"] = (stats.slowest_sql or "")[:SLOW_STATEMENT_CHARS]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [{"route": route, **agg} for route, agg in self._routes.items()]
+        for row in rows:
+            row["avg_queries"] = round(row["queries"] / row["requests"], 2)
+            row["avg_db_ms"] = round(row["db_ms"] / row["requests"], 3)
+            row["db_ms"] = round(row["db_ms"], 3)
+            row["slowest_ms"] = round(row["slowest_ms"], 3)
+        return sorted(rows, key=lambda r: r["queries"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_query_stats = RouteQueryStats()
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or "<unmatched>"
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryStatsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware: it would run the route in another task and lose the ContextVar)"""
+    def __init__(self, app, debug_headers: bool = DEBUG_HEADERS):
+        self.app = app
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers += [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-time-ms", f"{stats.total_ms:.2f}".encode()),
+                    (b"x-db-slowest-ms", f"{stats.slowest_ms:.2f}".encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+        finally:
+            _current.reset(token)
+            route_query_stats.add(route_label(scope), stats)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Every statement executed on a hooked engine inside the block, from any thread"""
+    stats = QueryStats(keep_statements=True)
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Test helper, e.g.
+        with assert_max_queries(5):
+            client.get(f"/api/teachers/{teacher_id}/dashboard")
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {' '.join(sql.split())[:200]}" for i, sql in enumerate(stats.statements))
+        raise AssertionError(f"{stats.count} queries executed, at most {max_queries} expected:\n{listing}")
@@ -0,0 +1,260 @@
+import os
+import re
+import sys
+import json
+import inspect
+import time
+import uuid
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import anyio
+
+# Opt-in sampling profiler per request, usable in production:
+# - header `X-Profile: 1` on a request, honoured only with ECOLEAD_PROFILE_HEADER=1 (off by default: any
+#   client could otherwise start a sampler thread and a profile file per request),
+# - or a fraction of the traffic: ECOLEAD_PROFILE_SAMPLE_RATE=0.01, optionally restricted with
+#   ECOLEAD_PROFILE_ROUTES="POST /api/strategy/suggest-strategy,GET /api/teachers/{teacher_id}/dashboard".
+# A sampler thread takes the stack of the thread running the endpoint every ECOLEAD_PROFILE_INTERVAL_MS and
+# keeps them as folded stacks ("root;...;leaf count", flamegraph.pl / speedscope format) in
+# ECOLEAD_PROFILE_DIR, one JSON file per request, the ECOLEAD_PROFILE_KEEP most recent ones only.
+# Listed and downloaded through GET /api/admin/profiles.
+
+PROFILE_DIR = os.getenv("ECOLEAD_PROFILE_DIR", "profiles")
+PROFILE_KEEP = int(os.getenv("ECOLEAD_PROFILE_KEEP", "200"))
+PROFILE_INTERVAL_MS = float(os.getenv("ECOLEAD_PROFILE_INTERVAL_MS", "5"))
+PROFILE_SAMPLE_RATE = float(os.getenv("ECOLEAD_PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER_ENABLED = os.getenv("ECOLEAD_PROFILE_HEADER", "0") == "1"
+PROFILE_ROUTES = {r.strip() for r in os.getenv("ECOLEAD_PROFILE_ROUTES", "").split(",") if r.strip()}
+
+PROFILE_HEADER = b"x-profile"
+REQUEST_ID_HEADER = b"x-request-id"
+PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9_.-]+$")
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_MAX_DEPTH = 128
+
+
+def _frame_label(code) -> str:
+    path = code.co_filename
+    if path.startswith(_BACKEND_DIR):
+        path = os.path.relpath(path, _BACKEND_DIR)
+    elif "site-packages" in path:
+        path = path.split("site-packages" + os.sep, 1)[1]
+    elif path.startswith(sys.base_prefix):  # stdlib
+        path = os.path.basename(path)
+    # one node per function (not per line) keeps the flame graph readable
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Samples the threads whose stack contains the endpoint of the profiled request (the worker thread of a
+    sync route, the event loop while an async route runs). The endpoint is only known once the router has
+    matched, and concurrent calls to the same endpoint are told apart by their path parameters.
+    """
+    def __init__(self, scope, interval_ms: float = PROFILE_INTERVAL_MS):
+        self.scope = scope
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._labels: Dict[Any, str] = {}
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._done.set()
+        self._thread.join()
+
+    def _endpoint_code(self):
+        endpoint = getattr(self.scope.get("route"), "endpoint", None)
+        # sync endpoints of a pooled router (utils/workload.py) run unwrapped in the worker thread
+        return getattr(inspect.unwrap(endpoint) if endpoint else None, "__code__", None)
+
+    def _matches(self, frame) -> bool:
+        params = self.scope.get("path_params") or {}
+        if not params:
+            return True
+        local_vars = frame.f_locals
+        return all(str(local_vars[k]) == str(v) for k, v in params.items() if k in local_vars)
+
+    def _folded(self, frame, code) -> Optional[str]:
+        labels, found = [], False
+        while frame is not None and len(labels) < _MAX_DEPTH:
+            if frame.f_code is code:
+                if not self._matches(frame):
+                    return None
+                found = True
+            label = self._labels.get(frame.f_code)
+            if label is None:
+                label = self._labels[frame.f_code] = _frame_label(frame.f_code)
+            labels.append(label)
+            frame = frame.f_back
+        if not found:
+            return None
+        return ";".join(reversed(labels))
+
+    def _run(self):
+        own = threading.get_ident()
+        code = None
+        while not self._done.wait(self.interval):
+            code = code or self._endpoint_code()
+            if code is None:
+                continue
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = self._folded(frame, code)
+                if stack is not None:
+                    self.stacks[stack] += 1
+                    self.samples += 1
+
+
+class ProfileStore:
+    def __init__(self, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._lock = threading.Lock()
+
+    def _path(self, profile_id: str) -> str:
+        if not PROFILE_ID_RE.match(profile_id):
+            raise ValueError(f"invalid profile id {profile_id!r}")
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def save(self, profile: Dict[str, Any]) -> str:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(profile["id"])
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(profile, f)
+            os.replace(tmp, path)
+            self._enforce_retention()
+        return path
+
+    def _enforce_retention(self):
+        files = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime, reverse=True,
+        )
+        for entry in files[self.keep:]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def list(self, route: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Metadata of the stored profiles, most recent first (without the stacks)"""
+        if not os.path.isdir(self.directory):
+            return []
+        out = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                with open(entry.path, encoding="utf-8") as f:
+                    profile = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if route and route not in profile.get("route", ""):
+                continue
+            profile.pop("stacks", None)
+            out.append(profile)
+        return sorted(out, key=lambda p: p.get("started_at", ""), reverse=True)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(profile_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+
+profile_store = ProfileStore()
+
+
+def folded_text(profile: Dict[str, Any]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in profile["stacks"].items())
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")[:80] or "unmatched"
+
+
+class RequestProfilerMiddleware:
+    """Pure ASGI: profiles the opted-in requests and answers with an X-Profile-Id header"""
+    def __init__(self, app, store: ProfileStore = None, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 header_enabled: bool = PROFILE_HEADER_ENABLED, routes=PROFILE_ROUTES):
+        self.app = app
+        self.store = store or profile_store
+        self.sample_rate = sample_rate
+        self.header_enabled = header_enabled
+        self.routes = set(routes)
+
+    def _requested(self, scope) -> Optional[str]:
+        """'header' / 'sample' when the request must be profiled"""
+        if self.header_enabled:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER and value in (b"1", b"true"):
+                    return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._requested(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next((v.decode("latin-1") for k, v in scope.get("headers", ()) if k == REQUEST_ID_HEADER), None)
+        if not request_id or not PROFILE_ID_RE.match(request_id):
+            request_id = uuid.uuid4().hex[:16]
+        started_at = datetime.now(timezone.utc)
+        status, profile_id = 500, None
+
+        def route_key():
+            path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            return f"{scope['method']} {path}"
+
+        def kept(route):
+            return trigger == "header" or not self.routes or route in self.routes
+
+        async def send_wrapper(message):
+            nonlocal status, profile_id
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                route = route_key()
+                if kept(route):
+                    profile_id = f"{_slug(route)}__{request_id}"
+                    message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        sampler = StackSampler(scope)
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            sampler.stop()
+            route = route_key()
+            if kept(route):
+                profile = {
+                    "id": profile_id or f"{_slug(route)}__{request_id}",
+                    "route": route,
+                    "path": scope["path"],
+                    "request_id": request_id,
+                    "trigger": trigger,
+                    "status": status,
+                    "started_at": started_at.isoformat(),
+                    "duration_ms": round(duration_ms, 3),
+                    "interval_ms": sampler.interval * 1000,
+                    "samples": sampler.samples,
+                    "stacks": dict(sampler.stacks.most_common()),
+                }
+                await anyio.to_thread.run_sync(self.store.save, profile)
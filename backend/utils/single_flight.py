@@ -0,0 +1,74 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+from utils.metrics import CACHE_REQUESTS
+
+# Request coalescing for expensive read-only computations (teacher analytics): concurrent calls with the same
+# key share one execution, the others wait for its result instead of running the same queries again, and the
+# result is kept ECOLEAD_ANALYTICS_CACHE_TTL seconds (0: coalescing only) in an LRU of
+# ECOLEAD_ANALYTICS_CACHE_SIZE entries. Errors (HTTPException included) reach every waiter and are not cached.
+# Callers get the shared object: it must not be mutated.
+
+ANALYTICS_CACHE_TTL = float(os.getenv("ECOLEAD_ANALYTICS_CACHE_TTL", "10"))
+ANALYTICS_CACHE_SIZE = int(os.getenv("ECOLEAD_ANALYTICS_CACHE_SIZE", "256"))
+
+
+class SingleFlightCache:
+    def __init__(self, name: str, ttl: float = ANALYTICS_CACHE_TTL, max_entries: int = ANALYTICS_CACHE_SIZE):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._values: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()  # key -> (expires, value)
+        self._hit = CACHE_REQUESTS.labels(name, "hit")
+        self._miss = CACHE_REQUESTS.labels(name, "miss")
+        self._coalesced = CACHE_REQUESTS.labels(name, "coalesced")
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    self._values.move_to_end(key)
+                    self._hit.inc()
+                    return cached[1]
+                del self._values[key]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            self._coalesced.inc()
+            return future.result()
+
+        self._miss.inc()
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            if self.ttl > 0:
+                self._values[key] = (time.monotonic() + self.ttl, value)
+                while len(self._values) > self.max_entries:
+                    self._values.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+
+analytics_cache = SingleFlightCache("analytics")
@@ -0,0 +1,39 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+from fastapi import HTTPException
+
+# Sparse fieldsets for the catalog routes: ?fields=id,title,context.tl_dr keeps only those keys
+# (dotted names reach into nested objects). Keys missing from an item are simply left out.
+
+MAX_FIELDS = 30
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """'title, id,id' -> ('id', 'title'): normalized, so that it can be part of a cache key"""
+    if fields is None:
+        return None
+    names = sorted({name.strip() for name in fields.split(",") if name.strip()})
+    if not names:
+        return None
+    if len(names) > MAX_FIELDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_FIELDS} fields")
+    return tuple(names)
+
+
+def project(item: Dict[str, Any], fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+    if fields is None:
+        return item
+    out: Dict[str, Any] = {}
+    for name in fields:
+        path = name.split(".")
+        source = item
+        for key in path:
+            if not isinstance(source, dict) or key not in source:
+                break
+            source = source[key]
+        else:
+            # the leaf exists: only now are its parents created (no empty object for a missing key)
+            target = out
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = source
+    return out
@@ -0,0 +1,87 @@
+import os
+import time
+import asyncio
+import functools
+from typing import Any, Callable, Dict, Optional, Type
+import anyio
+from fastapi.routing import APIRoute
+from utils.metrics import GaugeCollector, Histogram
+
+# Workload isolation: sync endpoints normally share anyio's default thread limiter (40 threads) with every
+# other route, so a burst of teacher dashboards can hold all the threads while students wait to submit.
+# Routers built with `APIRouter(route_class=pooled_route(POOL))` run their sync endpoints under the pool's own
+# limiter instead: gameplay (next mission, submit, strategy) and analytics each get a fixed number of threads,
+# analytics requests beyond theirs queue without touching the others. Analytics routes also use their own
+# connection pool (database.get_analytics_db).
+#   ECOLEAD_GAMEPLAY_THREADS=32  ECOLEAD_ANALYTICS_THREADS=8
+# Queue depth and wait time: ecolead_worker_pool_threads{pool,state}, ecolead_worker_pool_wait_seconds{pool}.
+
+GAMEPLAY_THREADS = int(os.getenv("ECOLEAD_GAMEPLAY_THREADS", "32"))
+ANALYTICS_THREADS = int(os.getenv("ECOLEAD_ANALYTICS_THREADS", "8"))
+
+POOL_WAIT = Histogram(
+    "ecolead_worker_pool_wait_seconds", "Time a sync endpoint waited for a thread of its pool", ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class WorkerPool:
+    """A named thread limiter for sync endpoints (one CapacityLimiter per event loop)"""
+    def __init__(self, name: str, threads: int):
+        self.name = name
+        self.threads = threads
+        self._loop = None
+        self._limiter: Optional[anyio.CapacityLimiter] = None
+        self._wait = POOL_WAIT.labels(name)
+
+    def limiter(self) -> anyio.CapacityLimiter:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._limiter = loop, anyio.CapacityLimiter(self.threads)
+        return self._limiter
+
+    async def run(self, fn: Callable[[], Any]) -> Any:
+        queued = time.perf_counter()
+
+        def timed():
+            self._wait.observe(time.perf_counter() - queued)
+            return fn()
+
+        return await anyio.to_thread.run_sync(timed, limiter=self.limiter())
+
+    def wrap(self, endpoint: Callable) -> Callable:
+        """Async endpoint running `endpoint` in this pool (same signature for FastAPI, through __wrapped__)"""
+        @functools.wraps(endpoint)
+        async def pooled(*args, **kwargs):
+            return await self.run(functools.partial(endpoint, *args, **kwargs))
+        return pooled
+
+    def state(self) -> Dict[str, int]:
+        if self._limiter is None:
+            return {"size": self.threads, "busy": 0, "waiting": 0}
+        stats = self._limiter.statistics()
+        return {"size": self.threads, "busy": stats.borrowed_tokens, "waiting": stats.tasks_waiting}
+
+
+GAMEPLAY_POOL = WorkerPool("gameplay", GAMEPLAY_THREADS)
+ANALYTICS_POOL = WorkerPool("analytics", ANALYTICS_THREADS)
+POOLS = (GAMEPLAY_POOL, ANALYTICS_POOL)
+
+
+def pooled_route(pool: WorkerPool) -> Type[APIRoute]:
+    """route_class running the router's sync endpoints in `pool` (async endpoints are left as they are)"""
+    class PooledRoute(APIRoute):
+        def __init__(self, path: str, endpoint: Callable, **kwargs):
+            if not asyncio.iscoroutinefunction(endpoint):
+                endpoint = pool.wrap(endpoint)
+            super().__init__(path, endpoint, **kwargs)
+    PooledRoute.__name__ = f"{pool.name.capitalize()}Route"
+    return PooledRoute
+
+
+def _pool_state():
+    return [((pool.name, state), value) for pool in POOLS for state, value in pool.state().items()]
+
+
+GaugeCollector("ecolead_worker_pool_threads", "Endpoint pools: size and busy threads, waiting requests",
+               ["pool", "state"], _pool_state)
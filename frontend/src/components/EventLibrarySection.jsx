@@ -30,7 +30,7 @@ const EventLibrarySection = ({ studentId }) => {
   useEffect(() => {
     const fetchEvents = async () => {
       try {
-        const response = await api.getAllEvents();
+        const response = await api.getEventSummaries();
         setAllEvents(response);
       } catch (err) {
         console.error("Erreur chargement événements:", err);
@@ -41,13 +41,22 @@ const EventLibrarySection = ({ studentId }) => {
     fetchEvents();
   }, []);
 
+  // La liste ne contient que les résumés : le détail (contexte, timeline, sources) est chargé à l'ouverture
+  const openEvent = async (eventId) => {
+    try {
+      setSelectedEvent(await api.getEvent(eventId));
+    } catch (err) {
+      console.error("Erreur chargement événement:", err);
+    }
+  };
+
   // Filtrage avec useMemo pour optimisation
   const filteredEvents = useMemo(() => {
     let filtered = allEvents;
 
     // Filtre par type
     if (selectedType !== "all") {
-      filtered = filtered.filter(e => e.context?.type === selectedType);
+      filtered = filtered.filter(e => e.type === selectedType);
     }
 
     // Filtre par recherche
@@ -68,7 +77,7 @@ const EventLibrarySection = ({ studentId }) => {
     const counts = { all: allEvents.length };
     Object.keys(EVENT_TYPES).forEach(type => {
       if (type !== "all") {
-        counts[type] = allEvents.filter(e => e.context?.type === type).length;
+        counts[type] = allEvents.filter(e => e.type === type).length;
       }
     });
     return counts;
@@ -193,14 +202,14 @@ const EventLibrarySection = ({ studentId }) => {
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
           {filteredEvents.map((event) => {
-            const eventType = event.context?.type || "all";
+            const eventType = event.type || "all";
             const typeConfig = EVENT_TYPES[eventType] || EVENT_TYPES.all;
             const IconComponent = typeConfig.icon;
 
             return (
               <div
                 key={event.id}
-                onClick={() => setSelectedEvent(event)}
+                onClick={() => openEvent(event.id)}
                 className="card cursor-pointer hover:shadow-xl transition-all duration-200 group relative overflow-hidden"
               >
                 {/* Type badge */}
@@ -230,7 +239,7 @@ const EventLibrarySection = ({ studentId }) => {
                   <div className="flex items-center justify-between text-xs text-gray-500 mt-4 pt-3 border-t border-gray-100">
                     <div className="flex items-center space-x-2">
                       <Calendar className="h-3 w-3" />
-                      <span>{event.date || event.context?.period || 'Récent'}</span>
+                      <span>{event.date || event.period || 'Récent'}</span>
                     </div>
                     <span className="text-indigo-600 font-medium group-hover:underline">
                       Voir détails →
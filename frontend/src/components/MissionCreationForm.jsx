@@ -45,7 +45,7 @@ export default function MissionForm({ teacherId }) {
     };
     const fetchEvents = async () => {
       try {
-        const data = await api.getAllEvents();
+        const data = await api.getEventSummaries();
         setAllEvents(Array.isArray(data) ? data : (data.events || []));
       } catch (err) {
         console.error(err);
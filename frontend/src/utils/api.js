@@ -99,8 +99,10 @@ getConcepts: async () => {
     return handleResponse(response)
   },
 
-  getStudentChartData: async (studentId) => {
-    const response = await fetch(`${API_BASE_URL}/students/${studentId}/chart-data`)
+  // params: { from, to, resolution: "auto" | "raw" | "hour" | "day" | "week", max_points }
+  getStudentChartData: async (studentId, params = {}) => {
+    const query = new URLSearchParams(Object.entries(params).filter(([, v]) => v != null)).toString()
+    const response = await fetch(`${API_BASE_URL}/students/${studentId}/chart-data${query ? `?${query}` : ""}`)
     return handleResponse(response)
   },
 
@@ -121,6 +123,18 @@ getConcepts: async () => {
     return handleResponse(response)
   },
 
+  // Leaderboards (classId 0 or omitted: global)
+  getLeaderboard: async (classId = 0, limit = 10) => {
+    const path = classId ? `/classes/${classId}/leaderboard` : "/leaderboard"
+    const response = await fetch(`${API_BASE_URL}${path}?limit=${limit}`)
+    return handleResponse(response)
+  },
+
+  getStudentRank: async (studentId, classId = 0, around = 2) => {
+    const response = await fetch(`${API_BASE_URL}/students/${studentId}/rank?class_id=${classId}&around=${around}`)
+    return handleResponse(response)
+  },
+
   getStudentMetrics: async (teacherId, studentId) => {
     const response = await fetch(`${API_BASE_URL}/teachers/${teacherId}/students/${studentId}/metrics`)
     return handleResponse(response)
@@ -153,6 +167,17 @@ getConcepts: async () => {
     const response = await fetch(`${API_BASE_URL}/events`);
     return handleResponse(response);
   },
+
+  // id, title, message, type only: the context block is loaded by getEvent
+  getEventSummaries: async () => {
+    const response = await fetch(`${API_BASE_URL}/events/summary`);
+    return handleResponse(response);
+  },
+
+  getEvent: async (eventId) => {
+    const response = await fetch(`${API_BASE_URL}/events/${encodeURIComponent(eventId)}`);
+    return handleResponse(response);
+  },
   // Concept creation 
   createConcept: async (teacherId, data) => {
   const response = await fetch(`${API_BASE_URL}/teachers/${teacherId}/concepts`, {
@@ -203,6 +228,13 @@ getTeacherStudentMissions: async (teacherId, studentId) => {
   return response.json();
 },
 
+// One page of a class (students, their missions and the teachers' feedback) in a single call
+getClassReview: async (teacherId, classId, offset = 0, limit = 40) => {
+  const response = await fetch(`${API_BASE_URL}/teachers/${teacherId}/classes/${classId}/review?offset=${offset}&limit=${limit}`);
+  if (!response.ok) throw new Error("Failed to fetch class review");
+  return response.json();
+},
+
 // Submit feedback for a specific mission
 addTeacherFeedback: async (teacherId, studentId, missionId, payload) => {
   const response = await fetch(